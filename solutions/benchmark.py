@@ -0,0 +1,75 @@
+import math
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+
+import caching
+import numpy as np
+import utilities
+
+NS_PER_S = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    warmup: int = 1
+    cold_repeats: int = 1
+    min_repeats: int = 1
+    max_repeats: int = 100
+    # keep repeating the warm runs until roughly this much time (seconds) has been spent
+    target_time: float = 1.0
+
+
+def clear_caches(func: Callable) -> None:
+    """
+    Clear the caches in the module of a solver so that the next call is a cold start
+    :param func: solver function
+    :return: void
+    """
+    caching.clear_caches(func)
+
+
+def summarise(samples: list[int], prefix: str) -> dict[str, float]:
+    """
+    Summarise timing samples
+    :param samples: durations in nanoseconds
+    :param prefix: prefix for the statistic names e.g. cold or warm
+    :return: min, median, p95 and standard deviation of the samples plus the number of samples
+    """
+    arr = np.array(samples, dtype=np.int64)
+    return {
+        f"{prefix}_min_ns": int(arr.min()),
+        f"{prefix}_median_ns": float(np.median(arr)),
+        f"{prefix}_p95_ns": float(np.percentile(arr, 95)),
+        f"{prefix}_std_ns": float(arr.std(ddof=1)) if len(arr) > 1 else 0.0,
+        f"{prefix}_n": len(arr),
+    }
+
+
+def benchmark(func: Callable, args: list[Any], config: BenchmarkConfig) -> tuple[Any, dict[str, float]]:
+    """
+    Benchmark a solver. Cold runs happen straight after clearing the solver's caches, warm runs happen after the
+    warmup runs with whatever cache state the solver has built up. The number of warm runs adapts to the cold time so
+    that fast solvers are sampled many times and slow solvers are not repeated needlessly.
+    :param func: solver function
+    :param args: positional arguments for the solver
+    :param config: benchmark settings
+    :return: answer from the solver and the cold and warm timing statistics
+    """
+    last: dict[str, Any] = {}
+
+    def call(*call_args: Any) -> None:
+        last["answer"] = func(*call_args)
+
+    cold = []
+    for _ in range(config.cold_repeats):
+        clear_caches(func)
+        cold.extend(utilities.run_and_measure(call, args, 1))
+
+    utilities.run_and_measure(call, args, config.warmup)
+
+    repeats = math.ceil(config.target_time * NS_PER_S / max(min(cold), 1))
+    repeats = min(max(repeats, config.min_repeats), config.max_repeats)
+    warm = utilities.run_and_measure(call, args, repeats)
+
+    return last["answer"], {**summarise(cold, "cold"), **summarise(warm, "warm")}
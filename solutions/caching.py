@@ -0,0 +1,183 @@
+import contextlib
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Iterator
+from typing import Optional
+
+# Solvers which memoise use `bounded_cache` rather than an unbounded functools cache, so a process which solves many
+# inputs (the daemon, batch runs, benchmarks) holds at most `maxsize` entries per cache. Caches are found by scanning the
+# solver's module, which is how benchmarks clear them for a cold start and how metrics read their statistics.
+#
+# A cache is not safe to call from several threads at once, as an eviction can race with a hit. Taking a lock on every
+# call doubles the cost of a hit though, so the executor switches every cache to a locked call with `thread_safe` only
+# while it runs a loop on threads. The lock is not held while the function runs, as memoised functions are often
+# recursive.
+
+DEFAULT_MAXSIZE = 1 << 16
+
+_thread_users = 0
+_thread_users_lock = threading.Lock()
+
+
+@dataclass
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class BoundedCache:
+    """
+    Memoise a function, evicting the least recently used entry once the cache holds `maxsize` entries
+    """
+
+    def __init__(self, func: Callable, maxsize: int = DEFAULT_MAXSIZE, key: Optional[Callable[..., Hashable]] = None):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.key = key
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def _call(self, *args: Any) -> Any:
+        key = args if self.key is None else self.key(*args)
+        try:
+            value = self.entries[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+        self.misses += 1
+        value = self.func(*args)
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def _call_locked(self, *args: Any) -> Any:
+        key = args if self.key is None else self.key(*args)
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return value
+        # two threads may both compute a missing value, in which case the later one is kept
+        value = self.func(*args)
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    # special methods are looked up on the class, so `thread_safe` can switch every cache by rebinding this
+    __call__ = _call
+
+    def cache_info(self) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+    def cache_clear(self) -> None:
+        """
+        Drop every entry and reset the statistics, e.g. before solving a new input
+        :return: void
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+@contextlib.contextmanager
+def thread_safe() -> Iterator[None]:
+    """
+    Make every bounded cache safe to call from several threads while inside the context
+    :return: context manager
+    """
+    global _thread_users  # pylint: disable=global-statement
+    with _thread_users_lock:
+        _thread_users += 1
+        BoundedCache.__call__ = BoundedCache._call_locked  # type: ignore
+    try:
+        yield
+    finally:
+        with _thread_users_lock:
+            _thread_users -= 1
+            if not _thread_users:
+                BoundedCache.__call__ = BoundedCache._call  # type: ignore
+
+
+def bounded_cache(
+    maxsize: int = DEFAULT_MAXSIZE, key: Optional[Callable[..., Hashable]] = None
+) -> Callable[[Callable], BoundedCache]:
+    """
+    Decorator to memoise a function in a bounded cache
+    :param maxsize: most entries to keep
+    :param key: function of the arguments giving the cache key, defaults to the arguments. Arguments left out of the key
+        must be the same for every call until the cache is cleared.
+    :return: decorator
+    """
+
+    def decorator(func: Callable) -> BoundedCache:
+        return BoundedCache(func, maxsize, key)
+
+    return decorator
+
+
+def get_caches(func: Callable) -> dict[str, Any]:
+    """
+    Find the caches in the module of a solver. functools caches are included, as some days cache constant lookups
+    with them.
+    :param func: solver function
+    :return: mapping of cached function name to the cached function
+    """
+    module: Optional[ModuleType] = inspect.getmodule(func)
+    if module is None:
+        return {}
+    return {
+        name: obj
+        for name, obj in vars(module).items()
+        if callable(getattr(obj, "cache_info", None)) and callable(getattr(obj, "cache_clear", None))
+    }
+
+
+def clear_caches(func: Callable) -> None:
+    """
+    Clear every cache in the module of a solver
+    :param func: solver function
+    :return: void
+    """
+    for cached in get_caches(func).values():
+        cached.cache_clear()
+
+
+def get_cache_stats(func: Callable) -> dict[str, tuple[int, int, int]]:
+    """
+    Get the hits, misses and evictions of every cache in the module of a solver
+    :param func: solver function
+    :return: mapping of cached function name to its hits, misses and evictions
+    """
+    stats = {}
+    for name, cached in get_caches(func).items():
+        info = cached.cache_info()
+        stats[name] = (info.hits, info.misses, getattr(info, "evictions", 0))
+    return stats
@@ -0,0 +1,142 @@
+import contextlib
+import itertools
+import json
+import logging
+import operator
+import os
+import signal
+import threading
+import time
+from types import FrameType
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TypeVar
+from typing import Union
+
+import executor
+import toggles
+import utilities
+from constants import CACHE_DIR
+
+# Solvers which loop over many independent candidates can sum the result of each candidate with `accumulate`. When
+# checkpoints are enabled, e.g. by `run_profiling.py --checkpoint` or `--checkpoint` on a day script, the number of
+# candidates done and the partial total are written to .cache/checkpoints every `interval` seconds and whenever the loop
+# is interrupted (including by SIGTERM), keyed by the loop name and the sha256 of the input. Running the same input again
+# skips the candidates which are already counted. The checkpoint is removed once the loop finishes. Candidates must come
+# in the same order on every run of the same input.
+
+DEFAULT_INTERVAL = 30.0
+# candidates are run through `executor.parallel_map` in batches of this many, and progress is saved between batches
+BATCH_SIZE = 1024
+
+Candidate = TypeVar("Candidate")
+
+
+def get_cache_dir() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/checkpoints"
+
+
+# enable and enabled take the seconds between saves as `interval`
+_toggle = toggles.CacheDirToggle(get_cache_dir, interval=DEFAULT_INTERVAL)
+enable = _toggle.enable
+disable = _toggle.disable
+is_enabled = _toggle.is_enabled
+enabled = _toggle.enabled
+
+
+def load(path: str) -> Optional[tuple[int, int]]:
+    """
+    Read a checkpoint
+    :param path: checkpoint file
+    :return: number of candidates done and the total so far, None if there is no checkpoint
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        saved = json.load(file)
+    return saved["done"], saved["total"]
+
+
+def save(path: str, done: int, total: int) -> None:
+    """
+    Write a checkpoint under a temporary name and rename it, so an interrupted save leaves the last checkpoint intact
+    :param path: checkpoint file
+    :param done: number of candidates done
+    :param total: total of the candidates done
+    :return: void
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump({"done": done, "total": total}, file)
+    os.replace(tmp_path, path)
+
+
+def _exit_on_sigterm(signum: int, frame: Optional[FrameType]) -> None:
+    raise SystemExit(128 + signum)
+
+
+@contextlib.contextmanager
+def _sigterm_raises() -> Iterator[None]:
+    # SIGTERM normally ends the process without unwinding, so it is turned into SystemExit while a loop is checkpointed.
+    # Handlers can only be set from the main thread.
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def accumulate(
+    name: str,
+    data: Union[Iterable[str], str, bytes],
+    candidates: Iterable[Candidate],
+    func: Callable[..., int],
+    shared: Optional[dict[str, Any]] = None,
+) -> int:
+    """
+    Sum a function over candidates, resuming from the last checkpoint of the same loop and input if there is one. The
+    candidates are spread over `executor.parallel_map`, except for inputs which are streamed (any iterable which is not
+    a list, tuple, str or bytes), which are solved one candidate at a time and never checkpointed.
+    :param name: name of the loop e.g. day_7.solve_b
+    :param data: puzzle input, used to key the checkpoint
+    :param candidates: candidates in the same order on every run
+    :param func: result of one candidate, called as func(candidate, **shared) and defined at module level
+    :param shared: read only numpy arrays for every candidate, see `executor.parallel_map`
+    :return: total over every candidate
+    """
+    shared = {} if shared is None else shared
+    if not isinstance(data, (list, tuple, str, bytes)):
+        return sum(func(candidate, **shared) for candidate in candidates)
+    if _toggle.cache_dir is None:
+        return executor.parallel_map(func, candidates, shared, operator.add, 0)
+
+    path = f"{_toggle.cache_dir}/{name}/{utilities.hash_input(data)}.json"
+    interval = _toggle.settings["interval"]
+    done, total = load(path) or (0, 0)
+    if done:
+        logging.info("Resuming %s from candidate %s", name, done)
+
+    last_save = time.perf_counter()
+    with _sigterm_raises():
+        try:
+            remaining = itertools.islice(candidates, done, None)
+            while batch := list(itertools.islice(remaining, BATCH_SIZE)):
+                total += executor.parallel_map(func, batch, shared, operator.add, 0)
+                done += len(batch)
+                if time.perf_counter() - last_save >= interval:
+                    save(path, done, total)
+                    last_save = time.perf_counter()
+        except BaseException:
+            save(path, done, total)
+            raise
+
+    if os.path.exists(path):
+        os.remove(path)
+    return total
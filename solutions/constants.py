@@ -1 +1,4 @@
 YEAR = 2024
+CACHE_DIR = ".cache"
+# part name of a run which solves both parts of a day from one parse with solve_both
+BOTH = "both"
@@ -0,0 +1,147 @@
+import importlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Optional
+
+import executor
+import harness
+import utilities
+from constants import CACHE_DIR
+from constants import YEAR
+
+logging.basicConfig(level=logging.INFO)
+
+SOCKET_NAME = "solver.sock"
+
+
+def get_socket_path() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/{SOCKET_NAME}"
+
+
+def _preload() -> None:
+    """
+    Import every day in the worker up front so requests only pay for solving. Requests are already spread over the
+    workers, so the solvers run their loops serially rather than starting pools of their own.
+    """
+    executor.configure(executor.SERIAL)
+    for day in harness.DAYS:
+        importlib.import_module(f"day_{day}")
+
+
+def _ping(_: int) -> int:
+    return os.getpid()
+
+
+def _solve(day: int, part: str, data: str, example: bool) -> dict[str, Any]:
+    func = getattr(importlib.import_module(f"day_{day}"), f"solve_{part}")
+    lines = utilities.format_input_data(data)
+    start = time.perf_counter_ns()
+    answer = func(lines, example=example)
+    return {"answer": answer, "time_ns": time.perf_counter_ns() - start}
+
+
+class SolverHandler(socketserver.StreamRequestHandler):
+    """
+    Handles newline delimited JSON requests of the form {"day": 1, "part": "a", "input": "...", "example": false}
+    and replies with {"status": "ok", "answer": ..., "time_ns": ...} or {"status": "error", "error": "..."}
+    """
+
+    server: "SolverServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                future = self.server.pool.submit(
+                    _solve, int(request["day"]), request["part"], request["input"], bool(request.get("example", False))
+                )
+                response = {"status": "ok", **future.result()}
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                response = {"status": "error", "error": repr(e)}
+            self.wfile.write(json.dumps(response, default=utilities.to_json).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class SolverServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pool: ProcessPoolExecutor) -> None:
+        self.pool = pool
+        super().__init__(socket_path, SolverHandler)
+
+
+def serve(socket_path: Optional[str] = None, workers: Optional[int] = None) -> None:
+    """
+    Start the solver daemon. Each connection is handled on its own thread and the solving happens on a pool of worker
+    processes which have already imported every day, so requests for different days run concurrently.
+    :param socket_path: unix socket to listen on, defaults to .cache/solver.sock
+    :param workers: number of worker processes, defaults to the number of cores
+    :return: void
+    """
+    socket_path = get_socket_path() if socket_path is None else socket_path
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_preload) as pool:
+        # run a trivial job on every worker so that the imports happen before the first request arrives
+        list(pool.map(_ping, range(workers)))
+        with SolverServer(socket_path, pool) as server:
+            logging.info("Solver daemon listening on %s", socket_path)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                logging.info("Shutting down")
+            finally:
+                os.remove(socket_path)
+
+
+def request(day: int, part: str, data: str, example: bool = False, socket_path: Optional[str] = None) -> dict[str, Any]:
+    """
+    Ask a running daemon to solve a puzzle
+    :param day: day to solve
+    :param part: part to solve
+    :param data: raw puzzle input
+    :param example: whether the input is the example data
+    :param socket_path: unix socket the daemon listens on, defaults to .cache/solver.sock
+    :return: response from the daemon
+    """
+    socket_path = get_socket_path() if socket_path is None else socket_path
+    payload = {"day": day, "part": part, "input": data, "example": example}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def solve(
+    day: int, part: str = "a", path: Optional[str] = None, example: bool = False, socket_path: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Solve a puzzle with a running daemon
+    :param day: day to solve
+    :param part: part to solve
+    :param path: input file, defaults to the stored puzzle input
+    :param example: whether the input file is example data
+    :param socket_path: unix socket the daemon listens on, defaults to .cache/solver.sock
+    :return: response from the daemon
+    """
+    if path is None:
+        return request(day, part, utilities.get_puzzle(YEAR, day), socket_path=socket_path)
+    with open(path, "r", encoding="utf-8") as file:
+        return request(day, part, file.read(), example=example, socket_path=socket_path)
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire({"serve": serve, "solve": solve})
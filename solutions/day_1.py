@@ -1,15 +1,13 @@
 import logging
 import sys
 from collections import Counter
-
-import fire
-import utilities
-from main import main
+from typing import Iterable
 
 logging.basicConfig(level=logging.INFO)
 
 
-def get_lists(data: list[str]) -> tuple[list[int], list[int]]:
+def get_lists(data: Iterable[str]) -> tuple[list[int], list[int]]:
+    # a thousand pairs are split faster than numpy can be imported, so this day stays in pure python
     lefts = []
     rights = []
     for i in data:
@@ -19,24 +17,34 @@ def get_lists(data: list[str]) -> tuple[list[int], list[int]]:
     return lefts, rights
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
-    # sample = 11
-    lefts, rights = get_lists(data)
-    lefts = sorted(lefts)
-    rights = sorted(rights)
+def total_distance(lefts: list[int], rights: list[int]) -> int:
+    return sum([abs(l - r) for l, r in zip(sorted(lefts), sorted(rights))])
+
+
+def similarity(lefts: list[int], rights: list[int]) -> int:
+    right_counts = Counter(rights)
+    return sum([l * right_counts.get(l, 0) for l in lefts])
 
-    distance = sum([abs(l - r) for l, r in zip(lefts, rights)])
-    return distance
+
+def solve_a(data: Iterable[str], example: bool = False) -> int:
+    # sample = 11
+    return total_distance(*get_lists(data))
 
 
-def solve_b(data: list[str], example: bool = False) -> int:
+def solve_b(data: Iterable[str], example: bool = False) -> int:
     # sample = 31
+    return similarity(*get_lists(data))
+
+
+def solve_both(data: Iterable[str], example: bool = False) -> tuple[int, int]:
     lefts, rights = get_lists(data)
-    right_counts = Counter(rights)
-    total = sum([l * right_counts.get(l, 0) for l in lefts])
-    return total
+    return total_distance(lefts, rights), similarity(lefts, rights)
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -1,13 +1,14 @@
 import logging
 import sys
 from typing import Callable
-from typing import Optional
+from typing import Iterator
 
-import fire
+import grid
+import metrics
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
+import pathfinding
+from pathfinding import SearchResult
+from pathfinding import UNREACHED
 
 logging.basicConfig(level=logging.INFO)
 
@@ -15,86 +16,74 @@ DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 MAX_HEIGHT = 9
 
 
-def check_height(v: int, h: int) -> bool:
-    return v == h
+def to_heights(data: list[str]) -> grid.Grid:
+    # the border is below the ground (-2) so it can never be the next step of a trail
+    heights = grid.from_lines(data, pad=1, fill=".")
+    return grid.Grid(heights.cells.astype(np.int8) - grid.char("0"), heights.padding)
 
 
-def follow_trail(arr: np.ndarray, trailhead: tuple[int, int], condition_fn: Callable, recursive: bool = False) -> int:
+def trail_neighbours(heights: list[int], offsets: np.ndarray) -> Callable[[int], list[int]]:
+    offsets = offsets.tolist()
+
+    def neighbours(cell: int) -> list[int]:
+        next_height = heights[cell] + 1
+        return [cell + o for o in offsets if heights[cell + o] == next_height]
+
+    return neighbours
+
+
+def follow_trails(data: list[str]) -> Iterator[tuple[SearchResult, Callable[[int], list[int]], np.ndarray]]:
     """
-    This is a DFS implementation for following a path in a 2D array.
+    Search every cell reachable by a trail from each trailhead
+    :param data: puzzle input
+    :return: the search from each trailhead, the neighbour function and the flat heights
     """
-    rows, cols = arr.shape
-    visited = np.zeros_like(arr, dtype=bool)
-    stack = [trailhead]
-    complete_paths = []
-
-    def is_valid(r: int, c: int, h: int) -> bool:
-        return 0 <= r < rows and 0 <= c < cols and (not visited[r, c] or recursive) and condition_fn(arr[r, c], h)
-
-    def dfs_recursive(r: int, c: int, path: Optional[list[tuple[int, int]]] = None) -> None:
-        """Recursive DFS implementation."""
-        if path is None:
-            path = []
-        visited[r, c] = True
-        path.append((r, c))
-
-        for dr, dc in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            current_height = int(arr[r, c])
-            next_height = current_height + 1
-            if current_height == MAX_HEIGHT and path not in complete_paths:
-                # this is the point where the trail reaches a peak by some unique path
-                # i.e. what we want to count for part B
-                complete_paths.append(path)
-
-            if is_valid(nr, nc, next_height):
-                dfs_recursive(nr, nc, path.copy())
-
-    if recursive:
-        r, c = trailhead
-        if is_valid(r, c, 0):
-            dfs_recursive(r, c)
-        return len(complete_paths)
-    else:
-        # for part A we just want to see how many MAX_HEIGHT entries can be reached from trailhead
-        # but we do not care how we got there
-        path = []
-        while stack:
-            r, c = stack.pop()
-            current_height = int(arr[r, c])
-            next_height = current_height + 1
-
-            if not visited[r, c]:
-                visited[r, c] = True
-                path.append((r, c))
-
-                for dr, dc in DIRECTIONS:
-                    nr, nc = r + dr, c + dc
-                    if is_valid(nr, nc, next_height):
-                        stack.append((nr, nc))
-
-        path_heights = [arr[p[0], p[1]] for p in list(set(path))]
-        return len([h for h in path_heights if h == MAX_HEIGHT])
+    heights = to_heights(data)
+    flat = heights.flat
+    neighbours = trail_neighbours(flat.tolist(), heights.neighbour_offsets(DIRECTIONS))
+    for trailhead in np.flatnonzero(flat == 0).tolist():
+        metrics.inc("trails_followed")
+        yield pathfinding.bfs(len(flat), [trailhead], neighbours), neighbours, flat
+
+
+def trail_score(trails: SearchResult, flat: np.ndarray) -> int:
+    # for part A we just want to see how many MAX_HEIGHT entries can be reached from trailhead
+    # but we do not care how we got there
+    return int(np.count_nonzero(flat[trails.dist != UNREACHED] == MAX_HEIGHT))
+
+
+def trail_rating(trails: SearchResult, neighbours: Callable[[int], list[int]], flat: np.ndarray) -> int:
+    # for part B we count the distinct trails to each peak. Every step climbs by one so the search settles cells in
+    # order of height, and each cell has been reached by all of its trails before it is settled
+    n_trails = dict.fromkeys(trails.order, 0)
+    n_trails[trails.order[0]] = 1
+    for cell in trails.order:
+        for nxt in neighbours(cell):
+            n_trails[nxt] += n_trails[cell]
+    return sum(n for cell, n in n_trails.items() if flat[cell] == MAX_HEIGHT)
 
 
 def solve_a(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(l) for l in data]).astype(int)
-    total = 0
-    trailheads = [(r, c) for r, c in zip(*np.where(arr == 0))]
-    for trailhead in tqdm(trailheads):
-        total += follow_trail(arr, trailhead, check_height, recursive=False)
-    return total
+    return sum(trail_score(trails, flat) for trails, _, flat in follow_trails(data))
 
 
 def solve_b(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(l) for l in data]).astype(int)
-    total = 0
-    trailheads = [(r, c) for r, c in zip(*np.where(arr == 0))]
-    for trailhead in tqdm(trailheads):
-        total += follow_trail(arr, trailhead, check_height, recursive=True)
-    return total
+    return sum(trail_rating(*found) for found in follow_trails(data))
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # both parts are scored from the same search of each trailhead
+    total_a = total_b = 0
+    for trails, neighbours, flat in follow_trails(data):
+        total_a += trail_score(trails, flat)
+        total_b += trail_rating(trails, neighbours, flat)
+    return total_a, total_b
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -1,11 +1,8 @@
 import logging
 import sys
 from collections import Counter
-from functools import lru_cache
 
-import fire
-import utilities
-from main import main
+import caching
 
 logging.basicConfig(level=logging.INFO)
 
@@ -32,7 +29,7 @@ def multiply_stone(stone: int) -> tuple[bool, int]:
 funcs = [replace_stone, split_stone, multiply_stone]
 
 
-@lru_cache
+@caching.bounded_cache(maxsize=1 << 14)
 def change_stone(stone: int) -> int | list[int]:
     new_stone: list[int] | int = 0
     for func in funcs:
@@ -60,24 +57,47 @@ def change_stones(stone_counts: dict[int, int]) -> dict[int, int]:
     return new_counts
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
+BLINKS_A = 25
+BLINKS_B = 75
+
+
+def count_stones(data: list[str], blinks: list[int]) -> list[int]:
+    """
+    Count the stones after each number of blinks, blinking once for all of them
+    :param data: puzzle input
+    :param blinks: numbers of blinks in increasing order
+    :return: number of stones after each number of blinks
+    """
     stones = [int(i) for i in data[0].split()]
     stone_counts = dict(Counter(stones))
-    blinks = 25
-    for _ in range(blinks):
-        stone_counts = change_stones(stone_counts)
-    return sum(list(stone_counts.values()))
+    totals = []
+    done = 0
+    for n in blinks:
+        for _ in range(n - done):
+            stone_counts = change_stones(stone_counts)
+        done = n
+        totals.append(sum(list(stone_counts.values())))
+    return totals
+
+
+def solve_a(data: list[str], example: bool = False) -> int:
+    return count_stones(data, [BLINKS_A])[0]
 
 
 def solve_b(data: list[str], example: bool = False) -> int:
-    stones = [int(i) for i in data[0].split()]
-    stone_counts = dict(Counter(stones))
-    blinks = 75
-    for _ in range(blinks):
-        stone_counts = change_stones(stone_counts)
-    return sum(list(stone_counts.values()))
+    return count_stones(data, [BLINKS_B])[0]
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # the stones after 75 blinks are the stones after 25 blinks blinked 50 more times
+    total_a, total_b = count_stones(data, [BLINKS_A, BLINKS_B])
+    return total_a, total_b
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -1,13 +1,12 @@
 import logging
-import re
 import sys
-from typing import Optional
+from typing import Iterable
 
-import fire
+import metrics
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
+import parse_cache
+import parsing
+import variants
 
 logging.basicConfig(level=logging.INFO)
 
@@ -25,53 +24,76 @@ def solve_equations(a_x: int, a_y: int, b_x: int, b_y: int, prize_x: int, prize_
     return a_pushes, b_pushes
 
 
-def solve_machine(
-    a: str, b: str, prize: str, offset: int, max_pushes: float | int
-) -> tuple[Optional[int], Optional[int]]:
-    a_x, a_y = list(map(int, re.findall(r"\d+", a)))
-    b_x, b_y = list(map(int, re.findall(r"\d+", b)))
-    prize_x, prize_y = list(map(int, re.findall(r"\d+", prize)))
-    prize_x += offset
-    prize_y += offset
+@parse_cache.cached(version=1)
+def parse_machines(data: Iterable[str]) -> np.ndarray:
+    # one row per machine of a_x, a_y, b_x, b_y, prize_x, prize_y
+    return parsing.records(data, 6)
 
-    # we use linear algebra to solve the system of linear equations
-    A = np.array([[a_x, b_x], [a_y, b_y]])
-    B = np.array([prize_x, prize_y])
 
-    a_pushes, b_pushes = np.linalg.solve(A, B)
+def solve_machines(machines: np.ndarray, offset: int, max_pushes: float | int) -> np.ndarray:
+    """
+    Solve the linear equations of every machine in one call
+    """
+    metrics.inc("machines_solved", len(machines))
+    A = np.stack([machines[:, [0, 2]], machines[:, [1, 3]]], axis=1)
+    B = machines[:, 4:6] + offset
 
-    if (
-        round(a_pushes, ROUNDING_FACTOR).is_integer()
-        and round(b_pushes, ROUNDING_FACTOR).is_integer()
-        and a_pushes <= max_pushes
-        and b_pushes <= max_pushes
-    ):
-        return int(round(a_pushes, ROUNDING_FACTOR)), int(round(b_pushes, ROUNDING_FACTOR))
-    return None, None
+    pushes = np.linalg.solve(A, B[..., np.newaxis])[..., 0]
+    rounded = np.round(pushes, ROUNDING_FACTOR)
+    valid = np.all((rounded == np.floor(rounded)) & (pushes <= max_pushes), axis=1)
+    counts = rounded.astype(np.int64)
+    return np.where(valid, (counts[:, 0] * COST_A) + (counts[:, 1] * COST_B), 0)
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
-    data = [d for d in data if d != ""]
-    machines = [data[i : i + 3] for i in range(0, len(data), 3)]
-    total = 0
-    for a, b, prize in tqdm(machines):
-        a_pushes, b_pushes = solve_machine(a, b, prize, 0, 101)
-        if a_pushes is not None and b_pushes is not None:
-            total += (a_pushes * COST_A) + (b_pushes * COST_B)
-    return total
+def solve_a(data: Iterable[str], example: bool = False) -> int:
+    return int(solve_machines(parse_machines(data), 0, 101).sum())
+
 
+def solve_b(data: Iterable[str], example: bool = False) -> int:
+    return int(solve_machines(parse_machines(data), PRIZE_OFFSET, np.inf).sum())
 
-def solve_b(data: list[str], example: bool = False) -> int:
-    data = [d for d in data if d != ""]
-    machines = [data[i : i + 3] for i in range(0, len(data), 3)]
+
+def solve_per_machine(data: Iterable[str], offset: int, max_pushes: float | int) -> int:
+    # reference version which solves one machine at a time
     total = 0
-    for a, b, prize in tqdm(machines):
-        a_pushes, b_pushes = solve_machine(a, b, prize, PRIZE_OFFSET, np.inf)
-        if a_pushes is not None and b_pushes is not None:
-            total += (a_pushes * COST_A) + (b_pushes * COST_B)
+    for a_x, a_y, b_x, b_y, prize_x, prize_y in parse_machines(data).tolist():
+        metrics.inc("machines_solved")
+        pushes = solve_equations(a_x, a_y, b_x, b_y, prize_x + offset, prize_y + offset)
+        rounded = [round(p, ROUNDING_FACTOR) for p in pushes]
+        if all(r == int(r) and p <= max_pushes for r, p in zip(rounded, pushes)):
+            total += int(rounded[0]) * COST_A + int(rounded[1]) * COST_B
     return total
 
 
+@variants.register(13, "a", "per_machine")
+def solve_a_per_machine(data: Iterable[str], example: bool = False) -> int:
+    return solve_per_machine(data, 0, 101)
+
+
+@variants.register(13, "b", "per_machine")
+def solve_b_per_machine(data: Iterable[str], example: bool = False) -> int:
+    return solve_per_machine(data, PRIZE_OFFSET, np.inf)
+
+
+def solve_both(data: Iterable[str], example: bool = False) -> tuple[int, int]:
+    machines = parse_machines(data)
+    return int(solve_machines(machines, 0, 101).sum()), int(solve_machines(machines, PRIZE_OFFSET, np.inf).sum())
+
+
+def solve_many(inputs: list[list[str]], part: str = "a", example: bool = False) -> list[int]:
+    if not inputs:
+        return []
+    # the machines of every input are solved together and then the tokens are summed per input
+    offset, max_pushes = (0, 101) if part == "a" else (PRIZE_OFFSET, np.inf)
+    machines = [parse_machines(data) for data in inputs]
+    tokens = solve_machines(np.concatenate(machines), offset, max_pushes)
+    return [int(t.sum()) for t in np.split(tokens, np.cumsum([len(m) for m in machines])[:-1])]
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
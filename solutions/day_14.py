@@ -1,13 +1,12 @@
 import logging
-import re
 import sys
 from dataclasses import dataclass
+from typing import Iterable
 from typing import Optional
 
-import fire
 import numpy as np
-import utilities
-from main import main
+import parse_cache
+import parsing
 
 logging.basicConfig(level=logging.INFO)
 
@@ -35,16 +34,10 @@ def sanitise_coords(x: int, y: int, rows: int, cols: int) -> tuple[int, int]:
     return x, y
 
 
-def collect_robots(data: list[str]) -> dict[int, Robot]:
-    robots = {}
-    for i, robot in enumerate(data):
-        pos, speed = robot.split(" ")
-        # x is number of tiles from left
-        # y is number of tiles from top
-        x, y = list(map(int, re.findall(r"-?\d+", pos)))
-        x_speed, y_speed = list(map(int, re.findall(r"-?\d+", speed)))
-        robots[i + 1] = Robot(x, y, x_speed, y_speed)
-    return robots
+def collect_robots(data: Iterable[str]) -> dict[int, Robot]:
+    # x is number of tiles from left
+    # y is number of tiles from top
+    return {i + 1: Robot(*robot) for i, robot in enumerate(parse_robots(data).tolist())}
 
 
 def _move_robots(robots: dict[int, Robot], rows: int, cols: int) -> dict[int, Robot]:
@@ -108,28 +101,28 @@ def move_robots(
     return robots, counter
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
+def solve_a(data: Iterable[str], example: bool = False) -> int:
     rows = 7 if example else 103
     cols = 11 if example else 101
     seconds = 100
-    arr = np.zeros((rows, cols))
-    robots = collect_robots(data)
 
-    robots, _ = move_robots(robots, rows, cols, seconds)
-
-    finish_arr = np.zeros_like(arr)
-    for i, robot in robots.items():
-        finish_arr[robot.y, robot.x] += 1
+    # after a fixed number of seconds a robot is at its start plus its speed multiplied by the time, wrapped around the
+    # grid, so every robot is placed at once
+    robots = parse_robots(data)
+    finish_arr = np.zeros((rows, cols), dtype=np.int64)
+    np.add.at(
+        finish_arr, ((robots[:, 1] + robots[:, 3] * seconds) % rows, (robots[:, 0] + robots[:, 2] * seconds) % cols), 1
+    )
 
     q1 = np.sum(finish_arr[0 : finish_arr.shape[0] // 2, 0 : finish_arr.shape[1] // 2])
     q2 = np.sum(finish_arr[0 : finish_arr.shape[0] // 2, finish_arr.shape[1] // 2 + 1 :])
     q3 = np.sum(finish_arr[finish_arr.shape[0] // 2 + 1 :, 0 : finish_arr.shape[1] // 2])
     q4 = np.sum(finish_arr[finish_arr.shape[0] // 2 + 1 :, finish_arr.shape[1] // 2 + 1 :])
 
-    return q1 * q2 * q3 * q4
+    return int(q1 * q2 * q3 * q4)
 
 
-def solve_b(data: list[str], example: bool = False) -> int:
+def solve_b(data: Iterable[str], example: bool = False) -> int:
     rows = 7 if example else 103
     cols = 11 if example else 101
 
@@ -140,7 +133,46 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return seconds
 
 
+@parse_cache.cached(version=1)
+def parse_robots(data: Iterable[str]) -> np.ndarray:
+    # one row per robot of x, y, x_speed, y_speed
+    return parsing.records(data, 4)
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
+def solve_many(inputs: list[list[str]], part: str = "a", example: bool = False) -> list[int]:
+    if not inputs:
+        return []
+    if part == "b":
+        return [solve_b(data, example) for data in inputs]
+
+    # for part A the robots of every input are moved together - after a fixed number of seconds each position is just
+    # the start plus the speed multiplied by the time, wrapped around the grid
+    rows = 7 if example else 103
+    cols = 11 if example else 101
+    seconds = 100
+    robots = [parse_robots(data) for data in inputs]
+    owners = np.repeat(np.arange(len(inputs)), [len(r) for r in robots])
+    all_robots = np.concatenate(robots)
+    x = (all_robots[:, 0] + all_robots[:, 2] * seconds) % cols
+    y = (all_robots[:, 1] + all_robots[:, 3] * seconds) % rows
+
+    # robots on the middle row or column are not in any quadrant
+    in_quadrant = (x != cols // 2) & (y != rows // 2)
+    quadrants = (2 * (y > rows // 2) + (x > cols // 2))[in_quadrant]
+    counts = np.zeros((len(inputs), 4), dtype=np.int64)
+    np.add.at(counts, (owners[in_quadrant], quadrants), 1)
+    return [int(np.prod(c)) for c in counts]
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     sys.argv.append("--part=b")
     sys.argv.append("--expected_sample=None")
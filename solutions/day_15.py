@@ -4,10 +4,8 @@ import sys
 from dataclasses import dataclass
 from typing import Optional
 
-import fire
+import grid
 import numpy as np
-import utilities
-from main import main
 
 logging.basicConfig(level=logging.INFO)
 
@@ -18,12 +16,12 @@ DIRECTIONS = {
     ">": (0, 1),
 }
 
-ROBOT = "@"
-BOX = "O"
-WALL = "#"
-EMPTY = "."
-BIG_BOX_L = "["
-BIG_BOX_R = "]"
+ROBOT = grid.char("@")
+BOX = grid.char("O")
+WALL = grid.char("#")
+EMPTY = grid.char(".")
+BIG_BOX_L = grid.char("[")
+BIG_BOX_R = grid.char("]")
 BIG_BOXES = [BIG_BOX_L, BIG_BOX_R]
 
 
@@ -32,7 +30,8 @@ def gps_score(x: int, y: int) -> int:
 
 
 def solve_a(data: list[str], example: bool = False) -> int:
-    arr, instructions = np.array([list(l) for l in data[: data.index("")]]), "".join(data[data.index("") + 1 :])
+    # the map is moved around in place so it needs its own copy of the cells
+    arr, instructions = grid.from_lines(data[: data.index("")]).cells.copy(), "".join(data[data.index("") + 1 :])
     x, y = np.where(arr == ROBOT)[0][0], np.where(arr == ROBOT)[1][0]
     arrays = []
     for in_id, move in enumerate(instructions):
@@ -144,7 +143,7 @@ def solve_a(data: list[str], example: bool = False) -> int:
 
 def solve_b(data: list[str], example: bool = False) -> int:
     # enlarge the map
-    arr, instructions = np.array([list(l) for l in data[: data.index("")]]), "".join(data[data.index("") + 1 :])
+    arr, instructions = grid.from_lines(data[: data.index("")]).cells, "".join(data[data.index("") + 1 :])
     big_arr = np.zeros((arr.shape[0], arr.shape[1] * 2)).astype(arr.dtype)
     for i, j in zip(*np.where(arr == WALL)):
         big_arr[i, j * 2 : j * 2 + 2] = WALL
@@ -159,8 +158,8 @@ def solve_b(data: list[str], example: bool = False) -> int:
     x, y = np.where(arr == ROBOT)[0][0], np.where(big_arr == ROBOT)[1][0]
     # need a way of detecting bigger boxes - once we detect one side of the box we automatically know the other side
     for in_id, move in enumerate(instructions):
-        lefts = [(r, c) for r, c in zip(*np.where(big_arr == BIG_BOX_L))]
-        if not all([big_arr[l[0], l[1] + 1] == BIG_BOX_R for l in lefts]):
+        # every left half must have a right half next to it, checked over the whole map at once
+        if not np.all(big_arr[:, 1:][big_arr[:, :-1] == BIG_BOX_L] == BIG_BOX_R):
             raise ValueError("Boxes have been split!")
         d = DIRECTIONS[move]
         new_x, new_y = x + d[0], y + d[1]
@@ -377,6 +376,14 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return total
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -1,110 +1,126 @@
-import heapq
 import logging
 import sys
-from typing import Optional
+from dataclasses import dataclass
 
-import fire
+import grid
+import metrics
 import numpy as np
-import utilities
-from main import main
+import pathfinding
+import variants
+from pathfinding import UNREACHED
 
 logging.basicConfig(level=logging.INFO)
 
 DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-START = "S"
-END = "E"
-WALL = "#"
-EMPTY = "."
+START = grid.char("S")
+END = grid.char("E")
+WALL = grid.char("#")
+
+# a state is a cell and the direction it was entered in, cell * N_DIRECTIONS + direction
+N_DIRECTIONS = len(DIRECTIONS)
+EAST = DIRECTIONS.index((0, 1))
+STEP_COST = 1
+TURN_COST = 1000
+
+
+@dataclass
+class Maze:
+    layout: grid.Grid
+    passable: list[bool]
+    offsets: list[int]
+    start: int
+    ends: list[int]
+
+    @property
+    def n_states(self) -> int:
+        return len(self.passable) * N_DIRECTIONS
+
+    def forward(self, state: int) -> list[tuple[int, int]]:
+        """
+        Moves from a state to each open neighbour, turning first if needed
+        """
+        cell, direction = divmod(state, N_DIRECTIONS)
+        return [
+            ((cell + o) * N_DIRECTIONS + d, STEP_COST if d == direction else STEP_COST + TURN_COST)
+            for d, o in enumerate(self.offsets)
+            if self.passable[cell + o]
+        ]
+
+    def backward(self, state: int) -> list[tuple[int, int]]:
+        """
+        Moves which lead into a state, so a search with these runs from the end towards the start
+        """
+        cell, direction = divmod(state, N_DIRECTIONS)
+        previous = cell - self.offsets[direction]
+        if not self.passable[previous]:
+            return []
+        return [
+            (previous * N_DIRECTIONS + d, STEP_COST if d == direction else STEP_COST + TURN_COST)
+            for d in range(N_DIRECTIONS)
+        ]
+
+
+def parse_maze(data: list[str]) -> Maze:
+    # the padded border is wall so moves never leave the maze
+    maze = grid.from_lines(data, pad=1, fill="#")
+    end = maze.to_index(*maze.find(END))
+    return Maze(
+        maze,
+        (maze.flat != WALL).tolist(),
+        maze.neighbour_offsets(DIRECTIONS).tolist(),
+        maze.to_index(*maze.find(START)) * N_DIRECTIONS + EAST,
+        [end * N_DIRECTIONS + d for d in range(N_DIRECTIONS)],
+    )
 
-# some customised types
-MAZE_TILE = tuple[int, int, int, tuple[int, int], list[tuple[int, int]]]
-COORD = tuple[int, int]
 
+def solve_a(data: list[str], example: bool = False) -> int:
+    maze = parse_maze(data)
+    end_r, end_c = maze.layout.find(END)
+    width = maze.layout.shape[1]
+
+    def heuristic(state: int) -> int:
+        r, c = divmod(state // N_DIRECTIONS, width)
+        return abs(r - end_r) + abs(c - end_c)
+
+    metrics.inc("dijkstra_runs")
+    return pathfinding.astar(maze.n_states, [maze.start], maze.forward, maze.ends, heuristic).distance()
+
+
+def best_paths(maze: Maze) -> tuple[int, int]:
+    """
+    Find the best score and the number of tiles on any best path
+    :param maze: the maze
+    :return: best score and number of tiles
+    """
+    # a state is on a best path if the cheapest route from the start to it plus the cheapest route from it to the end
+    # is the best score, so one search from the start and one back from the end find every tile
+    metrics.inc("dijkstra_runs", 2)
+    from_start = pathfinding.dijkstra(maze.n_states, [maze.start], maze.forward).dist
+    to_end = pathfinding.dijkstra(maze.n_states, maze.ends, maze.backward).dist
+    score = min(int(from_start[e]) for e in maze.ends if from_start[e] != UNREACHED)
+    on_path = (from_start != UNREACHED) & (to_end != UNREACHED) & (from_start + to_end == score)
+    return score, len(np.unique(np.flatnonzero(on_path) // N_DIRECTIONS))
 
-def run_maze_with_dijkstra(
-    arr: np.ndarray,
-    start_pos: Optional[COORD] = None,
-    direction: Optional[COORD] = None,
-) -> tuple[int, list[COORD], dict[COORD, int]]:
-    rows, cols = arr.shape
-    if start_pos is None:
-        start_pos = (int(np.where(arr == START)[0][0]), int(np.where(arr == START)[1][0]))
-    direction = (0, 1) if direction is None else direction
-    end_pos = (int(np.where(arr == END)[0][0]), int(np.where(arr == END)[1][0]))
-
-    # Priority queue: (cumulative_cost, (row, col), direction of travel, path so far)
-    # this means we take low cost paths first
-    pq: list[MAZE_TILE] = [(0, start_pos[0], start_pos[1], direction, [])]
-    visited: dict[COORD, int] = {}
-
-    while pq:
-        cost, r, c, direction, path = heapq.heappop(pq)
-
-        # seen it before with a lower cost so safe to ignore
-        if (r, c) in visited and visited[(r, c)] <= cost:
-            continue
-        visited[(r, c)] = cost
-
-        # extend with new tile
-        path = path + [(r, c)]
-
-        # because djikstra prioritises low cost paths, we can assume that the first time we get to the END
-        # it will be lowest cost route
-        if (r, c) == end_pos:
-            return cost, path, visited
-
-        # neighbours are the adjacent nodes
-        for dr, dc in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            new_direction = (dr, dc)
-
-            if 0 <= nr < rows and 0 <= nc < cols and arr[nr, nc] != WALL:
-                score_delta = 1001 if direction and new_direction != direction else 1
-                heapq.heappush(pq, (cost + score_delta, nr, nc, new_direction, path))
 
-    return -1, [], visited
+def solve_b(data: list[str], example: bool = False) -> int:
+    return best_paths(parse_maze(data))[1]
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(l) for l in data])
-    score, path, _ = run_maze_with_dijkstra(arr)
-    return score
+@variants.register(16, "a", "dijkstra")
+def solve_a_dijkstra(data: list[str], example: bool = False) -> int:
+    # the full searches of part B without the A* heuristic
+    return best_paths(parse_maze(data))[0]
 
 
-def solve_b(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(l) for l in data])
-    score, path, visited = run_maze_with_dijkstra(arr)
-    new_tiles = []
-    stack = list(reversed(path))
-    tracked = []
-    while stack:
-        r, c = stack.pop()
-        if (r, c) in tracked:
-            continue
-        # check for neighbours which are not in path
-        neighbours = [((r + dr, c + dc), (dr, dc)) for dr, dc in DIRECTIONS]
-        neighbours = [n for n in neighbours if n[0] not in path and arr[*n[0]] == EMPTY]
-        # for each neighbour, run djikstra from that neighbour
-        for new_pos, direction in neighbours:
-            if new_pos not in path:
-                new_r, new_c = new_pos
-                new_score, new_path, new_visited = run_maze_with_dijkstra(
-                    arr,
-                    start_pos=(new_r, new_c),
-                    direction=direction,
-                )
-                # then add the score to the score in visited for that tile
-                tile_score = visited.get((new_r, new_c), None)
-                if tile_score is not None:
-                    if tile_score + new_score == score:
-                        # if the score is equal to the original score then add the parts of new path to total path
-                        new_tiles.extend(new_path)
-                        stack.extend(new_path)
-        tracked.append((r, c))
-    all_tiles = {*path, *new_tiles}
-    return len(all_tiles)
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # the full search from the start which part B needs already holds the best score, so the A* search is not needed
+    return best_paths(parse_maze(data))
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -3,10 +3,6 @@ import sys
 from typing import Callable
 from typing import Optional
 
-import fire
-import utilities
-import z3
-from main import main
 
 logging.basicConfig(level=logging.INFO)
 
@@ -105,6 +101,9 @@ class SymbolicComputer(Computer):
     """
 
     def __init__(self, register_a: int, register_b: int, register_c: int, program: list[int]) -> None:
+        # z3 is slow to import and only needed for part B
+        import z3
+
         super().__init__(register_a, register_b, register_c, program)
         self.z3_solver = z3.Optimize()
         # use BitVec instead of Int as ^ means exponent in Z3 when using ints instead of XOR
@@ -129,6 +128,8 @@ class SymbolicComputer(Computer):
         return None
 
     def run(self) -> list[int]:
+        import z3
+
         a = self.register_a
         try:
             super().run()
@@ -161,6 +162,14 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return int(str(output))
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[str, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
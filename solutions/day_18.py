@@ -1,11 +1,13 @@
 import logging
 import sys
-from collections import deque
 
-import fire
+import grid
+import metrics
 import numpy as np
-import utilities
-from main import main
+import parse_cache
+import parsing
+import pathfinding
+from pathfinding import SearchResult
 
 logging.basicConfig(level=logging.INFO)
 
@@ -13,67 +15,90 @@ DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 CORRUPT = 1
 
 
-def bfs(arr: np.ndarray, start: tuple[int, int], end: tuple[int, int]) -> int:
-    q = deque([start])
-
-    visited = np.zeros_like(arr)
-    ended = False
-    while q:
-        r, c = q.popleft()
-        steps = visited[r, c]
-        for rd, cd in DIRECTIONS:
-            new_r, new_c = r + rd, c + cd
-            if (
-                0 <= new_r < arr.shape[0]
-                and 0 <= new_c < arr.shape[1]
-                and arr[new_r, new_c] != CORRUPT
-                and visited[new_r, new_c] == 0
-            ):
-                visited[new_r, new_c] = steps + 1
-                q.append((new_r, new_c))
-                if (new_r, new_c) == end:
-                    ended = True
-                    break
-        if ended:
-            break
-    if not ended:
-        return -1
-    return visited[*end]
-
-
-def initialise(data: list[str], example: bool = False) -> tuple[np.ndarray, int]:
+def find_exit(memory: grid.Grid, passable: list[bool]) -> SearchResult:
+    """
+    Find the shortest path from the top left to the bottom right of the memory space
+    :param memory: padded memory space
+    :param passable: whether each flat cell is free of corruption
+    :return: search which reached the exit, if it could be reached
+    """
+    metrics.inc("bfs_calls")
+    rows, cols = memory.shape
+    pad = memory.padding
+    return pathfinding.bfs(
+        rows * cols,
+        [memory.to_index(pad, pad)],
+        pathfinding.grid_neighbours(passable, memory.neighbour_offsets(DIRECTIONS)),
+        targets=[memory.to_index(rows - 1 - pad, cols - 1 - pad)],
+    )
+
+
+@parse_cache.cached(version=1)
+def parse_bytes(data: list[str]) -> np.ndarray:
+    # one row per byte of x, y
+    return parsing.records(data, 2)
+
+
+def initialise(data: list[str], example: bool = False) -> tuple[grid.Grid, int]:
     if example:
         shape = (7, 7)
         n = 12
     else:
         shape = (71, 71)
         n = 1024
-    arr = np.zeros(shape)
-    for i in data[:n]:
-        y, x = i.split(",")
-        arr[int(x), int(y)] = 1
-    return arr, n
+    arr = np.zeros(shape, dtype=np.uint8)
+    fallen = parse_bytes(data)[:n]
+    arr[fallen[:, 1], fallen[:, 0]] = CORRUPT
+    # a corrupt border means the search never leaves the memory space
+    return grid.Grid(np.pad(arr, 1, constant_values=CORRUPT), 1), n
 
 
 def solve_a(data: list[str], example: bool = False) -> int:
-    arr, _ = initialise(data, example)
-    steps = bfs(arr, (0, 0), (arr.shape[0] - 1, arr.shape[1] - 1))
-    return steps
+    memory, _ = initialise(data, example)
+    return find_exit(memory, (memory.flat != CORRUPT).tolist()).distance()
 
 
-def solve_b(data: list[str], example: bool = False) -> str:
-    arr, n = initialise(data, example)
+def first_blocking_byte(data: list[str], memory: grid.Grid, n: int, passable: list[bool], path: set[int]) -> str:
+    """
+    Drop the remaining bytes until the exit can no longer be reached
+    :param data: puzzle input
+    :param memory: padded memory space after the first n bytes
+    :param n: number of bytes which have already fallen
+    :param passable: whether each flat cell is free of corruption, updated as bytes fall
+    :param path: cells of the current shortest path
+    :return: the line of the byte which cut off the exit
+    """
     i = ""
-    for i in data[n:]:
-        y, x = i.split(",")
-        arr[int(x), int(y)] = 1
-        steps = bfs(arr, (0, 0), (arr.shape[0] - 1, arr.shape[1] - 1))
-        if steps == -1:
-            break
+    for i, (y, x) in zip(data[n:], parse_bytes(data)[n:].tolist()):
+        cell = memory.to_index(x + memory.padding, y + memory.padding)
+        passable[cell] = False
+        # the exit can only be cut off by a byte which lands on the current shortest path
+        if not path or cell in path:
+            path = set(find_exit(memory, passable).path())
+            if not path:
+                break
     return i
 
 
+def solve_b(data: list[str], example: bool = False) -> str:
+    memory, n = initialise(data, example)
+    passable = (memory.flat != CORRUPT).tolist()
+    return first_blocking_byte(data, memory, n, passable, set(find_exit(memory, passable).path()))
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, str]:
+    # the shortest path of part A is where part B starts dropping bytes
+    memory, n = initialise(data, example)
+    passable = (memory.flat != CORRUPT).tolist()
+    escape = find_exit(memory, passable)
+    return escape.distance(), first_blocking_byte(data, memory, n, passable, set(escape.path()))
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     sys.argv.append("--part=b")
     sys.argv.append("--expected_sample='6,1'")
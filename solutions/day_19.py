@@ -1,16 +1,19 @@
+import functools
+import itertools
 import logging
+import os
 import sys
-from functools import lru_cache
+from typing import Optional
 
-import fire
-import utilities
-from main import main
-from tqdm import tqdm
+import caching
+import executor
 
 logging.basicConfig(level=logging.INFO)
 
 
-@lru_cache
+# the towel patterns are the same for every display of an input, so only the rest of the display is hashed. The cache
+# has to be cleared before solving an input with other patterns.
+@caching.bounded_cache(key=lambda string, patterns: string)
 def make_match_all(string: str, patterns: tuple[str, ...]) -> int:
     if string == "":
         return 1
@@ -21,24 +24,51 @@ def make_match_all(string: str, patterns: tuple[str, ...]) -> int:
         return 0
 
 
+_calls = itertools.count()
+_cached_call: Optional[tuple[int, int]] = None
+
+
+def count_arrangements(display: str, patterns: tuple[str, ...], call: tuple[int, int]) -> int:
+    # the cache itself cannot be sent to a worker process, so workers call it through this function. The workers of the
+    # executor's process pool outlive each call of `arrangements`, so the cache is cleared here, in whichever process
+    # counts the display, when a display of a new call arrives.
+    global _cached_call  # pylint: disable=global-statement
+    if call != _cached_call:
+        make_match_all.cache_clear()
+        _cached_call = call
+    return make_match_all(display, patterns)
+
+
+def arrangements(data: list[str]) -> list[int]:
+    """
+    Count the arrangements of every display. Displays are independent so they are spread over the executor, with each
+    worker process filling its own cache.
+    :param data: puzzle input
+    :return: number of arrangements of each display
+    """
+    towels = tuple(data[0].split(", "))
+    call = (os.getpid(), next(_calls))
+    return executor.parallel_map(functools.partial(count_arrangements, patterns=towels, call=call), data[2:])
+
+
 def solve_a(data: list[str], example: bool = False) -> int:
-    towels = data[0].split(", ")
-    displays = data[2:]
-    count = 0
-    for display in displays:
-        count += make_match_all(display, tuple(towels)) > 0
-    return count
+    return sum(count > 0 for count in arrangements(data))
 
 
 def solve_b(data: list[str], example: bool = False) -> int:
-    towels = data[0].split(", ")
-    displays = data[2:]
-    count = 0
-    for display in tqdm(displays):
-        count += make_match_all(display, tuple(towels))
-    return count
+    return sum(arrangements(data))
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # part A only needs to know whether the number of arrangements of part B is more than 0
+    counts = arrangements(data)
+    return sum(count > 0 for count in counts), sum(counts)
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
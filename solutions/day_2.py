@@ -1,9 +1,6 @@
 import logging
 import sys
-
-import fire
-import utilities
-from main import main
+from typing import Iterable
 
 logging.basicConfig(level=logging.INFO)
 
@@ -44,16 +41,34 @@ def check_report_with_dampener(report: list[int]) -> bool:
     return False
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
-    result = [check_report(list(map(int, report.split()))) for report in data]
-    return sum(result)
+def parse_report(report: str) -> list[int]:
+    return list(map(int, report.split()))
+
+
+def solve_a(data: Iterable[str], example: bool = False) -> int:
+    return sum(check_report(parse_report(report)) for report in data)
 
 
-def solve_b(data: list[str], example: bool = False) -> int:
-    result = [check_report_with_dampener(list(map(int, report.split()))) for report in data]
-    return sum(result)
+def solve_b(data: Iterable[str], example: bool = False) -> int:
+    return sum(check_report_with_dampener(parse_report(report)) for report in data)
+
+
+def solve_both(data: Iterable[str], example: bool = False) -> tuple[int, int]:
+    # the reports which are safe without the dampener are the part A answer, and only the others need the dampener
+    safe_total = dampened_total = 0
+    for line in data:
+        report = parse_report(line)
+        if check_report(report):
+            safe_total += 1
+        else:
+            dampened_total += check_report_with_dampener(report)
+    return safe_total, safe_total + dampened_total
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
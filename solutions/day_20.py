@@ -1,128 +1,133 @@
+import functools
 import logging
+import operator
 import sys
-import time
-from collections import deque
-from typing import Optional
+from typing import Callable
 
-import fire
+import executor
+import grid
+import metrics
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
+import pathfinding
+from pathfinding import UNREACHED
 
 logging.basicConfig(level=logging.INFO)
 
-START = "S"
-END = "E"
-WALL = "#"
-EMPTY = "."
+START = grid.char("S")
+END = grid.char("E")
+WALL = grid.char("#")
 
 DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 
 
-def bfs(
-    arr: np.ndarray,
-    start: tuple[int, int],
-    end: tuple[int, int],
-    cheat: tuple[int, int],
-    invalid: str | int = WALL,
-    max_steps: Optional[int] = None,
-    return_path: bool = True,
-) -> tuple[int, Optional[list[tuple[int, int]]], Optional[np.ndarray]]:
-    q = deque([start])
-    path = [start]
-    visited = np.zeros(arr.shape)
-    ended = False
-    while q:
-        r, c = q.popleft()
-        steps = visited[r, c]
-        if max_steps is not None and steps > max_steps:
-            break
-        for rd, cd in DIRECTIONS:
-            new_r, new_c = r + rd, c + cd
-            if (
-                0 <= new_r < arr.shape[0]
-                and 0 <= new_c < arr.shape[1]
-                and ((arr[new_r, new_c] != invalid) or ((new_r, new_c) == cheat))
-                and visited[new_r, new_c] == 0
-            ):
-                visited[new_r, new_c] = steps + 1
-                q.append((new_r, new_c))
-                if (new_r, new_c) == end:
-                    ended = True
-                    break
-        if ended:
-            break
-
-    visited[*start] = 0
-    if not return_path:
-        r = visited[*end] if ended else -1
-        return r, None, None
-    if not ended:
-        for i in range(1, int(np.max(visited))):
-            path.extend([(i, j) for i, j in zip(*np.where(visited == i))])
-        return -1, path, visited
-    for i in range(1, int(visited[*end] + 1)):
-        path.append((int(np.where(visited == i)[0][0]), int(np.where(visited == i)[1][0])))
-    return visited[*end], path, visited
+def race(data: list[str]) -> tuple[grid.Grid, Callable[[int], list[int]]]:
+    # the padded border is wall so moves never leave the track
+    track = grid.from_lines(data, pad=1, fill="#")
+    passable = (track.flat != WALL).tolist()
+    return track, pathfinding.grid_neighbours(passable, track.neighbour_offsets(DIRECTIONS))
+
+
+def distances_from(track: grid.Grid, neighbours: Callable[[int], list[int]], value: int) -> np.ndarray:
+    """
+    Get the number of steps from a cell to every cell on the track
+    :param track: padded race track
+    :param neighbours: neighbour function of the track
+    :param value: byte value of the cell to start from
+    :return: steps to each flat cell, UNREACHED for walls
+    """
+    metrics.inc("bfs_calls")
+    return pathfinding.bfs(track.flat.size, [track.to_index(*track.find(value))], neighbours).dist
+
+
+def wall_cheats(track: grid.Grid, from_start: np.ndarray, to_end: np.ndarray, saving: int) -> int:
+    # the best race through a wall goes from the closest cell to the start next to the wall, through the wall, to the
+    # closest cell to the end next to it, so two distance fields give the saving of every cheat without searching
+    steps = from_start[track.to_index(*track.find(END))]
+    walls = np.flatnonzero(track.flat == WALL)
+    # walls on the padded border have neighbours outside the grid
+    walls = walls[(walls >= track.shape[1]) & (walls < track.flat.size - track.shape[1])]
+    offsets = track.neighbour_offsets(DIRECTIONS)
+    unreached = track.flat.size
+    enter = np.where(from_start == UNREACHED, unreached, from_start)[walls[:, None] + offsets].min(axis=1)
+    leave = np.where(to_end == UNREACHED, unreached, to_end)[walls[:, None] + offsets].min(axis=1)
+    return int(np.count_nonzero(steps - (enter + leave + 2) >= saving))
 
 
 def solve_a(data: list[str], example: bool = False) -> int:
-    saving = 2 if example else 100
-    arr = np.array([list(l) for l in data])
-    start = (int(np.where(arr == START)[0][0]), int(np.where(arr == START)[1][0]))
-    end = (int(np.where(arr == END)[0][0]), int(np.where(arr == END)[1][0]))
-    steps, path, _ = bfs(arr, start, end, (-1, -1))
-    assert path is not None
-    walls = set([(x, y) for x, y in zip(*np.where(arr == WALL))])
-    walls = {(w_x, w_y) for w_x, w_y in walls if (0 < w_x < arr.shape[0] - 1 and 0 < w_y < arr.shape[1] - 1)}
-    walls = {(w_x, w_y) for w_x, w_y in walls if (sum(arr[w_x + dx, w_y + dy] == WALL for dx, dy in DIRECTIONS) < 3)}
-    walls = {(w_x, w_y) for w_x, w_y in walls if (sum((w_x + dx, w_y + dy) in path for dx, dy in DIRECTIONS) > 0)}
-
-    count = 0
-    for w_x, w_y in tqdm(walls):
-        cheat_steps, _, _ = bfs(arr, start, end, (w_x, w_y), max_steps=steps, return_path=False)
-        if steps - cheat_steps >= saving:
-            count += 1
-    return count
+    track, neighbours = race(data)
+    from_start = distances_from(track, neighbours, START)
+    to_end = distances_from(track, neighbours, END)
+    return wall_cheats(track, from_start, to_end, 2 if example else 100)
 
 
 def manhattan_distance(x: tuple[int, ...], y: tuple[int, ...]) -> int:
     return sum(abs(c1 - c2) for c1, c2 in zip(x, y))
 
 
-def solve_b(data: list[str], example: bool = False) -> int:
+def cheats_from(i: int, path_np: np.ndarray, saving: int, cheat_limit: int = 20) -> int:
+    """
+    Count the cheats which start at one position of the path and save at least `saving` picoseconds
+    :param i: index of the start of the cheat on the path
+    :param path_np: coordinates of every position on the path
+    :param saving: smallest saving to count
+    :param cheat_limit: longest cheat
+    :return: number of cheats
+    """
+    p = path_np[i]
+    candidates = path_np[i + 3 :]  # + 3 avoids testing neighbours in the path
+
+    distances = np.abs(candidates - p).sum(axis=1)
+
+    valid_indices = (distances <= cheat_limit) & ((np.arange(len(candidates)) + i + 3 - i) > distances)
+    reductions = (np.arange(len(candidates)) + i + 3 - i)[valid_indices] - distances[valid_indices]
+
+    return int(np.sum(reductions >= saving))
+
+
+def long_cheats(track: grid.Grid, path: list[int], saving: int) -> int:
     # i think that for part B we should move away from BFS
     # if we have the list of coords on path then we can iterate over each position in the path and see if a shortcut
     # exists to a later point in the path which would use no more than 20 seconds
-    saving = 50 if example else 100
-    arr = np.array([list(l) for l in data])
-    start = (int(np.where(arr == START)[0][0]), int(np.where(arr == START)[1][0]))
-    end = (int(np.where(arr == END)[0][0]), int(np.where(arr == END)[1][0]))
-    steps, path, visited = bfs(arr, start, end, (-1, -1))
-    assert path is not None
-    assert visited is not None
-    visited[*start] = 0
-    cheat_limit = 20
 
     # first working solution used a nested for loop which took about 3mins
-    # vectorised numpy solutions takes ~1s
-    path_np = np.array(path)
-    count = 0
-    for i, p in tqdm(enumerate(path), total=len(path)):
-        if i + 3 >= len(path):  # + 3 avoids testing neighbours in the path
-            break
-        candidates = path_np[i + 3 :]
+    # vectorised numpy solutions takes ~1s, and the positions are independent so they are spread over the executor
+    path_np = np.stack(np.divmod(np.array(path), track.shape[1]), axis=1)
+    return executor.parallel_map(
+        functools.partial(cheats_from, saving=saving),
+        range(max(len(path) - 3, 0)),
+        shared={"path_np": path_np},
+        reducer=operator.add,
+        initial=0,
+    )
 
-        distances = np.abs(candidates - p).sum(axis=1)
 
-        valid_indices = (distances <= cheat_limit) & ((np.arange(len(candidates)) + i + 3 - i) > distances)
-        reductions = (np.arange(len(candidates)) + i + 3 - i)[valid_indices] - distances[valid_indices]
-
-        count += np.sum(reductions >= saving)
-    return count
+def solve_b(data: list[str], example: bool = False) -> int:
+    track, neighbours = race(data)
+    metrics.inc("bfs_calls")
+    start = track.to_index(*track.find(START))
+    end = track.to_index(*track.find(END))
+    path = pathfinding.bfs(track.flat.size, [start], neighbours, targets=[end]).path()
+    return long_cheats(track, path, 50 if example else 100)
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # one full search from the start gives both the distance field of part A and the predecessors of the path for part B
+    track, neighbours = race(data)
+    metrics.inc("bfs_calls")
+    start = track.to_index(*track.find(START))
+    end = track.to_index(*track.find(END))
+    from_start = pathfinding.bfs(track.flat.size, [start], neighbours)
+    to_end = distances_from(track, neighbours, END)
+    return (
+        wall_cheats(track, from_start.dist, to_end, 2 if example else 100),
+        long_cheats(track, from_start.path(end), 50 if example else 100),
+    )
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
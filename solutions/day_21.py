@@ -1,13 +1,11 @@
 import logging
 import sys
 from collections import Counter
+from functools import cache
 from typing import Any
+from typing import Callable
 
-import fire
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
 
 logging.basicConfig(level=logging.INFO)
 
@@ -20,27 +18,34 @@ MOVE_TO_TUPLE: dict[int, tuple[int, int]] = {0: (-1, 0), 1: (1, 0), 2: (0, -1),
 DIRECTIONAL_KEYPAD = np.array([[GAP, UP, A_BUTTON], [LEFT, DOWN, RIGHT]])
 NUM_TO_MOVE = {0: "^", 1: "v", 2: "<", 3: ">", 10: "A", "A": "A"}
 
-VALID_NUMERIC = {
-    (i, j): NUMERIC_KEYPAD[i, j]
-    for i in range(NUMERIC_KEYPAD.shape[0])
-    for j in range(NUMERIC_KEYPAD.shape[1])
-    if NUMERIC_KEYPAD[i, j] != -1
-}
-
-VALID_DIRECTIONAL = {
-    (i, j): DIRECTIONAL_KEYPAD[i, j]
-    for i in range(DIRECTIONAL_KEYPAD.shape[0])
-    for j in range(DIRECTIONAL_KEYPAD.shape[1])
-    if DIRECTIONAL_KEYPAD[i, j] != -1
-}
-
 
 def get_coordinates(arr: np.ndarray, element: int) -> tuple[int, int]:
     return [(x, y) for x, y in zip(*np.where(arr == element))][0]
 
 
-NUMERIC_GAP = get_coordinates(NUMERIC_KEYPAD, GAP)
-DIRECTION_GAP = get_coordinates(DIRECTIONAL_KEYPAD, GAP)
+def get_valid_keys(keypad: np.ndarray) -> dict[tuple[int, int], int]:
+    return {(i, j): keypad[i, j] for i in range(keypad.shape[0]) for j in range(keypad.shape[1]) if keypad[i, j] != GAP}
+
+
+# the keypad lookups are built on first use rather than at import time
+@cache
+def get_valid_numeric() -> dict[tuple[int, int], int]:
+    return get_valid_keys(NUMERIC_KEYPAD)
+
+
+@cache
+def get_valid_directional() -> dict[tuple[int, int], int]:
+    return get_valid_keys(DIRECTIONAL_KEYPAD)
+
+
+@cache
+def get_numeric_gap() -> tuple[int, int]:
+    return get_coordinates(NUMERIC_KEYPAD, GAP)
+
+
+@cache
+def get_direction_gap() -> tuple[int, int]:
+    return get_coordinates(DIRECTIONAL_KEYPAD, GAP)
 
 
 def get_start(arr: np.ndarray) -> tuple[int, int]:
@@ -61,7 +66,7 @@ def get_moves(y: int, x: int) -> tuple[list[int] | list[Any], list[int] | list[A
 def solve_code(code: list[str | int] | str, keypad: np.ndarray, valid_moves: dict[tuple[int, int], int]) -> list[str]:
     moves = []
     position = get_start(keypad)
-    for digit in tqdm(code):
+    for digit in code:
         digit = A_BUTTON if digit == "A" else digit
         x, y = get_coordinates(keypad, int(digit))
         x_d, y_d = x - position[0], y - position[1]
@@ -82,9 +87,9 @@ def solve_code(code: list[str | int] | str, keypad: np.ndarray, valid_moves: dic
 def solve_a(data: list[str], example: bool = False) -> int:
     total = 0
     for code in data:
-        moves_1 = "".join(solve_code(list(code), NUMERIC_KEYPAD, VALID_NUMERIC))
-        moves_2 = "".join(solve_code(list(moves_1), DIRECTIONAL_KEYPAD, VALID_DIRECTIONAL))
-        moves_3 = "".join(solve_code(list(moves_2), DIRECTIONAL_KEYPAD, VALID_DIRECTIONAL))
+        moves_1 = "".join(solve_code(list(code), NUMERIC_KEYPAD, get_valid_numeric()))
+        moves_2 = "".join(solve_code(list(moves_1), DIRECTIONAL_KEYPAD, get_valid_directional()))
+        moves_3 = "".join(solve_code(list(moves_2), DIRECTIONAL_KEYPAD, get_valid_directional()))
         complexity = len(moves_3) * int(code[:-1])
         total += complexity
     return total
@@ -94,16 +99,16 @@ def solve_b(data: list[str], example: bool = False) -> int:
     total = 0
     n = 25
     for code in data:
-        moves = ["".join(solve_code(list(code), NUMERIC_KEYPAD, VALID_NUMERIC))]
+        moves = ["".join(solve_code(list(code), NUMERIC_KEYPAD, get_valid_numeric()))]
         routines = Counter(moves)
         all_routes = [routines]
-        for _ in tqdm(range(n)):
+        for _ in range(n):
             new_routes = []
             for route in all_routes:
                 new_routines: Counter = Counter()
                 for k, v in route.items():
                     # here we will find new movement patterns and increment the counts for already seen patterns
-                    new_counts = Counter(solve_code(k, DIRECTIONAL_KEYPAD, VALID_DIRECTIONAL))
+                    new_counts = Counter(solve_code(k, DIRECTIONAL_KEYPAD, get_valid_directional()))
                     for k, v2 in new_counts.items():
                         new_counts[k] *= v
                     new_routines.update(new_counts)
@@ -116,7 +121,39 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return total
 
 
+def count_presses(code: str, robots: int, expand: Callable[[str], Counter]) -> int:
+    # every move pattern ends on the A button so patterns can be expanded independently and counted
+    routines = Counter(["".join(solve_code(list(code), NUMERIC_KEYPAD, get_valid_numeric()))])
+    for _ in range(robots):
+        new_routines: Counter = Counter()
+        for k, v in routines.items():
+            for k2, v2 in expand(k).items():
+                new_routines[k2] += v2 * v
+        routines = new_routines
+    return sum(len(k) * v for k, v in routines.items())
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
+def solve_many(inputs: list[list[str]], part: str = "a", example: bool = False) -> list[int]:
+    robots = 2 if part == "a" else 25
+
+    # the expansion of a move pattern on the directional keypad is the same for every code so it is shared by all of
+    # the inputs
+    @cache
+    def expand(k: str) -> Counter:
+        return Counter(solve_code(k, DIRECTIONAL_KEYPAD, get_valid_directional()))
+
+    return [sum(count_presses(code, robots, expand) * int(code[:-1]) for code in data) for data in inputs]
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     sys.argv.append("--part=a")
     sys.argv.append("--expected_sample=126384")
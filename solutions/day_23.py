@@ -3,11 +3,7 @@ import sys
 from collections import defaultdict
 from itertools import combinations
 
-import fire
-import networkx as nx
-import utilities
-from main import main
-from tqdm import tqdm
+import metrics
 
 logging.basicConfig(level=logging.INFO)
 
@@ -19,7 +15,8 @@ def solve_a(data: list[str], example: bool = False) -> int:
         adj[a].add(b)
         adj[b].add(a)
     triplets = set()
-    for key, nodes in tqdm(adj.items(), total=len(adj)):
+    for key, nodes in adj.items():
+        metrics.inc("pairs_checked", len(nodes) * (len(nodes) - 1) // 2)
         for a, b in list(combinations(nodes, 2)):
             if a in adj[b] and any(i.startswith("t") for i in (key, a, b)):
                 triplets.add(tuple(sorted((key, a, b))))
@@ -27,6 +24,9 @@ def solve_a(data: list[str], example: bool = False) -> int:
 
 
 def solve_b(data: list[str], example: bool = False) -> str:
+    # networkx is slow to import and only needed for part B
+    import networkx as nx
+
     adj_list = []
     for conn in data:
         a, b = conn.split("-")
@@ -39,7 +39,15 @@ def solve_b(data: list[str], example: bool = False) -> str:
     return ",".join(sorted(clique))
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, str]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     sys.argv.append("--part=b")
     sys.argv.append("--expected_sample='co,de,ka,ta'")
@@ -4,10 +4,6 @@ from dataclasses import dataclass
 from itertools import chain
 from typing import Callable
 
-import fire
-import utilities
-from main import main
-
 logging.basicConfig(level=logging.INFO)
 
 
@@ -205,9 +201,17 @@ def solve_b(data: list[str], example: bool = False) -> str:
             carry = [g for g in gates if g.w1 in [x_str, y_str] and g.w2 in [x_str, y_str] and g.func == and_gate][0]
         n += 1
 
-    return ",".join(sorted(list(chain(*map(list, swaps)))))  # type: ignore
+    return ",".join(sorted(list(chain(*map(list, swaps)))))
+
+
+def solve_both(data: list[str], example: bool = False) -> tuple[int, str]:
+    return solve_a(data, example), solve_b(data, example)
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -2,20 +2,20 @@ import logging
 import sys
 from itertools import product
 
-import fire
+import grid
 import numpy as np
-import utilities
-from main import main
 
 logging.basicConfig(level=logging.INFO)
 
+FILLED = grid.char("#")
+
 
 def get_lock_heights(arr: np.ndarray) -> list[int]:
-    return np.argmax(arr[::-1] == "#", axis=0) * -1 + arr.shape[0] - 1
+    return np.argmax(arr[::-1] == FILLED, axis=0) * -1 + arr.shape[0] - 1
 
 
 def get_key_heights(arr: np.ndarray) -> list[int]:
-    h = np.argmax(arr == "#", axis=0)
+    h = np.argmax(arr == FILLED, axis=0)
     shift = [6 if x > 0 else 0 for x in h]
     return (shift - h).tolist()
 
@@ -35,9 +35,9 @@ def solve_a(data: list[str], example: bool = False) -> int:
             if i == len(data) - 1:
                 current_pattern.append(row)
             if all(j == "#" for j in current_pattern[0]) and all(j == "." for j in current_pattern[-1]):
-                locks.append(np.array([list(l) for l in current_pattern]))
+                locks.append(grid.from_lines(current_pattern).cells)
             else:
-                keys.append(np.array([list(l) for l in current_pattern]))
+                keys.append(grid.from_lines(current_pattern).cells)
             current_pattern = []
     lock_heights = [get_heights(arr, is_lock=True) for arr in locks]
     key_heights = [get_heights(arr, is_lock=False) for arr in keys]
@@ -57,7 +57,15 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return 0
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     sys.argv.append(f"--part=a")
     sys.argv.append(f"--expected_sample=3")
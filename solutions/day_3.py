@@ -2,12 +2,8 @@ import logging
 import math
 import re
 import sys
-from collections import namedtuple
-from itertools import chain
-
-import fire
-import utilities
-from main import main
+from typing import Iterable
+from typing import Iterator
 
 logging.basicConfig(level=logging.INFO)
 
@@ -15,54 +11,63 @@ logging.basicConfig(level=logging.INFO)
 MUL_PATTERN = r"mul\(\d{1,3},\d{1,3}\)"
 DIGITS_PATTERN = r"\d{1,3},\d{1,3}"
 
-instruction = namedtuple("instruction", ["operation", "index"])
+# compiled once and shared by every input
+MUL_REGEX = re.compile(MUL_PATTERN)
+DIGITS_REGEX = re.compile(DIGITS_PATTERN)
+INSTRUCTION_REGEX = re.compile(rf"{MUL_PATTERN}|don't\(\)|do\(\)")
+# mul(123,456)
+MAX_INSTRUCTION_LENGTH = 12
 
 
 def process_mul_operator(muls: list[str]) -> int:
-    return sum(
-        [math.prod(list(map(int, digits.split(",")))) for mul in muls for digits in re.findall(DIGITS_PATTERN, mul)]
-    )
+    return sum([math.prod(list(map(int, digits.split(",")))) for mul in muls for digits in DIGITS_REGEX.findall(mul)])
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
+def solve_a(data: Iterable[str], example: bool = False) -> int:
     total = 0
     for i in data:
-        valid_muls = re.findall(MUL_PATTERN, i)
+        valid_muls = MUL_REGEX.findall(i)
 
         total += process_mul_operator(valid_muls)
     return total
 
 
-def solve_b(data: list[str], example: bool = False) -> int:
-    string = "".join(data)
-
-    donts = [instruction(operation=0, index=k.start()) for k in re.finditer(r"don't\(\)", string)]
-    dos = [instruction(operation=1, index=k.start()) for k in re.finditer(r"do\(\)", string)]
-
-    number_line: list[instruction] = sorted([*dos, *donts], key=lambda x: x.index)
-
-    valid_text = []
-
-    current_do = 1
-    idx = 0
+def scan_instructions(data: Iterable[str]) -> Iterator[str]:
+    """
+    Find the instructions in the concatenation of the lines without joining them. Only the text after the last match
+    which could still be the start of an instruction is carried over to the next line.
+    """
+    buffer = ""
+    for line in data:
+        buffer += line
+        last_end = 0
+        for match in INSTRUCTION_REGEX.finditer(buffer):
+            yield match.group()
+            last_end = match.end()
+        buffer = buffer[max(last_end, len(buffer) - MAX_INSTRUCTION_LENGTH + 1) :]
 
-    for val in number_line:
-        if current_do == val.operation:
-            continue
-        if current_do == 1 and val.operation == 0:
-            valid_text.append(string[idx : val.index])
-        idx = val.index
-        current_do = val.operation
 
-    if current_do == 1:
-        valid_text.append(string[idx:])
+def solve_b(data: Iterable[str], example: bool = False) -> int:
+    total = 0
+    enabled = True
+    for token in scan_instructions(data):
+        if token == "don't()":
+            enabled = False
+        elif token == "do()":
+            enabled = True
+        elif enabled:
+            total += process_mul_operator([token])
+    return total
 
-    muls = list(chain(*[re.findall(MUL_PATTERN, j) for j in valid_text]))
 
-    total = process_mul_operator(muls)
-    return total
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -3,10 +3,8 @@ import sys
 from collections import defaultdict
 from typing import Optional
 
-import fire
+import grid
 import numpy as np
-import utilities
-from main import main
 
 logging.basicConfig(level=logging.INFO)
 
@@ -59,13 +57,14 @@ def has_valid_neighbour(
     return len(matches) > 0, matches
 
 
+# maps the byte value of each letter to its number, anything else is 0
+LETTER_LOOKUP = np.zeros(256, dtype=np.int8)
+for _letter, _num in mapping.items():
+    LETTER_LOOKUP[grid.char(_letter)] = _num
+
+
 def to_formatted_array(data: list[str]) -> np.ndarray:
-    arr = np.asarray([list(d) for d in data])
-    arr = np.where(np.isin(arr, list(mapping.keys())), arr, 0)
-    for letter, num in mapping.items():
-        arr[arr == letter] = num
-    arr = arr.astype(np.int8)
-    return arr
+    return LETTER_LOOKUP[grid.from_lines(data).cells]
 
 
 def solve_a(data: list[str], example: bool = False) -> int:
@@ -133,6 +132,14 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return total
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -3,10 +3,6 @@ import sys
 from typing import List
 from typing import Tuple
 
-import fire
-import utilities
-from main import main
-
 logging.basicConfig(level=logging.INFO)
 
 
@@ -101,6 +97,19 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return sum_middle_pages(corrected_updates)
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # the rules are read and the updates classified once for both parts
+    rules, updates = get_rules_and_updates(data)
+    dependency_dict = get_dependency_dict(rules)
+    correct_updates, incorrect_updates = classify_updates(dependency_dict, updates)
+    corrected_updates = [correct(update, dependency_dict) for update in incorrect_updates]
+    return sum_middle_pages(correct_updates), sum_middle_pages(corrected_updates)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
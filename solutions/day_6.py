@@ -1,16 +1,16 @@
+import functools
 import logging
 import sys
 
-import fire
+import checkpoints
+import grid
+import metrics
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
 
 logging.basicConfig(level=logging.INFO)
 
-START = "^"
-BLOCK = "#"
+START = grid.char("^")
+BLOCK = grid.char("#")
 
 DIRECTIONS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
 
@@ -26,25 +26,25 @@ def move_in_direction(
     exit = False
     if direction == "down":
         if BLOCK in arr[r:, c]:
-            next_position = (int(np.min(np.where(arr[r:, c] == "#"))) + r - 1, c)
+            next_position = (int(np.min(np.where(arr[r:, c] == BLOCK))) + r - 1, c)
         else:
             next_position = (arr.shape[0] - 1, c)
             exit = True
     if direction == "up":
         if BLOCK in arr[:r, c]:
-            next_position = (int(np.max(np.where(arr[:r, c] == "#"))) + 1, c)
+            next_position = (int(np.max(np.where(arr[:r, c] == BLOCK))) + 1, c)
         else:
             next_position = (0, c)
             exit = True
     if direction == "left":
         if BLOCK in arr[r, :c]:
-            next_position = (r, int(np.max(np.where(arr[r, :c] == "#"))) + 1)
+            next_position = (r, int(np.max(np.where(arr[r, :c] == BLOCK))) + 1)
         else:
             next_position = (r, 0)
             exit = True
     if direction == "right":
         if BLOCK in arr[r, c:]:
-            next_position = (r, int(np.min(np.where(arr[r, c:] == "#"))) + c - 1)
+            next_position = (r, int(np.min(np.where(arr[r, c:] == BLOCK))) + c - 1)
         else:
             next_position = (r, arr.shape[1] - 1)
             exit = True
@@ -95,37 +95,62 @@ def fill_route(arr: np.ndarray, turn_points: list[tuple[int, int]]) -> np.ndarra
     return z
 
 
+def guard_route(data: list[str]) -> tuple[np.ndarray, tuple[int, int], np.ndarray]:
+    """
+    Walk the guard out of the map
+    :param data: puzzle input
+    :return: the map, the start of the guard and a mask of the cells the guard visits
+    """
+    guard_map = grid.from_lines(data)
+    arr = guard_map.cells
+    current_position = guard_map.find(START)
+    turn_points, _ = walk(arr, current_position, "up")
+    return arr, current_position, fill_route(arr, turn_points)
+
+
+def makes_loop(block: tuple[int, int], arr: np.ndarray, current_position: tuple[int, int]) -> int:
+    metrics.inc("walks_simulated")
+    new_arr = np.copy(arr)
+    new_arr[block] = BLOCK
+    _, looped = walk(new_arr, current_position, "up", check_loop=True)
+    return int(looped)
+
+
+def count_loops(data: list[str], arr: np.ndarray, current_position: tuple[int, int], z: np.ndarray) -> int:
+    # only a block on the route can change where the guard goes
+    route_coords = np.where(z == 1)
+
+    # iterate over route coords and test for infinite loop. Each block is independent so the blocks are tried in
+    # parallel, with the map shared between the workers, and progress can be checkpointed
+    return checkpoints.accumulate(
+        "day_6.count_loops",
+        data,
+        zip(route_coords[0].tolist(), route_coords[1].tolist()),
+        functools.partial(makes_loop, current_position=current_position),
+        shared={"arr": arr},
+    )
+
+
 def solve_a(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(l) for l in data])
-    r, c = np.where(arr == START)
-    current_position = (int(r[0]), int(c[0]))
-    current_direction = "up"
-    turn_points, _ = walk(arr, current_position, current_direction)
-    z = fill_route(arr, turn_points)
+    _, _, z = guard_route(data)
     return int(np.sum(z))
 
 
 def solve_b(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(l) for l in data])
-    r, c = np.where(arr == START)
-    current_position = (int(r[0]), int(c[0]))
-    current_direction = "up"
-    initial_turn_points, _ = walk(arr, current_position, current_direction)
-    z = fill_route(arr, initial_turn_points)
-    route_coords = np.where(z == 1)
+    return count_loops(data, *guard_route(data))
+
 
-    # iterate over route coords and test for infinite loop
-    n_loops = 0
-    for r_b, c_b in tqdm(zip(route_coords[0], route_coords[1])):
-        new_arr = np.copy(arr)
-        new_arr[r_b, c_b] = BLOCK
-        _, looped = walk(new_arr, current_position, current_direction, check_loop=True)
-        if looped:
-            n_loops += 1
-    return n_loops
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    # the route walked for part A is the set of places part B tries a new block
+    arr, current_position, z = guard_route(data)
+    return int(np.sum(z)), count_loops(data, arr, current_position, z)
 
 
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
 
     fire.Fire(main)
@@ -1,64 +1,115 @@
+import functools
 import itertools
 import logging
 import operator
 import sys
-from functools import lru_cache
 from typing import Callable
+from typing import Iterable
 
-import fire
-import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
+import checkpoints
+import metrics
+import variants
 
 logging.basicConfig(level=logging.INFO)
 
-
-ops = [operator.add, operator.mul]
+# the operators are tuples so that solving an input never changes the operators of the next one
+OPS_A = (operator.add, operator.mul)
 
 
 def concatenate(a: int, b: int) -> int:
     return int(str(a) + str(b))
 
 
-@lru_cache
-def calc(ops: tuple[Callable], numbers: tuple[int]) -> int:
+OPS_B = (*OPS_A, concatenate)
+
+
+def calc(ops: tuple[Callable, ...], numbers: tuple[int, ...]) -> int:
     total = numbers[0]
     for i, op in enumerate(ops):
         total = op(total, numbers[i + 1])
     return total
 
 
-def solve_equation(equation: str, operations: list[Callable]) -> int:
+def solve_equation(equation: str, operations: tuple[Callable, ...]) -> int:
     answer, numbers = equation.split(": ")
     numbers_int = [int(i) for i in numbers.split()]
     n_ops = len(numbers_int) - 1
     possibles = list(itertools.product(operations, repeat=n_ops))
-    for p in possibles:
+    # counted once per equation rather than once per combination to keep the metric out of the hot loop
+    for tried, p in enumerate(possibles, 1):
         res = calc(tuple(p), tuple(numbers_int))
         if res == int(answer):
+            metrics.inc("combinations_tried", tried)
             return res
+    metrics.inc("combinations_tried", len(possibles))
     return 0
 
 
-def solve_a(data: list[str], example: bool = False) -> int:
+def solve_a(data: Iterable[str], example: bool = False) -> int:
     total = 0
-    for equation in tqdm(data):
-        res = solve_equation(equation, ops)
+    for equation in data:
+        res = solve_equation(equation, OPS_A)
         total += res
     return total
 
 
 # todo this takes too long (~2mins) so there must be a short cut
-def solve_b(data: list[str], example: bool = False) -> int:
+def solve_b(data: Iterable[str], example: bool = False) -> int:
+    # equations are independent so they are spread over the executor, which solves them in parallel on more than one
+    # core, and progress can be checkpointed between them
+    return checkpoints.accumulate("day_7.solve_b", data, data, functools.partial(solve_equation, operations=OPS_B))
+
+
+def can_make(target: int, numbers: list[int], concat: bool) -> bool:
+    # work back from the answer by undoing the last operator - a product must divide the answer and a concatenation
+    # must end with the last number, so most branches are cut straight away
+    if len(numbers) == 1:
+        return target == numbers[0]
+    last, rest = numbers[-1], numbers[:-1]
+    if last and target % last == 0 and can_make(target // last, rest, concat):
+        return True
+    if concat:
+        target_str, last_str = str(target), str(last)
+        if len(target_str) > len(last_str) and target_str.endswith(last_str):
+            if can_make(int(target_str[: -len(last_str)]), rest, concat):
+                return True
+    return target >= last and can_make(target - last, rest, concat)
+
+
+def solve_reverse(data: Iterable[str], concat: bool) -> int:
     total = 0
-    ops.append(concatenate)
-    for equation in tqdm(data):
-        res = solve_equation(equation, ops)
-        total += res
+    for equation in data:
+        metrics.inc("equations_checked")
+        answer, numbers = equation.split(": ")
+        if can_make(int(answer), [int(i) for i in numbers.split()], concat):
+            total += int(answer)
     return total
 
 
+@variants.register(7, "a", "reverse")
+def solve_a_reverse(data: Iterable[str], example: bool = False) -> int:
+    return solve_reverse(data, concat=False)
+
+
+@variants.register(7, "b", "reverse")
+def solve_b_reverse(data: Iterable[str], example: bool = False) -> int:
+    return solve_reverse(data, concat=True)
+
+
+def solve_both(data: Iterable[str], example: bool = False) -> tuple[int, int]:
+    # an equation which holds with + and * also holds once || is allowed, so only the rest are tried again
+    total_a = total_b = 0
+    for equation in data:
+        res = solve_equation(equation, OPS_A)
+        total_a += res
+        total_b += res if res else solve_equation(equation, OPS_B)
+    return total_a, total_b
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -2,14 +2,13 @@ import itertools
 import logging
 import sys
 
-import fire
+import grid
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
 
 logging.basicConfig(level=logging.INFO)
 
+EMPTY = grid.char(".")
+
 
 def find_antinodes_direction_one(pair: tuple[tuple[int, int], tuple[int, int]], r_d: int, c_d: int) -> tuple[int, int]:
     if r_d == 0:
@@ -44,8 +43,8 @@ def is_valid_antinode(node: tuple[int, int], arr: np.ndarray) -> bool:
 
 
 def solve_a(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(a) for a in data])
-    signals = [i for i in np.unique(arr) if i != "."]
+    arr = grid.from_lines(data).cells
+    signals = [i for i in np.unique(arr) if i != EMPTY]
     antinodes: list[tuple[int, int]] = []
     for signal in signals:
         antennas = [(r, c) for r, c in zip(*np.where(arr == signal))]
@@ -62,10 +61,10 @@ def solve_a(data: list[str], example: bool = False) -> int:
 
 
 def solve_b(data: list[str], example: bool = False) -> int:
-    arr = np.array([list(a) for a in data])
-    signals = [i for i in np.unique(arr) if i != "."]
+    arr = grid.from_lines(data).cells
+    signals = [i for i in np.unique(arr) if i != EMPTY]
     antinodes: list[tuple[int, int]] = []
-    for signal in tqdm(signals):
+    for signal in signals:
         antennas = [(r, c) for r, c in zip(*np.where(arr == signal))]
         antinodes.extend(antennas)
         for pair in itertools.combinations(antennas, 2):
@@ -93,6 +92,14 @@ def solve_b(data: list[str], example: bool = False) -> int:
     return len(set(antinodes))
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
@@ -1,11 +1,8 @@
 import logging
 import sys
 
-import fire
+import metrics
 import numpy as np
-import utilities
-from main import main
-from tqdm import tqdm
 
 logging.basicConfig(level=logging.INFO)
 
@@ -86,13 +83,22 @@ def solve_b(data: list[str], example: bool = False) -> int:
     formatted_data = format_gaps(data_input)
     files = get_file(formatted_data)
     gaps = find_contigous_gaps(formatted_data)
-    for file in tqdm(files):
+    for file in files:
         moved, formatted_data = move_file(gaps, file, formatted_data)
         if moved:
+            metrics.inc("files_moved")
             gaps = find_contigous_gaps(formatted_data)
     return checksum(formatted_data)
 
 
+def solve_both(data: list[str], example: bool = False) -> tuple[int, int]:
+    return solve_a(data, example), solve_b(data, example)
+
+
 if __name__ == "__main__":
+    import fire
+    import utilities
+    from main import main
+
     sys.argv.append(f"--day={utilities.get_day(__file__)}")
     fire.Fire(main)
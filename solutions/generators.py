@@ -0,0 +1,489 @@
+import itertools
+import math
+import string
+from typing import Callable
+
+import numpy as np
+
+# generated inputs are solved as puzzle inputs, so grid sizes and thresholds which depend on the example flag take
+# their puzzle values
+GeneratorFunc = Callable[[float, np.random.Generator], list[str]]
+
+GENERATORS: dict[int, GeneratorFunc] = {}
+# parts which cannot be solved on random inputs e.g. day 14 part B waits for a christmas tree to appear
+GENERATED_PARTS: dict[int, list[str]] = {}
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def register(day: int, parts: tuple[str, ...] = ("a", "b")) -> Callable[[GeneratorFunc], GeneratorFunc]:
+    def decorator(func: GeneratorFunc) -> GeneratorFunc:
+        GENERATORS[day] = func
+        GENERATED_PARTS[day] = list(parts)
+        return func
+
+    return decorator
+
+
+def generate(day: int, scale: float = 1.0, seed: int = 0) -> list[str]:
+    """
+    Generate a valid input for a day. A scale of 1 gives an input about the size of the real puzzle input, and the
+    size of the input grows linearly with the scale e.g. a scale of 4 doubles the side of a grid.
+    :param day: day of the challenge
+    :param scale: size of the input relative to the real puzzle input
+    :param seed: random seed
+    :return: input data as lines
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"There is no input generator for day {day}")
+    return GENERATORS[day](scale, np.random.default_rng(seed))
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def _side(base: int, scale: float) -> int:
+    # grids grow in both directions so the side grows with the square root of the scale
+    return max(5, round(base * math.sqrt(scale)))
+
+
+def _grid_to_lines(grid: np.ndarray) -> list[str]:
+    return ["".join(row) for row in grid]
+
+
+@register(1)
+def generate_day_1(scale: float, rng: np.random.Generator) -> list[str]:
+    pairs = rng.integers(10000, 100000, size=(_count(1000, scale), 2))
+    return [f"{l}   {r}" for l, r in pairs]
+
+
+@register(2)
+def generate_day_2(scale: float, rng: np.random.Generator) -> list[str]:
+    reports = []
+    for _ in range(_count(1000, scale)):
+        steps = rng.integers(1, 4, size=rng.integers(4, 8)) * rng.choice([-1, 1])
+        # make most reports unsafe with a single bad step so that the dampener has work to do
+        if rng.random() < 0.7:
+            steps[rng.integers(len(steps))] = rng.integers(-5, 6)
+        levels = np.concatenate([[0], np.cumsum(steps)]) + rng.integers(10, 90)
+        reports.append(" ".join(map(str, levels)))
+    return reports
+
+
+@register(3)
+def generate_day_3(scale: float, rng: np.random.Generator) -> list[str]:
+    noise = list("mul(),don't[]{}<>#$%^&*?!'@ ") + [str(i) for i in range(10)]
+    tokens = ["do()", "don't()", "mul(", ")", ","]
+    lines = []
+    for _ in range(_count(6, scale)):
+        parts: list[str] = []
+        while sum(len(p) for p in parts) < 3000:
+            roll = rng.random()
+            if roll < 0.1:
+                parts.append(f"mul({rng.integers(1, 1000)},{rng.integers(1, 1000)})")
+            elif roll < 0.13:
+                parts.append(str(rng.choice(tokens)))
+            else:
+                parts.append(str(rng.choice(noise)))
+        lines.append("".join(parts))
+    return lines
+
+
+@register(4)
+def generate_day_4(scale: float, rng: np.random.Generator) -> list[str]:
+    side = _side(140, scale)
+    return _grid_to_lines(rng.choice(list("XMAS"), size=(side, side)))
+
+
+@register(5)
+def generate_day_5(scale: float, rng: np.random.Generator) -> list[str]:
+    # every pair of pages has a rule so any update can be put in order
+    pages = [str(p) for p in rng.choice(np.arange(10, 100), size=49, replace=False)]
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(_count(200, scale)):
+        chosen = rng.choice(pages, size=2 * rng.integers(2, 12) + 1, replace=False)
+        update = sorted(chosen, key=pages.index) if rng.random() < 0.5 else list(chosen)
+        updates.append(",".join(update))
+    return [*rules, "", *updates]
+
+
+def _guard_exits(grid: np.ndarray, start: tuple[int, int]) -> bool:
+    rows, cols = grid.shape
+    r, c = start
+    direction = 0
+    turns = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    seen = set()
+    while (r, c, direction) not in seen:
+        seen.add((r, c, direction))
+        nr, nc = r + turns[direction][0], c + turns[direction][1]
+        if not (0 <= nr < rows and 0 <= nc < cols):
+            return True
+        if grid[nr, nc] == "#":
+            direction = (direction + 1) % 4
+        else:
+            r, c = nr, nc
+    return False
+
+
+@register(6)
+def generate_day_6(scale: float, rng: np.random.Generator) -> list[str]:
+    side = _side(130, scale)
+    # the obstacles are placed again until the guard walks off the map
+    while True:
+        grid = np.where(rng.random((side, side)) < 0.05, "#", ".")
+        start = (int(rng.integers(side // 4, 3 * side // 4)), int(rng.integers(side // 4, 3 * side // 4)))
+        grid[start] = "."
+        if _guard_exits(grid, start):
+            grid[start] = "^"
+            return _grid_to_lines(grid)
+
+
+@register(7)
+def generate_day_7(scale: float, rng: np.random.Generator) -> list[str]:
+    equations = []
+    for _ in range(_count(850, scale)):
+        numbers = [int(n) for n in rng.integers(1, 100, size=rng.integers(3, 9))]
+        # about half of the equations can be made true
+        answer = numbers[0]
+        for n in numbers[1:]:
+            op = rng.integers(3)
+            answer = answer + n if op == 0 else answer * n if op == 1 else int(f"{answer}{n}")
+        if rng.random() < 0.5:
+            answer += int(rng.integers(1, 100))
+        equations.append(f"{answer}: {' '.join(map(str, numbers))}")
+    return equations
+
+
+@register(8)
+def generate_day_8(scale: float, rng: np.random.Generator) -> list[str]:
+    side = _side(50, scale)
+    frequencies = list(string.digits + string.ascii_letters)
+    grid = np.full((side, side), ".")
+    n_antennas = _count(200, scale)
+    cells = rng.choice(side * side, size=min(n_antennas, side * side), replace=False)
+    grid.flat[cells] = rng.choice(frequencies, size=len(cells))
+    return _grid_to_lines(grid)
+
+
+@register(9)
+def generate_day_9(scale: float, rng: np.random.Generator) -> list[str]:
+    n_files = _count(10000, scale)
+    digits = rng.integers(0, 10, size=2 * n_files - 1)
+    # files are never empty
+    digits[::2] = rng.integers(1, 10, size=n_files)
+    return ["".join(map(str, digits))]
+
+
+@register(10)
+def generate_day_10(scale: float, rng: np.random.Generator) -> list[str]:
+    side = _side(50, scale)
+    # heights which rise by one per step along the diagonals give plenty of trails, then some noise breaks them up
+    rows, cols = np.indices((side, side))
+    heights = (rows + cols) % 10
+    noise = rng.random((side, side)) < 0.2
+    heights[noise] = rng.integers(0, 10, size=int(noise.sum()))
+    return _grid_to_lines(heights.astype(str))
+
+
+@register(11)
+def generate_day_11(scale: float, rng: np.random.Generator) -> list[str]:
+    return [" ".join(map(str, rng.integers(0, 1000000, size=_count(8, scale))))]
+
+
+@register(12)
+def generate_day_12(scale: float, rng: np.random.Generator) -> list[str]:
+    side = _side(140, scale)
+    # blocks of plants with ragged edges
+    block = 5
+    coarse = rng.choice(list(string.ascii_uppercase), size=(side // block + 1, side // block + 1))
+    grid = np.repeat(np.repeat(coarse, block, axis=0), block, axis=1)[:side, :side]
+    noise = rng.random((side, side)) < 0.1
+    grid[noise] = rng.choice(list(string.ascii_uppercase), size=int(noise.sum()))
+    return _grid_to_lines(grid)
+
+
+@register(13)
+def generate_day_13(scale: float, rng: np.random.Generator) -> list[str]:
+    lines = []
+    for _ in range(_count(320, scale)):
+        while True:
+            a_x, a_y, b_x, b_y = (int(v) for v in rng.integers(10, 100, size=4))
+            # parallel buttons have no single solution
+            if a_x * b_y != a_y * b_x:
+                break
+        a_pushes, b_pushes = (int(v) for v in rng.integers(1, 101, size=2))
+        prize_x, prize_y = a_x * a_pushes + b_x * b_pushes, a_y * a_pushes + b_y * b_pushes
+        # some prizes cannot be won
+        if rng.random() < 0.3:
+            prize_x += int(rng.integers(1, 10))
+        lines.extend(
+            [f"Button A: X+{a_x}, Y+{a_y}", f"Button B: X+{b_x}, Y+{b_y}", f"Prize: X={prize_x}, Y={prize_y}", ""]
+        )
+    return lines[:-1]
+
+
+@register(14, parts=("a",))
+def generate_day_14(scale: float, rng: np.random.Generator) -> list[str]:
+    robots = []
+    for _ in range(_count(500, scale)):
+        x, y = rng.integers(0, 101), rng.integers(0, 103)
+        x_speed, y_speed = rng.integers(-100, 101), rng.integers(-102, 103)
+        robots.append(f"p={x},{y} v={x_speed},{y_speed}")
+    return robots
+
+
+@register(15)
+def generate_day_15(scale: float, rng: np.random.Generator) -> list[str]:
+    # a walled warehouse full of boxes with a few inner walls, the robot in the middle and a random list of moves
+    side = _side(50, scale)
+    grid = np.where(rng.random((side, side)) < 0.3, "O", ".")
+    grid[rng.random((side, side)) < 0.05] = "#"
+    grid[[0, -1], :] = "#"
+    grid[:, [0, -1]] = "#"
+    grid[side // 2, side // 2] = "@"
+    moves = "".join(rng.choice(list("^v<>"), size=_count(20000, scale)))
+    return [*_grid_to_lines(grid), "", *(moves[i : i + 1000] for i in range(0, len(moves), 1000))]
+
+
+@register(16)
+def generate_day_16(scale: float, rng: np.random.Generator) -> list[str]:
+    # a maze carved by depth first search between odd cells, with some extra walls knocked out so that there are
+    # several best paths
+    side = _side(141, scale) // 2 * 2 + 1
+    grid = np.full((side, side), "#")
+    start = (side - 2, 1)
+    grid[start] = "."
+    stack = [start]
+    while stack:
+        r, c = stack[-1]
+        options = [
+            (r + 2 * dr, c + 2 * dc, dr, dc)
+            for dr, dc in DIRECTIONS
+            if 0 < r + 2 * dr < side - 1 and 0 < c + 2 * dc < side - 1 and grid[r + 2 * dr, c + 2 * dc] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc, dr, dc = options[rng.integers(len(options))]
+        grid[r + dr, c + dc] = "."
+        grid[nr, nc] = "."
+        stack.append((nr, nc))
+
+    inner_walls = np.argwhere(grid[1:-1, 1:-1] == "#") + 1
+    for r, c in inner_walls[rng.random(len(inner_walls)) < 0.05]:
+        grid[r, c] = "."
+    grid[start] = "S"
+    grid[1, side - 2] = "E"
+    return _grid_to_lines(grid)
+
+
+def _chronospatial_output(a: int, program: list[int]) -> list[int]:
+    # the program made by generate_day_17 run directly: each output only depends on A, which loses 3 bits per output
+    output = []
+    while True:
+        b = (a % 8) ^ program[3]
+        b = (b ^ (a >> b)) ^ program[7]
+        output.append(b % 8)
+        a >>= 3
+        if a == 0:
+            return output
+
+
+def _has_quine(program: list[int]) -> bool:
+    # build A three bits at a time from the last output back to the first
+    candidates = [0]
+    for n in range(1, len(program) + 1):
+        candidates = [
+            a * 8 + bits
+            for a in candidates
+            for bits in range(8)
+            if a * 8 + bits > 0 and _chronospatial_output(a * 8 + bits, program) == program[-n:]
+        ]
+    return bool(candidates)
+
+
+@register(17)
+def generate_day_17(scale: float, rng: np.random.Generator) -> list[str]:
+    # the program is the same shape as the real one - b = a % 8 ^ k1, c = a >> b, b ^= c ^ k2, a >>= 3, out b, loop -
+    # with constants which let the program output itself, so that part B has an answer. The program has a fixed
+    # length, so the scale sets the number of octal digits of A and so how many times part A goes round the loop.
+    while True:
+        k1, k2 = (int(k) for k in rng.integers(0, 8, size=2))
+        program = [2, 4, 1, k1, 7, 5, 1, k2, 4, 0, 0, 3, 5, 5, 3, 0]
+        if _has_quine(program):
+            break
+    digits = [rng.integers(1, 8), *rng.integers(0, 8, size=_count(16, scale) - 1)]
+    a = int("".join(map(str, digits)), 8)
+    return [f"Register A: {a}", "Register B: 0", "Register C: 0", "", f"Program: {','.join(map(str, program))}"]
+
+
+def _path_exists(side: int, corrupt: set[tuple[int, int]]) -> bool:
+    seen = {(0, 0)}
+    queue = [(0, 0)]
+    for x, y in queue:
+        if (x, y) == (side - 1, side - 1):
+            return True
+        for dx, dy in DIRECTIONS:
+            nxt = (x + dx, y + dy)
+            if 0 <= nxt[0] < side and 0 <= nxt[1] < side and nxt not in corrupt and nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return False
+
+
+@register(18)
+def generate_day_18(scale: float, rng: np.random.Generator) -> list[str]:
+    # the memory space is always 71 x 71 and the first 1024 bytes are dropped for part A, so the scale only sets how
+    # many bytes follow. There are always enough for one to cut off the exit, so part B has an answer.
+    side, fallen = 71, 1024
+    cells = [(x, y) for x in range(side) for y in range(side) if (x, y) not in ((0, 0), (side - 1, side - 1))]
+    while True:
+        order = [cells[i] for i in rng.permutation(len(cells))]
+        if _path_exists(side, set(order[:fallen])):
+            break
+    # the first byte which cuts off the exit, found by bisection
+    low, high = fallen, len(order)
+    while low < high:
+        mid = (low + high) // 2
+        if _path_exists(side, set(order[: mid + 1])):
+            low = mid + 1
+        else:
+            high = mid
+    n_bytes = min(len(order), max(low + 1, _count(3450, scale)))
+    return [f"{x},{y}" for x, y in order[:n_bytes]]
+
+
+@register(19)
+def generate_day_19(scale: float, rng: np.random.Generator) -> list[str]:
+    colours = list("wubrg")
+    towels = {"u", "b", "r", "g"}
+    while len(towels) < 447:
+        towels.add("".join(rng.choice(colours, size=rng.integers(2, 9))))
+    towel_list = sorted(towels)
+    designs = []
+    for _ in range(_count(400, scale)):
+        length = rng.integers(40, 61)
+        if rng.random() < 0.5:
+            design = ""
+            while len(design) < length:
+                design += towel_list[rng.integers(len(towel_list))]
+        else:
+            design = "".join(rng.choice(colours, size=length))
+        designs.append(design)
+    return [", ".join(towel_list), "", *designs]
+
+
+@register(20)
+def generate_day_20(scale: float, rng: np.random.Generator) -> list[str]:
+    # a single track which snakes back and forth across the grid, one wall apart, like the real input
+    side = _side(141, scale) // 4 * 4 + 3
+    grid = np.full((side, side), "#")
+    grid[1 : side - 1 : 2, 1 : side - 1] = "."
+    # the corridors are joined at alternating ends
+    for i, r in enumerate(range(2, side - 2, 2)):
+        grid[r, side - 2 if i % 2 == 0 else 1] = "."
+    grid[1, 1] = "S"
+    last_row = side - 2
+    grid[last_row, 1 if (last_row // 2) % 2 == 1 else side - 2] = "E"
+    return _grid_to_lines(grid)
+
+
+@register(21)
+def generate_day_21(scale: float, rng: np.random.Generator) -> list[str]:
+    return [f"{''.join(map(str, rng.integers(0, 10, size=3)))}A" for _ in range(_count(5, scale))]
+
+
+@register(22)
+def generate_day_22(scale: float, rng: np.random.Generator) -> list[str]:
+    return [str(s) for s in rng.integers(1, 16777216, size=_count(2000, scale))]
+
+
+@register(23)
+def generate_day_23(scale: float, rng: np.random.Generator) -> list[str]:
+    n_nodes = _count(520, scale)
+    # names are two letters in the real input, longer ones are needed once there are more nodes than that allows
+    width = max(2, math.ceil(math.log(n_nodes, 26)))
+    names: set[str] = set()
+    while len(names) < n_nodes:
+        names.add("".join(rng.choice(list(string.ascii_lowercase), size=width)))
+    nodes = sorted(names)
+    edges = set()
+    for i in range(n_nodes):
+        for j in rng.choice(n_nodes, size=6, replace=False):
+            if i != j:
+                edges.add((min(i, j), max(i, j)))
+    # plant a clique larger than any random one so that part B has a single answer
+    clique = rng.choice(n_nodes, size=13, replace=False)
+    edges.update((int(i), int(j)) for i, j in itertools.combinations(sorted(clique), 2))
+    return [f"{nodes[i]}-{nodes[j]}" for i, j in sorted(edges)]
+
+
+@register(24)
+def generate_day_24(scale: float, rng: np.random.Generator) -> list[str]:
+    # a ripple carry adder like the real one with four pairs of gate outputs swapped, each within the full adder of a
+    # different bit. Either the x XOR y and x AND y outputs are swapped, or the output of a bit's z wire is swapped with
+    # another gate of the same adder.
+    n_bits = max(8, _count(45, scale))
+    names: set[str] = set()
+    while len(names) < 5 * n_bits:
+        name = "".join(rng.choice(list(string.ascii_lowercase), size=3))
+        if name[0] not in "xyz":
+            names.add(name)
+    wires = iter(sorted(names))
+
+    def label(prefix: str, bit: int) -> str:
+        return f"{prefix}{bit:02d}"
+
+    # each gate is [input, operation, input, output] for one full adder per bit
+    adders: list[dict[str, list[str]]] = []
+    carry = ""
+    for bit in range(n_bits):
+        x, y = label("x", bit), label("y", bit)
+        if bit == 0:
+            adders.append({"sum": [x, "XOR", y, label("z", 0)], "carry": [x, "AND", y, next(wires)]})
+        else:
+            half_sum, half_carry, carry_and = next(wires), next(wires), next(wires)
+            adders.append(
+                {
+                    "xor": [x, "XOR", y, half_sum],
+                    "and": [x, "AND", y, half_carry],
+                    "sum": [half_sum, "XOR", carry, label("z", bit)],
+                    "carry_and": [half_sum, "AND", carry, carry_and],
+                    "carry": [half_carry, "OR", carry_and, label("z", n_bits) if bit == n_bits - 1 else next(wires)],
+                }
+            )
+        carry = adders[-1]["carry"][3]
+
+    for bit in rng.choice(np.arange(1, n_bits - 1), size=4, replace=False):
+        adder = adders[bit]
+        first, second = (
+            ("xor", "and") if rng.random() < 0.25 else ("sum", str(rng.choice(["and", "carry_and", "carry"])))
+        )
+        adder[first][3], adder[second][3] = adder[second][3], adder[first][3]
+
+    gates = [gate for adder in adders for gate in adder.values()]
+    gates = [gates[i] for i in rng.permutation(len(gates))]
+    # the top bit of x is set so that every bit of the adder is checked in part B
+    x_bits = [*rng.integers(0, 2, size=n_bits - 1), 1]
+    y_bits = rng.integers(0, 2, size=n_bits)
+    return [
+        *(f"{label('x', bit)}: {v}" for bit, v in enumerate(x_bits)),
+        *(f"{label('y', bit)}: {v}" for bit, v in enumerate(y_bits)),
+        "",
+        *(f"{a} {op} {b} -> {out}" for a, op, b, out in gates),
+    ]
+
+
+@register(25, parts=("a",))
+def generate_day_25(scale: float, rng: np.random.Generator) -> list[str]:
+    lines = []
+    for _ in range(_count(500, scale)):
+        heights = rng.integers(0, 6, size=5)
+        is_lock = rng.random() < 0.5
+        rows = ["".join("#" if (r <= h if is_lock else 6 - r <= h) else "." for h in heights) for r in range(1, 6)]
+        top, bottom = ("#####", ".....") if is_lock else (".....", "#####")
+        lines.extend([top, *rows, bottom, ""])
+    return lines[:-1]
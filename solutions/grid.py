@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+from typing import Union
+
+import numpy as np
+
+# (row, col) steps to the four neighbours of a cell, in the same order the days use
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def char(value: str) -> int:
+    """
+    Get the cell value of a character
+    :param value: single character
+    :return: byte value of the character as stored in a grid
+    """
+    return ord(value)
+
+
+@dataclass
+class Grid:
+    """
+    A character grid stored as one byte per cell. Cells are compared with byte values (see `char`) instead of strings.
+    When the grid has been padded the coordinates of every method are those of the padded array.
+    """
+
+    cells: np.ndarray
+    padding: int = 0
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        rows, cols = self.cells.shape
+        return int(rows), int(cols)
+
+    @cached_property
+    def flat(self) -> np.ndarray:
+        """
+        The cells as a 1D array so that a cell can be addressed by a single index, row * width + col. This is a view
+        unless the cells are a read only view of the input buffer, in which case they are copied once.
+        """
+        return self.cells.reshape(-1)
+
+    def find(self, value: Union[int, str]) -> tuple[int, int]:
+        """
+        Find the first cell with a value e.g. the start
+        :param value: byte value or character to look for
+        :return: row and column of the cell
+        """
+        value = char(value) if isinstance(value, str) else value
+        idx = int(np.argmax(self.flat == value))
+        if self.flat[idx] != value:
+            raise ValueError(f"{chr(value)} is not in the grid")
+        return self.to_coords(idx)
+
+    def find_all(self, value: Union[int, str]) -> np.ndarray:
+        """
+        Find every cell with a value
+        :param value: byte value or character to look for
+        :return: array of (row, col) rows
+        """
+        value = char(value) if isinstance(value, str) else value
+        return np.argwhere(self.cells == value)
+
+    def to_index(self, r: int, c: int) -> int:
+        return r * self.shape[1] + c
+
+    def to_coords(self, idx: int) -> tuple[int, int]:
+        r, c = divmod(idx, self.shape[1])
+        return int(r), int(c)
+
+    def neighbour_offsets(self, directions: Iterable[tuple[int, int]] = DIRECTIONS) -> np.ndarray:
+        """
+        Offsets which move a flat index to each neighbour. Without padding these wrap around at the edges so the
+        caller has to check bounds; with a padded border every neighbour of an inner cell is in the grid.
+        :param directions: (row, col) steps
+        :return: flat index offset of each step
+        """
+        return np.array([dr * self.shape[1] + dc for dr, dc in directions], dtype=np.int64)
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy(), self.padding)
+
+
+def from_buffer(buffer: bytes, pad: int = 0, fill: str = "#") -> Grid:
+    """
+    Build a grid straight from the bytes of a rectangular input. Without padding the cells are a read only view of the
+    buffer which skips the line endings, so no cell is copied.
+    :param buffer: input with one row per line, separated by "\n"
+    :param pad: width of a border to add around the grid
+    :param fill: character to fill the border with
+    :return: grid of the input
+    """
+    width = buffer.find(b"\n")
+    width = len(buffer) if width == -1 else width
+    if buffer[width - 1 : width] == b"\r":
+        raise ValueError("Grid input has \\r\\n line endings, only \\n is supported")
+    stride = width + 1
+    # the last line may or may not end with a new line
+    rows = (len(buffer) + 1) // stride
+    view = np.frombuffer(buffer, dtype=np.uint8)
+    # the view assumes that every line is exactly as wide as the first
+    if len(buffer) not in (rows * stride, rows * stride - 1) or np.any(view[width::stride] != ord("\n")):
+        raise ValueError(f"Grid input is not rectangular, every line must be {width} characters like the first")
+    cells = np.lib.stride_tricks.as_strided(view, shape=(rows, width), strides=(stride, 1), writeable=False)
+    if pad:
+        cells = np.pad(cells, pad, constant_values=char(fill))
+    return Grid(cells, pad)
+
+
+def from_lines(lines: Iterable[str], pad: int = 0, fill: str = "#") -> Grid:
+    """
+    Build a grid from the lines of an input
+    :param lines: rows of the grid
+    :param pad: width of a border to add around the grid
+    :param fill: character to fill the border with
+    :return: grid of the input
+    """
+    return from_buffer("\n".join(lines).encode("ascii"), pad, fill)
+
+
+def to_lines(cells: np.ndarray) -> list[str]:
+    """
+    Turn grid cells back into text, which is useful for debugging
+    :param cells: 2D array of byte values
+    :return: rows of the grid
+    """
+    return [row.tobytes().decode("ascii") for row in np.ascontiguousarray(cells, dtype=np.uint8)]
@@ -0,0 +1,212 @@
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+import benchmark
+import checkpoints
+import memory_usage
+import metrics
+import parse_cache
+import prefetch
+import profiler
+import resource_usage
+import utilities
+import yaml
+from benchmark import BenchmarkConfig
+from constants import BOTH
+from constants import YEAR
+
+DAYS = range(1, 26)
+PARTS = ["a", "b"]
+MODES = ["example", "puzzle"]
+
+# these examples have no single known answer so they are skipped when profiling
+SKIPPED_EXAMPLES = [(14, "b"), (25, "b")]
+
+
+@dataclass(frozen=True)
+class Job:
+    day: int
+    part: str
+    mode: str
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    # when set the solver is benchmarked over several runs instead of being timed once
+    benchmark: Optional[BenchmarkConfig] = None
+    # write a cProfile and collapsed stack profile of each solve
+    profile: bool = False
+    profile_dir: Optional[str] = None
+    # trace the allocations of each solve in a separate run after it has been timed
+    memory: bool = False
+    memory_dir: Optional[str] = None
+    # count the solver metrics and cache hits of each solve in a separate run after it has been timed
+    metrics: bool = False
+    # memory map parsed inputs from the parsed input cache instead of parsing them on every run
+    parse_cache: bool = False
+    # save the progress of long candidate loops so an interrupted solve resumes where it stopped
+    checkpoint: bool = False
+
+
+def load_answers() -> dict[str, dict[str, Any]]:
+    """
+    Load the known answers for the example and puzzle data
+    :return: mapping of mode to the answers for that mode
+    """
+    path_prefix = utilities.get_path_prefix()
+    answers = {}
+    for mode, file_name in [("example", "examples"), ("puzzle", "puzzles")]:
+        with open(f"{path_prefix}answers/{file_name}.yaml", "r", encoding="utf-8") as file:
+            answers[mode] = yaml.safe_load(file)
+    return answers
+
+
+def get_expected(answers: dict[str, dict[str, Any]], job: Job) -> Any:
+    """
+    Look up the known answer for a job
+    :param answers: answers loaded by load_answers
+    :param job: job to get the answer for
+    :return: expected answer
+    """
+    if job.part == BOTH:
+        return [answers[job.mode][f"day{job.day}"][part] for part in PARTS]
+    return answers[job.mode][f"day{job.day}"][job.part]
+
+
+def build_jobs(days: Iterable[int] = DAYS, parts: Iterable[str] = PARTS, combine: bool = False) -> list[Job]:
+    """
+    Build the list of (day, part, mode) jobs which make up a profiling run
+    :param days: days to include
+    :param parts: parts to include
+    :param combine: when both parts are included, solve both puzzle parts of a day in one job with solve_both. The
+        examples of the two parts are different inputs so they are still solved separately.
+    :return: list of jobs
+    """
+    parts = list(parts)
+    jobs: list[Job] = []
+    for day in days:
+        day_parts = [part for part in parts if not (day == 25 and part == "b")]
+        combined = combine and all(part in day_parts for part in PARTS)
+        jobs.extend(Job(day, part, mode) for part in day_parts for mode in MODES if not (combined and mode == "puzzle"))
+        if combined:
+            jobs.append(Job(day, BOTH, "puzzle"))
+    return jobs
+
+
+def load_job_data(job: Job, puzzles: Optional[dict[int, list[str]]] = None) -> list[str]:
+    """
+    Load the input data for a job
+    :param job: job to load data for
+    :param puzzles: optional already fetched puzzle data keyed by day
+    :return: input data as lines
+    """
+    if job.mode == "example":
+        return utilities.read_sample_data(f"{utilities.get_path_prefix()}data/day_{job.day}_{job.part}.txt")
+    if puzzles is not None and job.day in puzzles:
+        return puzzles[job.day]
+    return utilities.format_input_data(utilities.get_puzzle(year=YEAR, day=job.day))
+
+
+def load_all_job_data(jobs: Iterable[Job], offline: Optional[bool] = None) -> dict[Job, list[str]]:
+    """
+    Load the input data for a set of jobs. Puzzle inputs missing from the input store are all fetched concurrently
+    before anything is read, so no fetch happens while solving. The inputs which the prefetch did store are kept if
+    some days fail, and the failed days are fetched again one at a time when they are read.
+    :param jobs: jobs to load data for
+    :param offline: only read puzzle inputs from the local input store
+    :return: input data for each job
+    """
+    jobs = list(jobs)
+    days = sorted({job.day for job in jobs if job.mode == "puzzle"})
+    try:
+        prefetch.prefetch(YEAR, days, offline=offline)
+    except prefetch.FetchError as error:
+        logging.warning("%s", error)
+    puzzles = {
+        day: utilities.format_input_data(utilities.get_puzzle(year=YEAR, day=day, offline=offline)) for day in days
+    }
+    return {job: load_job_data(job, puzzles) for job in jobs}
+
+
+def solve_many(module: ModuleType, inputs: list[list[str]], part: str, example: bool = False) -> list[Any]:
+    """
+    Solve a list of inputs with the solve_many entry point of a day, which the days that share work between inputs
+    define, or else one input at a time with the solver of the part
+    :param module: day module
+    :param inputs: input data of each input
+    :param part: part of the problem e.g. a or b
+    :param example: whether the inputs are example data
+    :return: answer for each input in order
+    """
+    batch = getattr(module, "solve_many", None)
+    if batch is not None:
+        return batch(inputs, part, example)
+    func = getattr(module, f"solve_{part}")
+    return [func(data, example) for data in inputs]
+
+
+def run_job(job: Job, data: list[str], expected: Any, options: RunOptions = RunOptions()) -> dict[str, Any]:
+    """
+    Solve a single job and check the answer against the expected answer
+    :param job: job to run
+    :param data: input data for the job
+    :param expected: expected answer
+    :param options: how the job should be measured
+    :return: result row for the profiling table
+    """
+    if job.mode == "example" and (job.day, job.part) in SKIPPED_EXAMPLES:
+        return {"day": job.day, "part": job.part, "mode": job.mode, "answer": 0, "time": 0, "status": "skipped"}
+
+    module = importlib.import_module(f"day_{job.day}")
+    func = getattr(module, f"solve_{job.part}")
+    args = [data, job.mode == "example"]
+
+    name = f"day_{job.day}_{job.part}_{job.mode}"
+    stats: dict[str, Any] = {}
+    with (
+        parse_cache.enabled(options.parse_cache),
+        checkpoints.enabled(options.checkpoint),
+        profiler.maybe_profile(name, options.profile, options.profile_dir),
+    ):
+        if options.benchmark is not None:
+            response, stats = benchmark.benchmark(func, args, options.benchmark)
+            length = stats["warm_median_ns"] / benchmark.NS_PER_S
+            # the benchmark solves many times, so the OS accounting comes from one more cold solve
+            benchmark.clear_caches(func)
+            with resource_usage.track() as usage:
+                func(*args)
+        else:
+            with resource_usage.track() as usage:
+                start = time.perf_counter_ns()
+                response = func(*args)
+                length = (time.perf_counter_ns() - start) / benchmark.NS_PER_S
+        stats.update(usage.to_columns())
+    if options.memory:
+        benchmark.clear_caches(func)
+        _, report = memory_usage.measure_memory(func, args)
+        memory_usage.save_report(report, name, options.memory_dir)
+        stats.update(report.to_columns())
+    if options.metrics:
+        benchmark.clear_caches(func)
+        with metrics.collect(func) as counts:
+            func(*args)
+        stats.update({f"metric_{name}": value for name, value in counts.items()})
+
+    if job.part == BOTH:
+        response = list(response)
+    assert response == expected, f"Failed {job.mode} for day {job.day}, part {job.part}, response {response}"
+    return {
+        "day": job.day,
+        "part": job.part,
+        "mode": job.mode,
+        "answer": response,
+        "time": length,
+        "status": "ok",
+        **stats,
+    }
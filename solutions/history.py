@@ -0,0 +1,270 @@
+import contextlib
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+import numpy as np
+import utilities
+from constants import CACHE_DIR
+
+# columns every result row has, anything else a run adds (benchmark statistics, memory, metrics) is kept as JSON
+RESULT_COLUMNS = ["day", "part", "mode", "answer", "time", "status"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    git_commit TEXT,
+    python_version TEXT,
+    numpy_version TEXT,
+    cpu_model TEXT,
+    cpu_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    answer TEXT,
+    time REAL,
+    status TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    stats TEXT
+);
+CREATE INDEX IF NOT EXISTS results_solver ON results (day, part, mode);
+"""
+
+
+def get_history_path() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/history.sqlite"
+
+
+@contextlib.contextmanager
+def connect(path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Open the history store, creating it if needed. The transaction is committed and the connection closed when the
+    context exits.
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: context manager giving a connection which returns rows as sqlite3.Row
+    """
+    path = get_history_path() if path is None else path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            yield connection
+    finally:
+        connection.close()
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def get_cpu_model() -> str:
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+
+def get_environment() -> dict[str, Any]:
+    """
+    Describe the code and machine a run was made with
+    :return: git commit, python and numpy versions, CPU model, core count and timestamp
+    """
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": get_git_commit(),
+        "python_version": platform.python_version(),
+        "numpy_version": np.__version__,
+        "cpu_model": get_cpu_model(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def record_run(results: list[dict[str, Any]], path: Optional[str] = None) -> int:
+    """
+    Append a profiling run to the history store
+    :param results: result rows from the profiling run, rows reused from the result cache are marked with `cached`
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: id of the run
+    """
+    environment = get_environment()
+    with connect(path) as connection:
+        cursor = connection.execute(
+            f"INSERT INTO runs ({', '.join(environment)}) VALUES ({', '.join('?' * len(environment))})",
+            list(environment.values()),
+        )
+        run_id = cursor.lastrowid
+        assert run_id is not None
+        connection.executemany(
+            "INSERT INTO results (run_id, day, part, mode, answer, time, status, cached, stats) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    int(r["day"]),
+                    r["part"],
+                    r["mode"],
+                    None if r["answer"] is None else str(utilities.to_json(r["answer"])),
+                    r["time"],
+                    r["status"],
+                    int(bool(r.get("cached", False))),
+                    json.dumps(
+                        {k: v for k, v in r.items() if k not in RESULT_COLUMNS and k != "cached"},
+                        default=utilities.to_json,
+                    ),
+                )
+                for r in results
+            ],
+        )
+    return run_id
+
+
+def _rows(cursor: sqlite3.Cursor) -> list[dict[str, Any]]:
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def load_run(run_id: Optional[int] = None, path: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    Load the results of a run with their extra statistics as columns
+    :param run_id: run to load, defaults to the latest run
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: result rows
+    """
+    with connect(path) as connection:
+        if run_id is None:
+            run_id = connection.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+        rows = _rows(
+            connection.execute(
+                "SELECT day, part, mode, answer, time, status, cached, stats FROM results WHERE run_id = ? "
+                "ORDER BY day, part, mode",
+                (run_id,),
+            )
+        )
+    return [{**{k: v for k, v in row.items() if k != "stats"}, **json.loads(row["stats"] or "{}")} for row in rows]
+
+
+def trend(day: int, part: str, mode: str = "puzzle", path: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    Get the time of a solver in every run which solved it, oldest first. Results reused from the result cache are left
+    out as they repeat an earlier timing.
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param mode: example or puzzle
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: one row per run with its timestamp, commit and time
+    """
+    with connect(path) as connection:
+        return _rows(
+            connection.execute(
+                "SELECT runs.id AS run_id, runs.timestamp, runs.git_commit, results.time FROM results "
+                "JOIN runs ON runs.id = results.run_id "
+                "WHERE day = ? AND part = ? AND mode = ? AND status = 'ok' AND NOT cached ORDER BY runs.id",
+                (day, part, mode),
+            )
+        )
+
+
+def fastest(mode: str = "puzzle", path: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    Get the fastest recorded version of every solver
+    :param mode: example or puzzle
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: one row per solver with the best time and the commit it was recorded at
+    """
+    with connect(path) as connection:
+        # sqlite returns the other columns from the row holding the MIN
+        return _rows(
+            connection.execute(
+                "SELECT day, part, MIN(time) AS time, runs.git_commit, runs.timestamp FROM results "
+                "JOIN runs ON runs.id = results.run_id "
+                "WHERE mode = ? AND status = 'ok' AND NOT cached GROUP BY day, part ORDER BY day, part",
+                (mode,),
+            )
+        )
+
+
+def compare_commits(
+    commit_a: str, commit_b: str, mode: str = "puzzle", path: Optional[str] = None
+) -> list[dict[str, Any]]:
+    """
+    Compare the solver times of two commits side by side using the latest run of each. Results reused from the result
+    cache are left out, as their time was measured at an earlier commit.
+    :param commit_a: commit hash or prefix of the first commit
+    :param commit_b: commit hash or prefix of the second commit
+    :param mode: example or puzzle
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: one row per solver with the time at each commit and the ratio of b to a
+    """
+    query = (
+        "SELECT day, part, time FROM results WHERE mode = ? AND status = 'ok' AND NOT cached AND run_id = "
+        "(SELECT MAX(id) FROM runs WHERE git_commit LIKE ?)"
+    )
+    with connect(path) as connection:
+        times_a = {(r["day"], r["part"]): r["time"] for r in connection.execute(query, (mode, f"{commit_a}%"))}
+        times_b = {(r["day"], r["part"]): r["time"] for r in connection.execute(query, (mode, f"{commit_b}%"))}
+    return [
+        {
+            "day": day,
+            "part": part,
+            "time_a": times_a.get((day, part)),
+            "time_b": times_b.get((day, part)),
+            "ratio": times_b[(day, part)] / times_a[(day, part)]
+            if (day, part) in times_a and (day, part) in times_b and times_a[(day, part)] > 0
+            else None,
+        }
+        for day, part in sorted({*times_a, *times_b})
+    ]
+
+
+def plot_trend(day: int, part: str, mode: str = "puzzle", path: Optional[str] = None) -> str:
+    """
+    Chart the time of a solver across runs
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param mode: example or puzzle
+    :param path: database file, defaults to .cache/history.sqlite
+    :return: path of the chart
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
+    times = pd.DataFrame(trend(day, part, mode, path))
+    times["commit"] = times["git_commit"].str[:7]
+    sns.lineplot(times, x="run_id", y="time", marker="o")
+    plt.xticks(times["run_id"], times["commit"], rotation=45)
+    plt.ylabel("Time (s)")
+    plt.title(f"Day {day} part {part} ({mode})")
+    chart_path = f"{utilities.get_path_prefix()}{CACHE_DIR}/day_{day}_{part}_{mode}_trend.png"
+    plt.savefig(chart_path, bbox_inches="tight")
+    plt.close()
+    return chart_path
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire({"trend": trend, "fastest": fastest, "compare": compare_commits, "plot_trend": plot_trend})
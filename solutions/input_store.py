@@ -0,0 +1,181 @@
+import contextlib
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+import utilities
+from constants import CACHE_DIR
+from constants import YEAR
+
+logging.basicConfig(level=logging.INFO)
+
+OFFLINE_ENV = "AOC_OFFLINE"
+
+
+class MissingInputError(FileNotFoundError):
+    pass
+
+
+def get_store_dir() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/inputs"
+
+
+def is_offline() -> bool:
+    """
+    Check whether offline mode has been switched on through the environment or the .env file
+    :return: True if inputs must only come from the local store
+    """
+    utilities.load_env()
+    return os.environ.get(OFFLINE_ENV, "0") == "1"
+
+
+def _index_path() -> str:
+    return f"{get_store_dir()}/index.json"
+
+
+def _object_path(digest: str) -> str:
+    return f"{get_store_dir()}/objects/{digest[:2]}/{digest}"
+
+
+def load_index() -> dict[str, str]:
+    """
+    Load the index of the store which maps "year/day" to the sha256 of the input
+    :return: index of the store
+    """
+    if not os.path.exists(_index_path()):
+        return {}
+    with open(_index_path(), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _atomic_write(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # a unique temporary file next to the target so that concurrent writers never share one and the rename is atomic
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _index_lock() -> Iterator[None]:
+    """
+    Hold an exclusive lock on the index so that concurrent writers, in this or other processes, never lose entries
+    :return: context manager
+    """
+    os.makedirs(get_store_dir(), exist_ok=True)
+    with open(f"{get_store_dir()}/index.lock", "a", encoding="utf-8") as file:
+        try:
+            import fcntl
+        except ImportError:
+            # fcntl only exists on unix, elsewhere the index is updated without a lock
+            yield
+            return
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def put_input(year: int, day: int, data: str) -> str:
+    """
+    Add an input to the store
+    :param year: year of the challenge
+    :param day: day of the challenge
+    :param data: puzzle input
+    :return: sha256 of the input
+    """
+    content = data.encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()
+    if not os.path.exists(_object_path(digest)):
+        _atomic_write(_object_path(digest), content)
+    with _index_lock():
+        index = load_index()
+        index[f"{year}/{day}"] = digest
+        _atomic_write(_index_path(), json.dumps(index, indent=2, sort_keys=True).encode("utf-8"))
+    return digest
+
+
+def get_digest(year: int, day: int) -> Optional[str]:
+    """
+    Get the sha256 of a stored input
+    :param year: year of the challenge
+    :param day: day of the challenge
+    :return: sha256 of the input or None if it is not in the store
+    """
+    digest = load_index().get(f"{year}/{day}")
+    if digest is None or not os.path.exists(_object_path(digest)):
+        return None
+    return digest
+
+
+def open_input(year: int, day: int) -> Optional[mmap.mmap]:
+    """
+    Memory map a stored input so it can be read without copying it into the process
+    :param year: year of the challenge
+    :param day: day of the challenge
+    :return: read only memory map of the input or None if it is not in the store
+    """
+    digest = get_digest(year, day)
+    if digest is None:
+        return None
+    with open(_object_path(digest), "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_input(year: int, day: int) -> Optional[str]:
+    """
+    Read a stored input
+    :param year: year of the challenge
+    :param day: day of the challenge
+    :return: puzzle input or None if it is not in the store
+    """
+    mapped = open_input(year, day)
+    if mapped is None:
+        return None
+    with mapped, memoryview(mapped) as view:
+        return str(view, "utf-8")
+
+
+def fill(year: int = YEAR, days: Iterable[int] = range(1, 26)) -> None:
+    """
+    Download any inputs which are missing from the store, see `prefetch.prefetch`
+    :param year: year of the challenge
+    :param days: days to download
+    :return: void
+    """
+    import prefetch
+
+    prefetch.prefetch(year, days, offline=False)
+
+
+def verify() -> bool:
+    """
+    Check that every stored input still matches its sha256
+    :return: True if all inputs are intact
+    """
+    valid = True
+    for key, digest in load_index().items():
+        with open(_object_path(digest), "rb") as file:
+            if hashlib.sha256(file.read()).hexdigest() != digest:
+                logging.error("Input %s does not match its hash", key)
+                valid = False
+    return valid
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire({"fill": fill, "verify": verify})
@@ -1,27 +1,121 @@
+import glob
 import importlib
 import logging
 import os
+from types import ModuleType
+from typing import Any
 from typing import Optional
 
+import checkpoints
+import profiler
 import utilities
+import variants
+from constants import BOTH
 from constants import YEAR
 
 
+def solve_directory(module: ModuleType, part: str, directory: str, example: bool = False) -> dict[str, Any]:
+    """
+    Solve every input file in a directory, in one batch if the day can share work between inputs
+    :param module: day module
+    :param part: part of the problem e.g. a, b or both
+    :param directory: directory of .txt input files
+    :param example: whether the inputs are example data
+    :return: answer for each input file
+    """
+    import harness
+
+    paths = sorted(glob.glob(os.path.join(directory, "*.txt")))
+    inputs = [utilities.read_sample_data(path) for path in paths]
+    if part == BOTH:
+        return {path: getattr(module, "solve_both")(data, example) for path, data in zip(paths, inputs)}
+    return dict(zip(paths, harness.solve_many(module, inputs, part, example)))
+
+
+def check_examples(module: ModuleType, day: int, verify: bool = True, profile: bool = False) -> None:
+    """
+    Solve the example of each part of a day and check it against the known example answers in answers/examples.yaml
+    :param module: day module
+    :param day: day of the puzzle
+    :param verify: check the answers, otherwise they are only logged
+    :param profile: profile each solve
+    :return: void
+    """
+    import harness
+
+    answers = harness.load_answers()
+    for job in harness.build_jobs([day]):
+        if job.mode != "example" or (job.day, job.part) in harness.SKIPPED_EXAMPLES:
+            continue
+        with profiler.maybe_profile(f"day_{day}_{job.part}_example", profile):
+            answer = getattr(module, f"solve_{job.part}")(harness.load_job_data(job), example=True)
+        if verify:
+            expected = harness.get_expected(answers, job)
+            assert answer == expected, f"Failed Sample {job.part}! Expected {expected} but got {answer}"
+            logging.info("Sample %s Succeeded!", job.part)
+        else:
+            logging.info("Test answer %s = %s", job.part, answer)
+
+
+def solve_both_parts(
+    module: ModuleType, day: int, offline: Optional[bool] = None, profile: bool = False, checkpoint: bool = False
+) -> None:
+    """
+    Solve both parts of the puzzle from one parse with the solve_both entry point of a day and submit each answer
+    :param module: day module
+    :param day: day of the puzzle
+    :param offline: only read the puzzle input from the local input store
+    :param profile: profile the solve
+    :param checkpoint: save the progress of long candidate loops so an interrupted solve can resume
+    :return: void
+    """
+    puzzle = utilities.format_input_data(utilities.get_puzzle(year=YEAR, day=day, offline=offline))
+
+    with checkpoints.enabled(checkpoint), profiler.maybe_profile(f"day_{day}_{BOTH}_puzzle", profile):
+        answers = getattr(module, "solve_both")(puzzle)
+    for part, answer in zip(["a", "b"], answers):
+        logging.info("Puzzle Answer %s = %s!", part, answer)
+        utilities.submit_answer(answer=answer, year=YEAR, day=day, part=part)
+
+
 def main(
-    day: int = 1, part: str = "a", expected_sample: Optional[int] = None, test: bool = False, force_test: bool = False
+    day: int = 1,
+    part: str = "a",
+    expected_sample: Optional[int] = None,
+    test: bool = False,
+    force_test: bool = False,
+    offline: Optional[bool] = None,
+    profile: bool = False,
+    directory: Optional[str] = None,
+    checkpoint: bool = False,
+    variant: Optional[str] = None,
 ) -> None:
-    path_prefix = "../" if os.getcwd().endswith("solutions") else "./"
-    sample = utilities.read_sample_data(f"{path_prefix}data/day_{day}_{part}.txt")
+    path_prefix = utilities.get_path_prefix()
 
     module_name = f"day_{day}"
 
     module = importlib.import_module(module_name)
-    solve_a = getattr(module, "solve_a")
-    solve_b = getattr(module, "solve_b")
 
-    func = solve_a if part == "a" else solve_b
+    if directory is not None:
+        for path, answer in solve_directory(module, part, directory, example=test).items():
+            logging.info("%s = %s", path, answer)
+        return
+
+    if part == BOTH:
+        # the examples of the two parts are different inputs, so they are checked one part at a time against the known
+        # answers (a single --expected_sample cannot cover both) and only the puzzle is solved in one go
+        check_examples(module, day, verify=not force_test, profile=profile)
+        if not test:
+            solve_both_parts(module, day, offline, profile, checkpoint)
+        return
+
+    sample = utilities.read_sample_data(f"{path_prefix}data/day_{day}_{part}.txt")
+    # a variant registered in the day module can be chosen by name, or "auto" picks the fastest for the input size
+    func = variants.resolve(day, part, variant, sample)
+
     if expected_sample is not None:
-        sample_answer = func(sample, example=True)
+        with profiler.maybe_profile(f"day_{day}_{part}_example", profile):
+            sample_answer = func(sample, example=True)
         assert sample_answer == expected_sample, f"Failed Sample! Expected {expected_sample} but got {sample_answer}"
         logging.info("Sample Succeeded!")
     else:
@@ -29,13 +123,16 @@ def main(
 
     if force_test:
         logging.info("Force Testing! This runs the example data but does not verify the answer!")
-        sample_answer = func(sample, example=True)
+        with profiler.maybe_profile(f"day_{day}_{part}_example", profile):
+            sample_answer = func(sample, example=True)
         logging.info("Test answer = %s", sample_answer)
 
     if not test:
-        puzzle = utilities.format_input_data(utilities.get_puzzle(year=YEAR, day=day))
+        puzzle = utilities.format_input_data(utilities.get_puzzle(year=YEAR, day=day, offline=offline))
+        func = variants.resolve(day, part, variant, puzzle)
 
-        answer = func(puzzle)
+        with checkpoints.enabled(checkpoint), profiler.maybe_profile(f"day_{day}_{part}_puzzle", profile):
+            answer = func(puzzle)
         logging.info("Puzzle Answer = %s!", answer)
 
         utilities.submit_answer(answer=answer, year=YEAR, day=day, part=part)
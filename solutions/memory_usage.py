@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import tracemalloc
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+import utilities
+from constants import CACHE_DIR
+
+TOP_LINES = 10
+# how often to check the traced memory and how much it must have grown by to take a new snapshot
+PEAK_POLL_INTERVAL = 0.01
+PEAK_GROWTH_FACTOR = 1.1
+
+
+@dataclass
+class AllocationLine:
+    location: str
+    size_bytes: int
+    count: int
+
+
+@dataclass
+class MemoryReport:
+    peak_bytes: int = 0
+    net_bytes: int = 0
+    # source lines holding the most memory close to the peak and after the function returned
+    peak_lines: list[AllocationLine] = field(default_factory=list)
+    retained_lines: list[AllocationLine] = field(default_factory=list)
+
+    def to_columns(self) -> dict[str, Any]:
+        """
+        Summarise the report as extra columns for the profiling table
+        :return: peak, net and the top allocating line
+        """
+        return {
+            "peak_alloc_bytes": self.peak_bytes,
+            "net_alloc_bytes": self.net_bytes,
+            "top_alloc_line": self.peak_lines[0].location if self.peak_lines else None,
+        }
+
+
+def get_top_lines(snapshot: tracemalloc.Snapshot, top: int) -> list[AllocationLine]:
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    return [
+        AllocationLine(f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}", s.size, s.count)
+        for s in snapshot.statistics("lineno")[:top]
+    ]
+
+
+class PeakSnapshotter:
+    """
+    Memory held at the end of a function can be much smaller than at its peak, so this polls the traced memory from a
+    background thread and takes a new snapshot each time it grows past the size of the last snapshot
+    """
+
+    def __init__(self, top: int) -> None:
+        self.top = top
+        self.size = 0
+        self.lines: list[AllocationLine] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(PEAK_POLL_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.size * PEAK_GROWTH_FACTOR:
+                self.lines = get_top_lines(tracemalloc.take_snapshot(), self.top)
+                self.size = current
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def get_memory_dir() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/memory"
+
+
+def measure_memory(func: Callable, args: list[Any], top: int = TOP_LINES) -> tuple[Any, MemoryReport]:
+    """
+    Run a function with tracemalloc switched on. tracemalloc slows the function down a lot so this should not be
+    combined with timing.
+    :param func: function to run
+    :param args: positional arguments for the function
+    :param top: number of source lines to report
+    :return: result of the function and a report of the peak allocation, the allocation still held after the function
+        returned, and the source lines holding the most memory at each point
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    # only allocations made by the function are traced
+    tracemalloc.clear_traces()
+    tracemalloc.reset_peak()
+    snapshotter = PeakSnapshotter(top)
+    snapshotter.start()
+
+    try:
+        result = func(*args)
+    finally:
+        snapshotter.stop()
+        net_size, peak_size = tracemalloc.get_traced_memory()
+        retained_lines = get_top_lines(tracemalloc.take_snapshot(), top)
+        if not was_tracing:
+            tracemalloc.stop()
+
+    peak_lines = snapshotter.lines if snapshotter.size > net_size else retained_lines
+    return result, MemoryReport(peak_size, net_size, peak_lines, retained_lines)
+
+
+def save_report(report: MemoryReport, name: str, out_dir: Optional[str] = None) -> str:
+    """
+    Write the full memory report for a job
+    :param report: memory report
+    :param name: file name stem e.g. day_15_a_puzzle
+    :param out_dir: directory to write to, defaults to .cache/memory
+    :return: path of the report
+    """
+    out_dir = get_memory_dir() if out_dir is None else out_dir
+    os.makedirs(out_dir, exist_ok=True)
+    path = f"{out_dir}/{name}.json"
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(asdict(report), file, indent=2)
+    return path
@@ -0,0 +1,83 @@
+import contextlib
+from collections import Counter
+from typing import Any
+from typing import Callable
+from typing import Iterator
+
+import caching
+
+# Solvers record metrics through the module attributes e.g. `metrics.inc("nodes_expanded")`. While metrics are
+# disabled these are bound to a function which does nothing, so a disabled metric costs a single call and nothing is
+# stored.
+
+_counters: Counter = Counter()
+_gauges: dict[str, float] = {}
+
+
+def _noop(*_: Any) -> None:
+    pass
+
+
+def _inc(name: str, value: int = 1) -> None:
+    _counters[name] += value
+
+
+def _gauge(name: str, value: float) -> None:
+    _gauges[name] = value
+
+
+inc: Callable[..., None] = _noop
+gauge: Callable[[str, float], None] = _noop
+
+
+def enable() -> None:
+    global inc, gauge  # pylint: disable=global-statement
+    inc, gauge = _inc, _gauge
+
+
+def disable() -> None:
+    global inc, gauge  # pylint: disable=global-statement
+    inc, gauge = _noop, _noop
+
+
+def is_enabled() -> bool:
+    return inc is _inc
+
+
+def reset() -> None:
+    _counters.clear()
+    _gauges.clear()
+
+
+def snapshot() -> dict[str, float]:
+    """
+    Get the current value of every metric
+    :return: mapping of metric name to value
+    """
+    return {**_counters, **_gauges}
+
+
+@contextlib.contextmanager
+def collect(func: Callable) -> Iterator[dict[str, float]]:
+    """
+    Record the metrics of the code run inside the context, including the cache hits, misses and evictions of the
+    solver's module
+    :param func: solver function being run
+    :return: context manager giving a dict which is filled with the metrics when the context exits
+    """
+    was_enabled = is_enabled()
+    reset()
+    enable()
+    caches_before = caching.get_cache_stats(func)
+    result: dict[str, float] = {}
+    try:
+        yield result
+    finally:
+        if not was_enabled:
+            disable()
+        result.update(snapshot())
+        for name, stats in caching.get_cache_stats(func).items():
+            before = caches_before.get(name, (0, 0, 0))
+            for stat, value, before_value in zip(["hits", "misses", "evictions"], stats, before):
+                result[f"{name}_cache_{stat}"] = value - before_value
+        reset()
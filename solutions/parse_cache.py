@@ -0,0 +1,96 @@
+import functools
+import os
+import shutil
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import toggles
+import utilities
+from constants import CACHE_DIR
+
+# Parsers decorated with `cached` store what they return under .cache/parsed, keyed by the parser, its version and the
+# sha256 of the input. Each array is saved as its own .npy file so that later runs memory map it instead of parsing
+# again. The cache is off unless it has been enabled, e.g. by `run_profiling.py --parse_cache`, so solvers never write
+# files by default. Loaded arrays are read only, so a solver which changes a parsed array must copy it first.
+
+Parsed = Union[np.ndarray, tuple[np.ndarray, ...]]
+
+
+def get_cache_dir() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/parsed"
+
+
+_toggle = toggles.CacheDirToggle(get_cache_dir)
+enable = _toggle.enable
+disable = _toggle.disable
+is_enabled = _toggle.is_enabled
+enabled = _toggle.enabled
+
+
+def save(path: str, parsed: Parsed) -> None:
+    """
+    Save parsed arrays to a directory with one .npy file per array. The directory is written under a temporary name and
+    renamed, so a reader never sees a partial entry.
+    :param path: directory of the entry
+    :param parsed: array or tuple of arrays
+    :return: void
+    """
+    arrays = parsed if isinstance(parsed, tuple) else (parsed,)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    for i, arr in enumerate(arrays):
+        np.save(f"{tmp_path}/{i}.npy", np.ascontiguousarray(arr))
+    if isinstance(parsed, tuple):
+        open(f"{tmp_path}/tuple", "wb").close()  # pylint: disable=consider-using-with
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # another process saved the same entry first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load(path: str) -> Optional[Parsed]:
+    """
+    Memory map the arrays of an entry
+    :param path: directory of the entry
+    :return: array or tuple of arrays, None if there is no entry
+    """
+    if not os.path.isdir(path):
+        return None
+    n_arrays = len([f for f in os.listdir(path) if f.endswith(".npy")])
+    arrays = tuple(np.load(f"{path}/{i}.npy", mmap_mode="r") for i in range(n_arrays))
+    return arrays if os.path.exists(f"{path}/tuple") else arrays[0]
+
+
+def cached(version: int = 1) -> Callable[[Callable[..., Parsed]], Callable[..., Parsed]]:
+    """
+    Decorator to cache the arrays returned by a parser. Bump the version whenever the parser changes what it returns.
+    Inputs which are streamed (any iterable which is not a list, tuple, str or bytes) are always parsed.
+    :param version: version of the parser
+    :return: decorator
+    """
+
+    def decorator(func: Callable[..., Parsed]) -> Callable[..., Parsed]:
+        name = f"{func.__module__}.{func.__qualname__}.v{version}"
+
+        @functools.wraps(func)
+        def wrapper(data: Any, *args: Any) -> Parsed:
+            if _toggle.cache_dir is None or not isinstance(data, (list, tuple, str, bytes)):
+                return func(data, *args)
+            key = utilities.hash_input(data)
+            if args:
+                key = utilities.hash_input(f"{key}{args!r}")
+            path = f"{_toggle.cache_dir}/{name}/{key}"
+            parsed = load(path)
+            if parsed is None:
+                parsed = func(data, *args)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                save(path, parsed)
+            return parsed
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,125 @@
+import itertools
+from typing import Iterable
+from typing import Iterator
+from typing import Union
+
+import numpy as np
+
+# Integers are pulled out of a whole block of input at once with numpy rather than a regex and an int() per number. A
+# block is scanned for runs of digits, the digits of every run are weighted by their power of ten and summed with one
+# reduceat, and a run is negated if it follows a "-". Numbers must fit in an int64.
+
+NEWLINE = ord("\n")
+MINUS = ord("-")
+ZERO = ord("0")
+NINE = ord("9")
+POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+# lines are parsed in blocks of this many so that an iterable input never has to be held as text all at once
+BLOCK_LINES = 1 << 16
+
+Source = Union[str, bytes, Iterable[str]]
+
+
+def iter_blocks(data: Source, block_lines: int = BLOCK_LINES) -> Iterator[bytes]:
+    """
+    Split an input into blocks of whole lines
+    :param data: text or bytes of the input, or its lines
+    :param block_lines: lines per block when the input is given as lines
+    :return: iterator of blocks, each ending with a new line
+    """
+    if isinstance(data, bytes):
+        yield data if data.endswith(b"\n") else data + b"\n"
+        return
+    if isinstance(data, str):
+        yield (data if data.endswith("\n") else data + "\n").encode("ascii")
+        return
+    lines = iter(data)
+    while block := list(itertools.islice(lines, block_lines)):
+        block.append("")
+        yield "\n".join(block).encode("ascii")
+
+
+def _scan(buffer: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the integers in a block of bytes
+    :param buffer: the block as uint8
+    :return: the integers and the byte index at which each one starts
+    """
+    digits = (buffer >= ZERO) & (buffer <= NINE)
+    edges = np.flatnonzero(np.diff(digits.view(np.int8), prepend=0, append=0))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64), starts
+
+    positions = np.flatnonzero(digits)
+    lengths = ends - starts
+    # the place value of each digit is its distance from the end of its number
+    places = np.repeat(ends, lengths) - positions - 1
+    weighted = (buffer[positions].astype(np.int64) - ZERO) * POWERS_OF_TEN[places]
+    offsets = np.cumsum(lengths)[:-1]
+    values = np.add.reduceat(weighted, np.concatenate((np.zeros(1, dtype=offsets.dtype), offsets)))
+
+    # a number at the start of a block has no byte before it, so it is compared with its own first digit instead
+    negative = buffer[np.maximum(starts - 1, 0)] == MINUS
+    values[negative] *= -1
+    return values, starts
+
+
+def extract_ints(data: Source, dtype: type = np.int64) -> np.ndarray:
+    """
+    Get every integer in an input, in the order they appear. A "-" directly before a number makes it negative.
+    :param data: text or bytes of the input, or its lines
+    :param dtype: numpy type of the result
+    :return: 1D array of the integers
+    """
+    values = [_scan(np.frombuffer(block, dtype=np.uint8))[0] for block in iter_blocks(data)]
+    return np.concatenate(values).astype(dtype, copy=False) if values else np.zeros(0, dtype=dtype)
+
+
+def records(data: Source, width: int, dtype: type = np.int64) -> np.ndarray:
+    """
+    Get the integers of an input as fixed width records e.g. the pairs of day 1 or the 6 numbers of a day 13 machine
+    :param data: text or bytes of the input, or its lines
+    :param width: integers per record
+    :param dtype: numpy type of the result
+    :return: 2D array with one row per record
+    """
+    values = extract_ints(data, dtype)
+    if len(values) % width:
+        raise ValueError(f"{len(values)} integers do not split into records of {width}")
+    return values.reshape(-1, width)
+
+
+def iter_ragged(data: Source, dtype: type = np.int64) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Get the integers of each line of an input a block at a time, see `ragged`
+    :param data: text or bytes of the input, or its lines
+    :param dtype: numpy type of the values
+    :return: iterator of the offsets and values of each block
+    """
+    for block in iter_blocks(data):
+        buffer = np.frombuffer(block, dtype=np.uint8)
+        values, starts = _scan(buffer)
+        newlines = np.flatnonzero(buffer == NEWLINE)
+        # each number belongs to the line whose new line is the first one after it starts
+        counts = np.bincount(np.searchsorted(newlines, starts), minlength=len(newlines))
+        line_ends = np.cumsum(counts)
+        yield np.concatenate((np.zeros(1, dtype=line_ends.dtype), line_ends)), values.astype(dtype, copy=False)
+
+
+def ragged(data: Source, dtype: type = np.int64) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the integers of each line of an input when lines hold different numbers of integers e.g. the reports of day 2.
+    The integers of line i are values[offsets[i] : offsets[i + 1]].
+    :param data: text or bytes of the input, or its lines
+    :param dtype: numpy type of the values
+    :return: offsets with one more entry than there are lines, and the values of every line back to back
+    """
+    all_offsets, all_values = [np.zeros(1, dtype=np.int64)], []
+    total = 0
+    for offsets, values in iter_ragged(data, dtype):
+        all_offsets.append(offsets[1:] + total)
+        all_values.append(values)
+        total += len(values)
+    return np.concatenate(all_offsets), np.concatenate(all_values) if all_values else np.zeros(0, dtype=dtype)
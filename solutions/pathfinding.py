@@ -0,0 +1,192 @@
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+
+import metrics
+import numpy as np
+
+# Searches work on flat integer state ids e.g. the flat index of a grid cell, or cell * 4 + direction when the facing
+# matters. Distances and predecessors are kept in numpy arrays allocated once per search and indexed by state id.
+
+UNREACHED = -1
+
+
+@dataclass
+class SearchResult:
+    """
+    Distances and predecessors of the states reached by a search, indexed by state id. Unreached states have a distance
+    and predecessor of UNREACHED.
+    """
+
+    dist: np.ndarray
+    pred: np.ndarray
+    # states in the order they were settled, which for BFS is in order of distance
+    order: list[int]
+    # the first target settled, if the search was given targets and reached one
+    target: Optional[int] = None
+
+    def distance(self, state: Optional[int] = None) -> int:
+        """
+        Get the distance to a state
+        :param state: state id, defaults to the target which was reached
+        :return: distance or UNREACHED
+        """
+        state = self.target if state is None else state
+        return UNREACHED if state is None else int(self.dist[state])
+
+    def path(self, state: Optional[int] = None) -> list[int]:
+        """
+        Get the path from a source to a state
+        :param state: state id, defaults to the target which was reached
+        :return: state ids along the path starting at a source, empty if the state was not reached
+        """
+        state = self.target if state is None else state
+        if state is None or self.dist[state] == UNREACHED:
+            return []
+        return reconstruct_path(self.pred, state)
+
+
+def reconstruct_path(pred: np.ndarray, state: int) -> list[int]:
+    """
+    Follow the predecessors of a reached state back to the source it was reached from
+    :param pred: predecessor of every state
+    :param state: reached state id
+    :return: state ids along the path starting at the source
+    """
+    path = []
+    while state != UNREACHED:
+        path.append(state)
+        state = int(pred[state])
+    path.reverse()
+    return path
+
+
+def _allocate(n_states: int) -> tuple[np.ndarray, np.ndarray]:
+    return np.full(n_states, UNREACHED, dtype=np.int64), np.full(n_states, UNREACHED, dtype=np.int64)
+
+
+def bfs(
+    n_states: int,
+    sources: Iterable[int],
+    neighbours: Callable[[int], Iterable[int]],
+    targets: Optional[Iterable[int]] = None,
+    max_dist: Optional[int] = None,
+) -> SearchResult:
+    """
+    Breadth first search where every move costs 1
+    :param n_states: number of state ids
+    :param sources: states at distance 0
+    :param neighbours: function giving the states one move away from a state
+    :param targets: stop at the first of these states to be reached, defaults to searching every reachable state
+    :param max_dist: do not expand states further than this from a source
+    :return: distances and predecessors of the reached states
+    """
+    dist, pred = _allocate(n_states)
+    targets = set() if targets is None else set(targets)
+    queue: deque[int] = deque()
+    for source in sources:
+        dist[source] = 0
+        queue.append(source)
+
+    order = []
+    target = None
+    while queue:
+        state = queue.popleft()
+        order.append(state)
+        if state in targets:
+            target = state
+            break
+        step = int(dist[state]) + 1
+        if max_dist is not None and step > max_dist:
+            continue
+        for nxt in neighbours(state):
+            if dist[nxt] == UNREACHED:
+                dist[nxt] = step
+                pred[nxt] = state
+                queue.append(nxt)
+    metrics.inc("nodes_expanded", len(order))
+    return SearchResult(dist, pred, order, target)
+
+
+def astar(
+    n_states: int,
+    sources: Iterable[int],
+    neighbours: Callable[[int], Iterable[tuple[int, int]]],
+    targets: Optional[Iterable[int]] = None,
+    heuristic: Optional[Callable[[int], int]] = None,
+) -> SearchResult:
+    """
+    A* search over weighted moves. Without a heuristic this is Dijkstra's algorithm.
+    :param n_states: number of state ids
+    :param sources: states at distance 0
+    :param neighbours: function giving the (state, cost) of each move from a state, costs must not be negative
+    :param targets: stop at the first of these states to be settled, defaults to searching every reachable state
+    :param heuristic: lower bound on the distance from a state to the nearest target, it must never over estimate
+    :return: distances and predecessors of the reached states
+    """
+    dist, pred = _allocate(n_states)
+    targets = set() if targets is None else set(targets)
+    # (priority, distance, state) so that ties are broken by the distance travelled
+    heap = []
+    for source in sources:
+        dist[source] = 0
+        heap.append((0 if heuristic is None else heuristic(source), 0, source))
+    heapq.heapify(heap)
+
+    order = []
+    target = None
+    while heap:
+        _, cost, state = heapq.heappop(heap)
+        # a cheaper route to this state has already been settled
+        if cost > dist[state]:
+            continue
+        order.append(state)
+        if state in targets:
+            target = state
+            break
+        for nxt, step in neighbours(state):
+            new_cost = cost + step
+            old_cost = dist[nxt]
+            if old_cost == UNREACHED or new_cost < old_cost:
+                dist[nxt] = new_cost
+                pred[nxt] = state
+                heapq.heappush(heap, (new_cost if heuristic is None else new_cost + heuristic(nxt), new_cost, nxt))
+    metrics.inc("nodes_expanded", len(order))
+    return SearchResult(dist, pred, order, target)
+
+
+def dijkstra(
+    n_states: int,
+    sources: Iterable[int],
+    neighbours: Callable[[int], Iterable[tuple[int, int]]],
+    targets: Optional[Iterable[int]] = None,
+) -> SearchResult:
+    """
+    Dijkstra's algorithm over weighted moves
+    :param n_states: number of state ids
+    :param sources: states at distance 0
+    :param neighbours: function giving the (state, cost) of each move from a state, costs must not be negative
+    :param targets: stop at the first of these states to be settled, defaults to searching every reachable state
+    :return: distances and predecessors of the reached states
+    """
+    return astar(n_states, sources, neighbours, targets)
+
+
+def grid_neighbours(passable: Sequence[bool], offsets: Iterable[int]) -> Callable[[int], list[int]]:
+    """
+    Make a neighbour function for moving between the cells of a padded grid. The border of the grid must not be
+    passable, so no bounds checks are needed.
+    :param passable: whether each flat cell can be entered, a list is faster to index than an array
+    :param offsets: flat index offsets of the moves, see `Grid.neighbour_offsets`
+    :return: function giving the passable cells next to a cell
+    """
+    offsets = [int(o) for o in offsets]
+
+    def neighbours(cell: int) -> list[int]:
+        return [cell + o for o in offsets if passable[cell + o]]
+
+    return neighbours
@@ -0,0 +1,215 @@
+import asyncio
+import contextlib
+import http.server
+import logging
+import os
+import re
+import threading
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+import input_store
+import utilities
+from constants import YEAR
+
+logging.basicConfig(level=logging.INFO)
+
+# Inputs missing from the local input store are downloaded concurrently before any solving starts, so that fetch
+# latency never ends up in a solve timing. Requests go through one urllib3 pool whose connections are kept alive and
+# shared by every download, and at most `concurrency` requests are in flight at once. urllib3 is blocking, so each
+# request runs in a worker thread of the event loop. The base URL can be pointed at the local stand-in server below,
+# which serves fixture inputs so that the whole path can be exercised without the real site.
+
+DEFAULT_BASE_URL = "https://adventofcode.com"
+BASE_URL_ENV = "AOC_BASE_URL"
+DEFAULT_CONCURRENCY = 4
+USER_AGENT = "github.com/isaacksdata/Advent-of-code-2024 by isaacksdata"
+
+INPUT_PATH = re.compile(r"^/(\d+)/day/(\d+)/input$")
+
+
+class FetchError(RuntimeError):
+    def __init__(self, message: str, days: Iterable[int] = ()) -> None:
+        """
+        :param message: what went wrong
+        :param days: days which could not be fetched
+        """
+        super().__init__(message)
+        self.days = sorted(days)
+
+
+def get_base_url() -> str:
+    """
+    Get the base URL of the puzzle inputs
+    :return: the AOC_BASE_URL env var, defaults to the AOC site
+    """
+    return os.environ.get(BASE_URL_ENV, DEFAULT_BASE_URL).rstrip("/")
+
+
+def missing_days(year: int, days: Iterable[int]) -> list[int]:
+    return [day for day in days if input_store.get_digest(year, day) is None]
+
+
+async def _fetch(pool: Any, semaphore: asyncio.Semaphore, base_url: str, year: int, day: int) -> tuple[int, str]:
+    import urllib3
+
+    url = f"{base_url}/{year}/day/{day}/input"
+    async with semaphore:
+        try:
+            response = await asyncio.to_thread(pool.request, "GET", url)
+        except urllib3.exceptions.HTTPError as error:
+            raise FetchError(f"GET {url} failed: {error}", [day]) from error
+    if response.status != 200:
+        raise FetchError(f"GET {url} returned {response.status}", [day])
+    # aocd strips the final new line of an input, so inputs fetched here are stored the same way
+    return day, response.data.decode("utf-8").rstrip("\n")
+
+
+async def fetch_all(year: int, days: list[int], base_url: str, session: str, concurrency: int) -> list[int]:
+    """
+    Download inputs concurrently and add each one to the input store as soon as it arrives. A day which cannot be
+    fetched does not stop the others: every input which arrives is stored, then one FetchError lists the failed days.
+    :param year: year of the challenge
+    :param days: days to download
+    :param base_url: base URL of the inputs
+    :param session: AOC session key
+    :param concurrency: most requests in flight at once
+    :return: days which were stored
+    """
+    import urllib3
+
+    headers = {"Cookie": f"session={session}", "User-Agent": USER_AGENT}
+    stored, errors = [], []
+    with urllib3.PoolManager(num_pools=1, maxsize=concurrency, block=True, headers=headers) as pool:
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [asyncio.ensure_future(_fetch(pool, semaphore, base_url, year, day)) for day in days]
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    day, data = await task
+                except FetchError as error:
+                    errors.append(error)
+                    continue
+                # stored one at a time on the event loop so the index of the store is never written concurrently
+                input_store.put_input(year, day, data)
+                stored.append(day)
+        finally:
+            for task in tasks:
+                task.cancel()
+    if errors:
+        failed = sorted(day for error in errors for day in error.days)
+        details = "; ".join(str(error) for error in sorted(errors, key=lambda error: error.days))
+        raise FetchError(f"Could not fetch inputs for {year} days {failed}: {details}", failed)
+    return stored
+
+
+def prefetch(
+    year: int = YEAR,
+    days: Iterable[int] = range(1, 26),
+    base_url: Optional[str] = None,
+    session: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    offline: Optional[bool] = None,
+) -> list[int]:
+    """
+    Download every input which is missing from the local input store. The inputs which arrive are stored even if
+    others fail, in which case a FetchError lists the failed days.
+    :param year: year of the challenge
+    :param days: days to download
+    :param base_url: base URL of the inputs, defaults to the AOC_BASE_URL env var or the AOC site
+    :param session: AOC session key, defaults to the AOC_SESSION env var
+    :param concurrency: most requests in flight at once
+    :param offline: do nothing, defaults to the AOC_OFFLINE env var. Missing inputs are reported when they are read.
+    :return: days which were downloaded
+    """
+    if offline or (offline is None and input_store.is_offline()):
+        return []
+    missing = missing_days(year, days)
+    if not missing:
+        return []
+    logging.info("Fetching inputs for %s days %s", year, missing)
+    session = utilities.get_session() if session is None else session
+    base_url = get_base_url() if base_url is None else base_url.rstrip("/")
+    return asyncio.run(fetch_all(year, missing, base_url, session, concurrency))
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serve fixture inputs at the same paths as the AOC site
+    """
+
+    fixtures: dict[tuple[int, int], str] = {}
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        match = INPUT_PATH.match(self.path)
+        data = None if match is None else self.fixtures.get((int(match.group(1)), int(match.group(2))))
+        if data is None or "session=" not in self.headers.get("Cookie", ""):
+            self.send_error(404 if data is None else 400)
+            return
+        body = data.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logging.debug(format, *args)
+
+
+@contextlib.contextmanager
+def local_server(fixtures: dict[tuple[int, int], str], port: int = 0) -> Iterator[str]:
+    """
+    Run a stand-in for the AOC site on localhost which serves fixture inputs
+    :param fixtures: input for each (year, day)
+    :param port: port to listen on, defaults to any free port
+    :return: context manager giving the base URL of the server
+    """
+    handler = type("Handler", (FixtureHandler,), {"fixtures": dict(fixtures)})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def load_fixtures(year: int = YEAR, directory: Optional[str] = None) -> dict[tuple[int, int], str]:
+    """
+    Use the sample data of each day as its fixture input
+    :param year: year of the fixtures
+    :param directory: directory of day_<day>_a.txt files, defaults to data
+    :return: input for each (year, day)
+    """
+    directory = f"{utilities.get_path_prefix()}data" if directory is None else directory
+    fixtures = {}
+    for day in range(1, 26):
+        path = f"{directory}/day_{day}_a.txt"
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                fixtures[(year, day)] = file.read().rstrip("\n")
+    return fixtures
+
+
+def serve(port: int = 8000, year: int = YEAR, directory: Optional[str] = None) -> None:
+    """
+    Serve the sample data as puzzle inputs until interrupted, e.g. for AOC_BASE_URL=http://127.0.0.1:8000
+    :param port: port to listen on
+    :param year: year to serve the fixtures under
+    :param directory: directory of day_<day>_a.txt files, defaults to data
+    :return: void
+    """
+    with local_server(load_fixtures(year, directory), port) as base_url:
+        logging.info("Serving fixture inputs at %s", base_url)
+        threading.Event().wait()
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire({"fill": prefetch, "serve": serve})
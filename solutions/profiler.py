@@ -0,0 +1,103 @@
+import contextlib
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import ContextManager
+from typing import Iterator
+from typing import Optional
+
+import utilities
+from constants import CACHE_DIR
+
+SAMPLE_INTERVAL = 0.001
+
+
+def get_profile_dir() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/profiles"
+
+
+def format_stack(frame: Optional[FrameType]) -> str:
+    """
+    Turn a frame into a collapsed stack i.e. the frames from outermost to innermost separated by semicolons
+    :param frame: innermost frame
+    :return: collapsed stack
+    """
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class StackSampler:
+    """
+    Samples the stack of a thread at a fixed interval from a background thread and counts how often each stack is seen
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[format_stack(frame)] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path: str) -> None:
+        """
+        Write the samples in the collapsed stack format read by flamegraph.pl, speedscope and similar tools
+        :param path: file to write to
+        :return: void
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+@contextlib.contextmanager
+def profile_solve(name: str, out_dir: Optional[str] = None) -> Iterator[None]:
+    """
+    Profile the code run inside the context with cProfile and a stack sampler. Writes `<name>.prof` for pstats and
+    snakeviz, and `<name>.collapsed` for flamegraph tools.
+    :param name: file name stem for the outputs e.g. day_6_b_puzzle
+    :param out_dir: directory to write to, defaults to .cache/profiles
+    :return: context manager
+    """
+    out_dir = get_profile_dir() if out_dir is None else out_dir
+    os.makedirs(out_dir, exist_ok=True)
+    sampler = StackSampler(threading.get_ident())
+    profile = cProfile.Profile()
+    sampler.start()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        sampler.stop()
+        profile.dump_stats(f"{out_dir}/{name}.prof")
+        sampler.write_collapsed(f"{out_dir}/{name}.collapsed")
+
+
+def maybe_profile(name: str, enabled: bool, out_dir: Optional[str] = None) -> ContextManager:
+    """
+    Profile the code run inside the context only if profiling is enabled, otherwise do nothing
+    :param name: file name stem for the outputs
+    :param enabled: whether to profile
+    :param out_dir: directory to write to, defaults to .cache/profiles
+    :return: context manager
+    """
+    return profile_solve(name, out_dir) if enabled else contextlib.nullcontext()
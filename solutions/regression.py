@@ -0,0 +1,217 @@
+import csv
+import logging
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+import benchmark
+import harness
+import utilities
+from benchmark import BenchmarkConfig
+from harness import Job
+from run_profiling import run_sequential
+
+logging.basicConfig(level=logging.INFO)
+
+
+@dataclass
+class Comparison:
+    job: Job
+    baseline_time: Optional[float]
+    current_time: Optional[float]
+    time_ratio: float
+    baseline_peak: Optional[float]
+    current_peak: Optional[float]
+    peak_ratio: float
+    status: str
+    regressed: bool
+
+
+def load_baseline(path: str) -> dict[Job, dict[str, Any]]:
+    """
+    Load the rows of a profiling csv
+    :param path: path to the csv
+    :return: mapping of job to its row
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return {Job(int(row["day"]), row["part"], row["mode"]): row for row in csv.DictReader(file)}
+
+
+def _value(row: dict[str, Any], column: str) -> Optional[float]:
+    value = row.get(column)
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def is_benchmark(row: dict[str, Any]) -> bool:
+    return _value(row, "warm_median_ns") is not None
+
+
+def get_time(row: dict[str, Any], warm: bool) -> tuple[Optional[float], float]:
+    """
+    Get the time of a job in seconds with its noise
+    :param row: result row
+    :param warm: use the warm median of a benchmark run, otherwise the fastest cold solve
+    :return: time in seconds and its standard deviation, which is 0 for a single timing
+    """
+    prefix = "warm_median" if warm else "cold_min"
+    value = _value(row, f"{prefix}_ns")
+    if value is None:
+        # a run which was not a benchmark timed a single cold solve
+        return _value(row, "time"), 0.0
+    return value / benchmark.NS_PER_S, (_value(row, f"{prefix[:4]}_std_ns") or 0.0) / benchmark.NS_PER_S
+
+
+def _ratio(current: Optional[float], baseline: Optional[float]) -> float:
+    if current is None or baseline is None:
+        return math.nan
+    return current / baseline if baseline > 0 else math.inf if current > 0 else 1.0
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    time_threshold: float = 0.2,
+    memory_threshold: float = 0.1,
+    min_time_ms: float = 1.0,
+    noise_sigmas: float = 3.0,
+) -> Comparison:
+    """
+    Compare the current result of a job with its baseline, by the warm median if both were benchmark runs and by the
+    fastest cold solve otherwise. A job has slowed down if its time grew by more than the threshold, by more than the
+    minimum time, and by more than the given number of standard deviations of the combined timing noise.
+    :param baseline: baseline result row
+    :param current: current result row
+    :param time_threshold: allowed relative slow down e.g. 0.2 for 20%
+    :param memory_threshold: allowed relative growth of the peak traced allocation
+    :param min_time_ms: slow downs smaller than this are ignored as noise
+    :param noise_sigmas: slow downs within this many standard deviations are ignored as noise
+    :return: comparison of the job
+    """
+    job = Job(int(current["day"]), current["part"], current["mode"])
+    # warm runs can hide a slow down behind a cache, so they are only compared with warm runs
+    warm = is_benchmark(baseline) and is_benchmark(current)
+    baseline_time, baseline_std = get_time(baseline, warm)
+    current_time, current_std = get_time(current, warm)
+    baseline_peak = _value(baseline, "peak_alloc_bytes")
+    current_peak = _value(current, "peak_alloc_bytes")
+    time_ratio = _ratio(current_time, baseline_time)
+    peak_ratio = _ratio(current_peak, baseline_peak)
+
+    statuses = []
+    if current["status"] not in ("ok", "skipped"):
+        statuses.append(current["status"])
+    if current_time is not None and baseline_time is not None:
+        delta = current_time - baseline_time
+        noise = noise_sigmas * math.hypot(baseline_std, current_std)
+        if time_ratio > 1 + time_threshold and delta > min_time_ms / 1000 and delta > noise:
+            statuses.append("slower")
+    if peak_ratio > 1 + memory_threshold:
+        statuses.append("more memory")
+
+    return Comparison(
+        job,
+        baseline_time,
+        current_time,
+        time_ratio,
+        baseline_peak,
+        current_peak,
+        peak_ratio,
+        ", ".join(statuses) or "ok",
+        bool(statuses),
+    )
+
+
+def _format(value: Optional[float], scale: float = 1.0) -> str:
+    return "-" if value is None else f"{value * scale:.3f}"
+
+
+def print_table(comparisons: list[Comparison]) -> None:
+    """
+    Print the comparisons, worst slow down first
+    :param comparisons: comparisons to print
+    :return: void
+    """
+    ranked = sorted(
+        comparisons,
+        key=lambda c: (not c.regressed, -(c.time_ratio if not math.isnan(c.time_ratio) else 0)),
+    )
+    print(f"{'day':>3} {'part':<4} {'mode':<7} {'base ms':>10} {'now ms':>10} {'ratio':>7} {'peak ratio':>10}  status")
+    for c in ranked:
+        print(
+            f"{c.job.day:>3} {c.job.part:<4} {c.job.mode:<7} {_format(c.baseline_time, 1000):>10} "
+            f"{_format(c.current_time, 1000):>10} {c.time_ratio:>7.2f} {c.peak_ratio:>10.2f}  {c.status}"
+        )
+
+
+def check(
+    baseline: Optional[str] = None,
+    days: Iterable[int] = harness.DAYS,
+    parts: Iterable[str] = harness.PARTS,
+    time_threshold: float = 0.2,
+    memory_threshold: float = 0.1,
+    min_time_ms: float = 1.0,
+    noise_sigmas: float = 3.0,
+    memory: Optional[bool] = None,
+    target_time: float = 1.0,
+    cold_repeats: int = 3,
+    offline: Optional[bool] = None,
+) -> None:
+    """
+    Run the solvers again and compare each job against a baseline profiling csv. Exits with a non zero code if any
+    solver got slower or uses more memory than allowed.
+    :param baseline: baseline csv, defaults to profiling.csv
+    :param days: days to check
+    :param parts: parts to check
+    :param time_threshold: allowed relative slow down e.g. 0.2 for 20%
+    :param memory_threshold: allowed relative growth of the peak traced allocation
+    :param min_time_ms: slow downs smaller than this are ignored as noise
+    :param noise_sigmas: slow downs within this many standard deviations are ignored as noise
+    :param memory: also trace allocations, defaults to whether the baseline has a peak memory column
+    :param target_time: approximate time in seconds to spend on warm runs per job
+    :param cold_repeats: cold solves per job, the fastest is compared with a baseline which was not a benchmark
+    :param offline: only read puzzle inputs from the local input store
+    :return: void
+    """
+    baseline = f"{utilities.get_path_prefix()}profiling.csv" if baseline is None else baseline
+    baseline_rows = load_baseline(baseline)
+    if memory is None:
+        memory = any(_value(row, "peak_alloc_bytes") is not None for row in baseline_rows.values())
+
+    # combined jobs are only compared with a baseline which solved both parts together
+    combine = any(job.part == harness.BOTH for job in baseline_rows)
+    jobs = [job for job in harness.build_jobs(days, parts, combine) if job in baseline_rows]
+    answers = harness.load_answers()
+    data = harness.load_all_job_data(jobs, offline)
+    options = harness.RunOptions(
+        benchmark=BenchmarkConfig(cold_repeats=cold_repeats, target_time=target_time), memory=memory
+    )
+    results = run_sequential(jobs, data, answers, options)
+
+    comparisons = [
+        compare(
+            baseline_rows[Job(r["day"], r["part"], r["mode"])],
+            r,
+            time_threshold,
+            memory_threshold,
+            min_time_ms,
+            noise_sigmas,
+        )
+        for r in results
+    ]
+    print_table(comparisons)
+
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        logging.error("%s of %s jobs regressed against %s", len(regressions), len(comparisons), baseline)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire(check)
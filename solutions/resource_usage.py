@@ -0,0 +1,70 @@
+import contextlib
+import sys
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+# The OS accounting of a solve is read with getrusage before and after it. CPU time, page faults and context switches
+# are differences, and include worker processes the solver started and waited for (e.g. the executor's process pool)
+# through RUSAGE_CHILDREN. Max RSS is a high water mark rather than a counter, so both the peak after the solve and how
+# much the solve raised the peak of this process are kept. The resource module only exists on unix, elsewhere the
+# usage is left at zero.
+
+# ru_maxrss is in kilobytes on linux and in bytes on macOS
+MAXRSS_BYTES = 1 if sys.platform == "darwin" else 1024
+
+
+@dataclass
+class ResourceUsage:
+    user_s: float = 0.0
+    system_s: float = 0.0
+    max_rss_bytes: int = 0
+    max_rss_growth_bytes: int = 0
+    minor_faults: int = 0
+    major_faults: int = 0
+    voluntary_switches: int = 0
+    involuntary_switches: int = 0
+
+    def to_columns(self) -> dict[str, Any]:
+        """
+        Give the usage as extra columns for the profiling table
+        :return: each field prefixed with rusage_
+        """
+        return {f"rusage_{name}": value for name, value in asdict(self).items()}
+
+
+def _snapshot() -> Optional[tuple[Any, Any]]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+
+
+def _delta(before: tuple[Any, Any], after: tuple[Any, Any], name: str) -> Any:
+    return sum(getattr(a, name) - getattr(b, name) for b, a in zip(before, after))
+
+
+@contextlib.contextmanager
+def track() -> Iterator[ResourceUsage]:
+    """
+    Measure the resources used by the code run inside the context
+    :return: context manager giving the usage, which is filled in when the context exits
+    """
+    usage = ResourceUsage()
+    before = _snapshot()
+    try:
+        yield usage
+    finally:
+        after = _snapshot()
+        if before is not None and after is not None:
+            usage.user_s = round(_delta(before, after, "ru_utime"), 6)
+            usage.system_s = round(_delta(before, after, "ru_stime"), 6)
+            usage.max_rss_bytes = max(after[0].ru_maxrss, after[1].ru_maxrss) * MAXRSS_BYTES
+            usage.max_rss_growth_bytes = (after[0].ru_maxrss - before[0].ru_maxrss) * MAXRSS_BYTES
+            usage.minor_faults = _delta(before, after, "ru_minflt")
+            usage.major_faults = _delta(before, after, "ru_majflt")
+            usage.voluntary_switches = _delta(before, after, "ru_nvcsw")
+            usage.involuntary_switches = _delta(before, after, "ru_nivcsw")
@@ -0,0 +1,127 @@
+import ast
+import hashlib
+import json
+import os
+from typing import Any
+from typing import Optional
+
+import harness
+import utilities
+from constants import CACHE_DIR
+
+
+def get_cache_dir() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/results"
+
+
+def _solutions_dir() -> str:
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+    )
+
+
+def get_local_imports(module: str) -> set[str]:
+    """
+    Find the modules from the solutions directory imported by a module, directly or through other local modules.
+    Imports made in the `if __name__ == "__main__"` block are only used to run the module as a script so are ignored.
+    :param module: module name e.g. day_7
+    :return: the module and every local module it depends on
+    """
+    seen: set[str] = set()
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        path = f"{_solutions_dir()}/{name}.py"
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.add(name)
+        with open(path, "r", encoding="utf-8") as file:
+            tree = ast.parse(file.read())
+        for statement in tree.body:
+            if _is_main_guard(statement):
+                continue
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Import):
+                    pending.extend(alias.name.split(".")[0] for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module is not None and node.level == 0:
+                    pending.append(node.module.split(".")[0])
+    return seen
+
+
+def hash_solver(day: int) -> str:
+    """
+    Hash the source of a day and of the local modules it imports, so that editing any of them changes the hash
+    :param day: day of the challenge
+    :return: sha256 of the solver source
+    """
+    digest = hashlib.sha256()
+    for name in sorted(get_local_imports(f"day_{day}")):
+        with open(f"{_solutions_dir()}/{name}.py", "rb") as file:
+            digest.update(name.encode("utf-8") + b"\0" + file.read() + b"\0")
+    return digest.hexdigest()
+
+
+def hash_options(options: harness.RunOptions) -> str:
+    # a result is only reused if it was measured the same way e.g. a single run cannot stand in for a benchmark
+    return repr((options.benchmark, options.memory, options.metrics, options.parse_cache, options.checkpoint))
+
+
+class ResultCache:
+    """
+    Persistent cache of profiling results keyed by (day, part, mode, input hash). The mode is part of the key because
+    answers depend on whether an input is an example (e.g. the grid size of days 14 and 18). Each entry records the hash
+    of the solver source it was produced by, so an entry expires as soon as the day or one of its helpers is edited.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        self.cache_dir = get_cache_dir() if cache_dir is None else cache_dir
+        self._solver_hashes: dict[int, str] = {}
+
+    def _solver_hash(self, day: int) -> str:
+        if day not in self._solver_hashes:
+            self._solver_hashes[day] = hash_solver(day)
+        return self._solver_hashes[day]
+
+    def _path(self, job: harness.Job, data: list[str]) -> str:
+        return f"{self.cache_dir}/day_{job.day}_{job.part}_{job.mode}_{utilities.hash_input(data)}.json"
+
+    def get(self, job: harness.Job, data: list[str], options: harness.RunOptions) -> Optional[dict[str, Any]]:
+        """
+        Look up the last result recorded for a job
+        :param job: job to look up
+        :param data: input data for the job
+        :param options: how the job is being measured
+        :return: the recorded result row or None if there is no up to date entry
+        """
+        path = self._path(job, data)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            entry = json.load(file)
+        if entry["solver_hash"] != self._solver_hash(job.day) or entry["options"] != hash_options(options):
+            return None
+        return entry["result"]
+
+    def put(self, job: harness.Job, data: list[str], options: harness.RunOptions, result: dict[str, Any]) -> None:
+        """
+        Record the result of a job, replacing any entry made by an older version of the solver
+        :param job: job which was run
+        :param data: input data for the job
+        :param options: how the job was measured
+        :param result: result row for the profiling table
+        :return: void
+        """
+        entry = {"solver_hash": self._solver_hash(job.day), "options": hash_options(options), "result": result}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(job, data)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file, default=utilities.to_json)
+        os.replace(tmp_path, path)
@@ -1,78 +1,138 @@
-import importlib
 import logging
-import os
-import time
+from typing import Any
+from typing import Optional
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import seaborn as sns
+import harness
+import history
+import result_cache
+import scheduler
 import utilities
-import yaml
-from constants import YEAR
+from benchmark import BenchmarkConfig
 
 logging.basicConfig(level=logging.INFO)
 
-if __name__ == "__main__":
-    days = range(1, 26)
-    parts = ["a", "b"]
-
-    path_prefix = "../" if os.getcwd().endswith("solutions") else "./"
-
-    with open(f"{path_prefix}answers/examples.yaml", "r") as file:
-        example_answers = yaml.safe_load(file)
-    with open(f"{path_prefix}answers/puzzles.yaml", "r") as file:
-        puzzle_answers = yaml.safe_load(file)
-
-    times = pd.DataFrame(columns=["day", "part", "mode", "answer", "time"])
-
-    for day in days:
-        puzzle = utilities.format_input_data(utilities.get_puzzle(year=YEAR, day=day))
-
-        module_name = f"day_{day}"
-        module = importlib.import_module(module_name)
-        solve_a = getattr(module, "solve_a")
-        solve_b = getattr(module, "solve_b")
-
-        for part in parts:
-            if day == 25 and part == "b":
-                continue
-            sample = utilities.read_sample_data(f"{path_prefix}data/day_{day}_{part}.txt")
-            func = solve_a if part == "a" else solve_b
-
-            logging.info("####### Day %s Part %s #######", day, part)
-
-            logging.info("## Example ##")
-
-            run_test = False if ((day == 14 and part == "b") or (day == 25 and part == "b")) else True
-
-            if run_test:
-                start = time.time()
-                response = func(sample, example=True)
-                assert (
-                    response == example_answers[f"day{day}"][part]
-                ), f"Failed example for day {day}, part {part}, response {response}"
-                end = time.time()
-                length = end - start
-            else:
-                length = 0
-                response = 0
-            times.loc[len(times)] = [day, part, "example", response, length]
-
-            logging.info("## Puzzle ##")
-
-            start = time.time()
-            response = func(puzzle)
-            assert (
-                response == puzzle_answers[f"day{day}"][part]
-            ), f"Failed puzzle for day {day}, part {part}, response {response}"
-            end = time.time()
-            length = end - start
-            times.loc[len(times)] = [day, part, "puzzle", response, length]
 
+def run_sequential(
+    jobs: list[harness.Job], data: dict[harness.Job, list[str]], answers: dict, options: harness.RunOptions
+) -> list[dict[str, Any]]:
+    results = []
+    for job in jobs:
+        logging.info("####### Day %s Part %s - %s #######", job.day, job.part, job.mode)
+        results.append(harness.run_job(job, data[job], harness.get_expected(answers, job), options))
+    return results
+
+
+def save_results(results: list[dict[str, Any]], path_prefix: str) -> None:
+    """
+    Append the run to the history store, then write the profiling table and charts of the run from the store. The
+    plotting libraries are slow to import so they are only loaded once all solving is done.
+    :param results: result rows from the profiling run
+    :param path_prefix: path prefix to the repository root
+    :return: void
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
+    run_id = history.record_run(results)
+    times = pd.DataFrame(history.load_run(run_id))
     times.to_csv(f"{path_prefix}profiling.csv", index=False)
 
-    for mode in ["example", "puzzle"]:
+    for mode in harness.MODES:
         sns.lineplot(times.query(f"mode =='{mode}'"), x="day", y="time", hue="part", marker="o")
         plt.ylabel("Time (s)")
-        plt.savefig(f"{mode}_profiling.png")
+        plt.savefig(f"{path_prefix}{mode}_profiling.png")
         plt.close()
+
+
+def run(
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    benchmark: bool = False,
+    warmup: int = 1,
+    max_repeats: int = 100,
+    target_time: float = 1.0,
+    offline: Optional[bool] = None,
+    profile: bool = False,
+    profile_dir: Optional[str] = None,
+    memory: bool = False,
+    memory_dir: Optional[str] = None,
+    use_cache: bool = True,
+    metrics: bool = False,
+    parse_cache: bool = False,
+    solve_both: bool = False,
+    checkpoint: bool = False,
+) -> None:
+    """
+    Profile all solutions against the example and puzzle data
+    :param parallel: run each (day, part, mode) job in its own worker process, slowest jobs first
+    :param workers: number of worker processes in parallel mode, defaults to the number of cores
+    :param timeout: wall clock budget per job in seconds in parallel mode
+    :param memory_limit: memory budget per job in MB in parallel mode
+    :param benchmark: time each solve over repeated cold and warm runs instead of a single run
+    :param warmup: number of untimed runs between the cold and warm runs in benchmark mode
+    :param max_repeats: maximum number of warm runs in benchmark mode
+    :param target_time: approximate time in seconds to spend on warm runs per job in benchmark mode
+    :param offline: only read puzzle inputs from the local input store and fail if any are missing
+    :param profile: write a cProfile (.prof) and collapsed stack (.collapsed) profile of every solve
+    :param profile_dir: directory for the profiles, defaults to .cache/profiles
+    :param memory: trace the allocations of each solve and add peak and net allocation columns
+    :param memory_dir: directory for the per job allocation reports, defaults to .cache/memory
+    :param use_cache: reuse the recorded result of any job whose input and solver source have not changed
+    :param metrics: count the solver metrics and cache hits and misses of each solve and add them as columns
+    :param parse_cache: memory map parsed inputs from .cache/parsed so that repeated runs time the solver without parsing
+    :param solve_both: time both puzzle parts of a day together with solve_both as one `both` row instead of one row per
+        part. Off by default so that the table keeps the per part rows which the plots and profiling.csv baselines use.
+    :param checkpoint: save the progress of long candidate loops to .cache/checkpoints and resume interrupted solves
+    :return: void
+    """
+    path_prefix = utilities.get_path_prefix()
+    answers = harness.load_answers()
+    jobs = harness.build_jobs(combine=solve_both)
+    options = harness.RunOptions(
+        benchmark=BenchmarkConfig(warmup=warmup, max_repeats=max_repeats, target_time=target_time)
+        if benchmark
+        else None,
+        profile=profile,
+        profile_dir=profile_dir,
+        memory=memory,
+        memory_dir=memory_dir,
+        metrics=metrics,
+        parse_cache=parse_cache,
+        checkpoint=checkpoint,
+    )
+
+    data = harness.load_all_job_data(jobs, offline)
+
+    # profiling is the reason for the run so profiled jobs are always solved again
+    cache = result_cache.ResultCache()
+    cached = {}
+    if use_cache and not options.profile:
+        for job in jobs:
+            result = cache.get(job, data[job], options)
+            if result is not None and result["answer"] == harness.get_expected(answers, job):
+                cached[job] = {**result, "cached": True}
+        logging.info("Reusing cached results for %s of %s jobs", len(cached), len(jobs))
+    jobs_to_run = [job for job in jobs if job not in cached]
+
+    if parallel:
+        timings = scheduler.load_past_timings(f"{path_prefix}profiling.csv")
+        ordered_jobs = scheduler.order_longest_first(jobs_to_run, timings)
+        results = scheduler.run_jobs_in_parallel(ordered_jobs, data, answers, options, workers, timeout, memory_limit)
+    else:
+        results = run_sequential(jobs_to_run, data, answers, options)
+
+    for result in results:
+        if result["status"] == "ok":
+            job = harness.Job(result["day"], result["part"], result["mode"])
+            cache.put(job, data[job], options, result)
+
+    save_results([*results, *cached.values()], path_prefix)
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire(run)
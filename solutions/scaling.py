@@ -0,0 +1,130 @@
+import importlib
+import logging
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+import benchmark
+import generators
+import numpy as np
+import utilities
+
+logging.basicConfig(level=logging.INFO)
+
+SCALES = (0.25, 0.5, 1.0, 2.0, 4.0)
+
+
+def input_size(data: list[str]) -> int:
+    # the number of characters including line endings is comparable between days
+    return sum(len(line) + 1 for line in data)
+
+
+def fit_exponent(sizes: list[int], times: list[float]) -> float:
+    """
+    Fit time = a * size^k on a log-log scale
+    :param sizes: input sizes
+    :param times: solve times
+    :return: the empirical complexity exponent k, or nan if there are too few points to fit
+    """
+    if len(sizes) < 2:
+        return float("nan")
+    slope, _ = np.polyfit(np.log(sizes), np.log(times), 1)
+    return float(slope)
+
+
+def measure_scaling(
+    day: int, part: str, scales: Iterable[float] = SCALES, seed: int = 0, repeats: int = 1, max_time: float = 10.0
+) -> list[dict[str, Any]]:
+    """
+    Time a solver on generated inputs of increasing size. Each solve starts with the solver's caches cleared.
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param scales: scale factors to generate inputs at, smallest first
+    :param seed: random seed for the generators
+    :param repeats: number of runs per scale, the fastest is kept
+    :param max_time: larger scales are skipped once a solve takes longer than this many seconds
+    :return: one row per scale with the input size and the solve time in seconds
+    """
+    func = getattr(importlib.import_module(f"day_{day}"), f"solve_{part}")
+    scales = sorted(scales)
+    # an untimed run on the smallest input so that lazy imports are not counted against it
+    func(generators.generate(day, scales[0], seed))
+    rows = []
+    for scale in scales:
+        data = generators.generate(day, scale, seed)
+        samples = []
+        for _ in range(repeats):
+            benchmark.clear_caches(func)
+            samples.extend(utilities.run_and_measure(func, [data], 1))
+        time = min(samples) / benchmark.NS_PER_S
+        rows.append({"day": day, "part": part, "scale": scale, "size": input_size(data), "time": time})
+        logging.info("Day %s part %s at scale %s took %.3f s", day, part, scale, time)
+        if time > max_time:
+            break
+    return rows
+
+
+def save_results(results: list[dict[str, Any]], path_prefix: str) -> None:
+    """
+    Write the scaling table and plot solve time against input size on log-log axes, one line per solver
+    :param results: rows from measure_scaling
+    :param path_prefix: path prefix to the repository root
+    :return: void
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
+    times = pd.DataFrame(results)
+    times.to_csv(f"{path_prefix}scaling.csv", index=False)
+    times["solver"] = "day " + times["day"].astype(str) + times["part"]
+    sns.lineplot(times, x="size", y="time", hue="solver", marker="o")
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("Input size (characters)")
+    plt.ylabel("Time (s)")
+    plt.legend(ncol=2, fontsize="small")
+    plt.savefig(f"{path_prefix}scaling.png")
+    plt.close()
+
+
+def run(
+    days: Optional[Iterable[int]] = None,
+    parts: Iterable[str] = ("a", "b"),
+    scales: Iterable[float] = SCALES,
+    seed: int = 0,
+    repeats: int = 1,
+    max_time: float = 10.0,
+) -> None:
+    """
+    Measure how each solver scales with the size of its input and report the fitted complexity exponent. An exponent of
+    1 is linear in the input size, 2 is quadratic and so on.
+    :param days: days to measure, defaults to every day with an input generator
+    :param parts: parts to measure
+    :param scales: scale factors to generate inputs at
+    :param seed: random seed for the generators
+    :param repeats: number of runs per scale, the fastest is kept
+    :param max_time: larger scales are skipped once a solve takes longer than this many seconds
+    :return: void
+    """
+    path_prefix = utilities.get_path_prefix()
+    days = sorted(generators.GENERATORS) if days is None else days
+    results = []
+    summary = []
+    for day in days:
+        for part in parts:
+            if part not in generators.GENERATED_PARTS[day]:
+                continue
+            rows = measure_scaling(day, part, scales, seed, repeats, max_time)
+            results.extend(rows)
+            exponent = fit_exponent([r["size"] for r in rows], [r["time"] for r in rows])
+            summary.append(f"day {day:>2} {part}  exponent {exponent:>5.2f}  up to {rows[-1]['size']} chars")
+
+    print("\n".join(summary))
+    save_results(results, path_prefix)
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire(run)
@@ -0,0 +1,140 @@
+import csv
+import logging
+import multiprocessing
+import os
+import resource
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait
+from typing import Any
+from typing import Optional
+
+import harness
+from harness import Job
+from harness import RunOptions
+
+POLL_INTERVAL = 0.1
+
+
+@dataclass
+class RunningJob:
+    job: Job
+    process: multiprocessing.Process
+    conn: Connection
+    start: float
+
+
+def load_past_timings(path: str) -> dict[Job, float]:
+    """
+    Load the timings of a previous run so that jobs can be scheduled longest first
+    :param path: path to a profiling csv
+    :return: mapping of job to time taken in seconds
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return {
+            Job(int(row["day"]), row["part"], row["mode"]): float(row["time"])
+            for row in csv.DictReader(file)
+            if row.get("time")
+        }
+
+
+def order_longest_first(jobs: list[Job], timings: dict[Job, float]) -> list[Job]:
+    """
+    Sort jobs so the slowest run first. Jobs without a previous timing are treated as the slowest.
+    :param jobs: jobs to order
+    :param timings: previous timings of the jobs
+    :return: ordered jobs
+    """
+    return sorted(jobs, key=lambda j: timings.get(j, float("inf")), reverse=True)
+
+
+def failed_result(job: Job, status: str, length: float = 0) -> dict[str, Any]:
+    return {"day": job.day, "part": job.part, "mode": job.mode, "answer": None, "time": length, "status": status}
+
+
+def _worker(
+    job: Job, data: list[str], expected: Any, options: RunOptions, memory_limit: Optional[int], conn: Connection
+) -> None:
+    """
+    Entry point of a worker process - runs a single job within the memory budget and sends back the result
+    """
+    if memory_limit is not None:
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        result = harness.run_job(job, data, expected, options)
+    except MemoryError:
+        result = failed_result(job, "memory")
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logging.error("Day %s part %s %s failed: %s", job.day, job.part, job.mode, e)
+        result = failed_result(job, "error")
+    conn.send(result)
+    conn.close()
+
+
+def run_jobs_in_parallel(
+    jobs: list[Job],
+    data: dict[Job, list[str]],
+    answers: dict[str, dict[str, Any]],
+    options: RunOptions = RunOptions(),
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """
+    Run each job in its own worker process, at most `workers` at a time. Jobs which go over the time budget are
+    terminated and recorded as a timeout rather than stopping the run.
+    :param jobs: jobs to run in the order they should be started
+    :param data: input data for each job
+    :param answers: known answers loaded by harness.load_answers
+    :param options: how each job should be measured
+    :param workers: number of concurrent workers, defaults to the number of cores
+    :param timeout: wall clock budget per job in seconds
+    :param memory_limit: address space budget per job in MB
+    :return: result rows in the order the jobs were given
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = list(reversed(jobs))
+    running: list[RunningJob] = []
+    results: dict[Job, dict[str, Any]] = {}
+
+    while pending or running:
+        while pending and len(running) < workers:
+            job = pending.pop()
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(job, data[job], harness.get_expected(answers, job), options, memory_limit, send_conn),
+                daemon=True,
+            )
+            process.start()
+            send_conn.close()
+            running.append(RunningJob(job, process, recv_conn, time.monotonic()))
+            logging.info("Started day %s part %s %s", job.day, job.part, job.mode)
+
+        ready = wait([r.conn for r in running], timeout=POLL_INTERVAL)
+        still_running = []
+        for r in running:
+            elapsed = time.monotonic() - r.start
+            if r.conn in ready:
+                try:
+                    results[r.job] = r.conn.recv()
+                except EOFError:
+                    # the worker died without reporting back e.g. killed by the OS
+                    results[r.job] = failed_result(r.job, "error", elapsed)
+                r.process.join()
+            elif timeout is not None and elapsed > timeout:
+                r.process.terminate()
+                r.process.join()
+                results[r.job] = failed_result(r.job, "timeout", elapsed)
+                logging.warning("Day %s part %s %s timed out", r.job.day, r.job.part, r.job.mode)
+            else:
+                still_running.append(r)
+                continue
+            r.conn.close()
+        running = still_running
+
+    return [results[job] for job in jobs]
@@ -0,0 +1,105 @@
+import logging
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Iterable
+
+logging.basicConfig(level=logging.INFO)
+
+# lines look like "import time:       228 |     233318 |   day_1" where the indent of the name gives the nesting
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+DAY_MODULES = tuple(f"day_{day}" for day in range(1, 26))
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_import_time(module: str, repeats: int = 3) -> list[ImportTime]:
+    """
+    Import a module in a fresh interpreter with `python -X importtime` and parse the per module costs. The fastest of
+    several runs is kept for each module to reduce noise from the disk cache.
+    :param module: module to import
+    :param repeats: number of fresh interpreters to run
+    :return: import cost of every module loaded by the import, in load order
+    """
+    best: dict[str, ImportTime] = {}
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_PATTERN.match(line)
+            if match is None:
+                continue
+            self_us, cumulative_us, indent, name = match.groups()
+            timing = ImportTime(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+            if name not in best or timing.cumulative_us < best[name].cumulative_us:
+                best[name] = timing
+    return list(best.values())
+
+
+def get_direct_imports(timings: list[ImportTime], module: str) -> list[ImportTime]:
+    """
+    Find the imports made directly by a module. importtime lists a module's imports before the module itself so these
+    are the entries one level deeper which come straight before it.
+    :param timings: import costs in load order
+    :param module: module to find the imports of
+    :return: direct imports of the module
+    """
+    idx = next(i for i, t in enumerate(timings) if t.module == module)
+    depth = timings[idx].depth
+    children = []
+    for timing in reversed(timings[:idx]):
+        if timing.depth <= depth:
+            break
+        if timing.depth == depth + 1:
+            children.append(timing)
+    return children
+
+
+def report(
+    modules: Iterable[str] = DAY_MODULES,
+    budget_ms: float = 150.0,
+    top: int = 5,
+    repeats: int = 3,
+) -> None:
+    """
+    Report the import cost of each module and the heaviest top level imports it pulls in. Exits with a non zero code
+    if any module is over the startup budget.
+    :param modules: modules to measure, defaults to every day
+    :param budget_ms: maximum allowed cumulative import time per module in milliseconds
+    :param top: number of the most expensive imports to list for each module
+    :param repeats: number of fresh interpreters per module
+    :return: void
+    """
+    over_budget = []
+    for module in modules:
+        timings = measure_import_time(module, repeats)
+        total_ms = next(t.cumulative_us for t in timings if t.module == module) / 1000
+        status = "OK" if total_ms <= budget_ms else "OVER BUDGET"
+        print(f"{module:<16} {total_ms:>9.1f} ms  {status}")
+        for child in sorted(get_direct_imports(timings, module), key=lambda t: -t.cumulative_us)[:top]:
+            print(f"    {child.module:<30} {child.cumulative_us / 1000:>9.1f} ms")
+        if total_ms > budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        logging.error("Modules over the %s ms startup budget: %s", budget_ms, ", ".join(over_budget))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire(report)
@@ -0,0 +1,50 @@
+import contextlib
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+# Features which write files under .cache (the parse cache, checkpoints) are off until they are enabled, and are on
+# while they have a directory to write to. Each feature module keeps one `CacheDirToggle` and exposes its methods as
+# the module's enable, disable, is_enabled and enabled. Settings other than the directory (e.g. the checkpoint
+# interval) are given as keyword arguments to enable and fall back to the defaults given to the toggle.
+
+
+class CacheDirToggle:
+    def __init__(self, get_default_dir: Callable[[], str], **defaults: Any) -> None:
+        """
+        :param get_default_dir: directory used when enable is not given one
+        :param defaults: default value of each other setting
+        """
+        self.get_default_dir = get_default_dir
+        self.defaults = defaults
+        self.cache_dir: Optional[str] = None
+        self.settings: dict[str, Any] = dict(defaults)
+
+    def enable(self, cache_dir: Optional[str] = None, **settings: Any) -> None:
+        self.cache_dir = self.get_default_dir() if cache_dir is None else cache_dir
+        self.settings = {**self.defaults, **settings}
+
+    def disable(self) -> None:
+        self.cache_dir = None
+
+    def is_enabled(self) -> bool:
+        return self.cache_dir is not None
+
+    @contextlib.contextmanager
+    def enabled(self, flag: bool = True, cache_dir: Optional[str] = None, **settings: Any) -> Iterator[None]:
+        """
+        Switch the feature on for the code run inside the context
+        :param flag: leave the feature as it is if False
+        :param cache_dir: directory to write to, defaults to the default directory of the feature
+        :param settings: other settings, default to the defaults of the toggle
+        :return: context manager
+        """
+        previous = (self.cache_dir, self.settings)
+        if flag:
+            self.enable(cache_dir, **settings)
+        try:
+            yield
+        finally:
+            if flag:
+                self.cache_dir, self.settings = previous
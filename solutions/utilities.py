@@ -1,16 +1,41 @@
+import mmap
 import os
 import re
-import timeit
+import time
 from typing import Any
 from typing import Callable
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Union
 
-from aocd import get_data
-from aocd import submit
-from dotenv import load_dotenv
+import input_store
 
 
-load_dotenv()
+def get_path_prefix() -> str:
+    """
+    Get the relative path to the repository root so that scripts can be run from the root or the solutions directory
+    :return: path prefix to the repository root
+    """
+    return "../" if os.getcwd().endswith("solutions") else "./"
+
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """
+    Load the variables of the local .env file into the environment, once. Variables already set are kept.
+    :return: void
+    """
+    global _env_loaded  # pylint: disable=global-statement
+    if _env_loaded:
+        return
+    # dotenv and aocd are only imported when the AOC API or the .env settings are used so solving stays cheap to start
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _env_loaded = True
 
 
 def get_session() -> str:
@@ -18,19 +43,41 @@ def get_session() -> str:
     Get the AOC session key from local environment
     :return: AOC session key
     """
+    load_env()
     return os.environ["AOC_SESSION"]
 
 
-def get_puzzle(year: int, day: int) -> str:
+def fetch_puzzle(year: int, day: int) -> str:
     """
     Use the AOC API to get the challenge data
     :param year: year of the challenge
     :param day: day of the challenge
     :return:
     """
+    from aocd import get_data
+
     return get_data(session=get_session(), day=day, year=year)
 
 
+def get_puzzle(year: int, day: int, offline: Optional[bool] = None) -> str:
+    """
+    Get the challenge data from the local input store. Inputs missing from the store are fetched from the AOC API and
+    stored so that later runs do not need the network.
+    :param year: year of the challenge
+    :param day: day of the challenge
+    :param offline: fail instead of using the network if the input is not stored, defaults to the AOC_OFFLINE env var
+    :return: challenge data
+    """
+    data = input_store.read_input(year, day)
+    if data is not None:
+        return data
+    if offline or (offline is None and input_store.is_offline()):
+        raise input_store.MissingInputError(f"Input for {year} day {day} is not stored and offline mode is on")
+    data = fetch_puzzle(year, day)
+    input_store.put_input(year, day, data)
+    return data
+
+
 def submit_answer(answer: int, part: str, day: int, year: int) -> None:
     """
     Submit and answer to AOC
@@ -40,6 +87,8 @@ def submit_answer(answer: int, part: str, day: int, year: int) -> None:
     :param year: The year of the problem
     :return: void
     """
+    from aocd import submit
+
     submit(answer, part=part, day=day, year=year, session=get_session())
 
 
@@ -61,9 +110,63 @@ def read_sample_data(path: str) -> List[str]:
     :return: data from file
     """
     with open(path, "r", encoding="utf-8") as file:
-        data = file.readlines()
-    data = [x.replace("\n", "") for x in data]
-    return data
+        return file.read().splitlines()
+
+
+def iter_line_views(buffer: Union[bytes, mmap.mmap]) -> Iterator[memoryview]:
+    """
+    Split a buffer into lines without copying it
+    :param buffer: bytes or a memory mapped file
+    :return: a memoryview of each line, without the line ending
+    """
+    with memoryview(buffer) as view:
+        start = 0
+        while start < len(view):
+            end = buffer.find(b"\n", start)
+            end = len(view) if end == -1 else end
+            with view[start:end] as line:
+                yield line
+            start = end + 1
+
+
+def iter_lines(buffer: Union[bytes, mmap.mmap]) -> Iterator[str]:
+    """
+    Lazily decode the lines of a buffer one at a time
+    :param buffer: bytes or a memory mapped file
+    :return: each line as a string
+    """
+    for line in iter_line_views(buffer):
+        yield str(line, "utf-8")
+
+
+def stream_sample_data(path: str) -> Iterator[str]:
+    """
+    Stream the lines of a file through a memory map so that only the current line is held in memory
+    :param path: path to the data
+    :return: each line of the file
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from iter_lines(mapped)
+
+
+def stream_puzzle(year: int, day: int, offline: Optional[bool] = None) -> Iterator[str]:
+    """
+    Stream the lines of a puzzle input straight from the memory mapped input store
+    :param year: year of the challenge
+    :param day: day of the challenge
+    :param offline: fail instead of using the network if the input is not stored
+    :return: each line of the puzzle input
+    """
+    mapped = input_store.open_input(year, day)
+    if mapped is None:
+        # fetching the puzzle adds it to the store
+        get_puzzle(year, day, offline)
+        mapped = input_store.open_input(year, day)
+    assert mapped is not None
+    with mapped:
+        yield from iter_lines(mapped)
 
 
 def format_input_data(data: str) -> List[str]:
@@ -75,10 +178,43 @@ def format_input_data(data: str) -> List[str]:
     return data.splitlines()
 
 
-def run_and_measure(func: Callable, args: List[Any], n: int) -> float:
-    total_time = timeit.timeit(lambda: func(*args), number=n)
-    average_time = total_time / n
-    return average_time
+def hash_input(data: Union[List[str], tuple[str, ...], str, bytes]) -> str:
+    """
+    Hash an input so that the caches can key entries by it. Lines are joined with new lines first, so an input hashes
+    the same whether it is given as lines or as the text of the file.
+    :param data: input data as lines, text or bytes
+    :return: sha256 of the input
+    """
+    import hashlib
+
+    if isinstance(data, (list, tuple)):
+        data = "\n".join(data)
+    return hashlib.sha256(data.encode("utf-8") if isinstance(data, str) else data).hexdigest()
+
+
+def to_json(value: Any) -> Any:
+    """
+    Convert a value which json cannot serialise, for use as the `default` of json.dump
+    :param value: value e.g. a numpy scalar returned by a solver
+    :return: the python value of a numpy scalar, otherwise the value as a string
+    """
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def run_and_measure(func: Callable, args: List[Any], n: int) -> List[int]:
+    """
+    Run a function several times and time each run
+    :param func: function to run
+    :param args: positional arguments for the function
+    :param n: number of times to run the function
+    :return: duration of each run in nanoseconds
+    """
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter_ns()
+        func(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
 
 
 def get_day(string: str) -> int:
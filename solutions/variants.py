@@ -0,0 +1,240 @@
+import importlib
+import json
+import logging
+import math
+import os
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+import utilities
+from constants import CACHE_DIR
+
+logging.basicConfig(level=logging.INFO)
+
+# Day modules can register other implementations of a part next to solve_a and solve_b, e.g. a pure python reference
+# next to a vectorised engine or a different algorithm. The solver of the module is always the "default" variant.
+# `check` cross-checks every variant against the default on the sample and on generated inputs, `bench` times them
+# on generated inputs of increasing size and records the fastest variant at each size, and `select` (used by
+# `main.py --variant=auto`) picks the variant which was fastest on the recorded input size closest to a new input.
+
+SolverFunc = Callable[..., Any]
+
+DEFAULT = "default"
+AUTO = "auto"
+SCALES = (0.1, 0.5, 1.0, 2.0)
+
+VARIANTS: dict[tuple[int, str], dict[str, SolverFunc]] = {}
+
+
+def register(day: int, part: str, name: str) -> Callable[[SolverFunc], SolverFunc]:
+    def decorator(func: SolverFunc) -> SolverFunc:
+        VARIANTS.setdefault((day, part), {})[name] = func
+        return func
+
+    return decorator
+
+
+def get_variants(day: int, part: str) -> dict[str, SolverFunc]:
+    """
+    Get every variant of a part, importing the day module so that its variants are registered
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :return: mapping of variant name to solver, starting with the default
+    """
+    module = importlib.import_module(f"day_{day}")
+    return {DEFAULT: getattr(module, f"solve_{part}"), **VARIANTS.get((day, part), {})}
+
+
+def get_selection_path() -> str:
+    return f"{utilities.get_path_prefix()}{CACHE_DIR}/variants.json"
+
+
+def load_selection(path: Optional[str] = None) -> dict[str, list[dict[str, Any]]]:
+    """
+    Load the fastest variant at each benchmarked input size
+    :param path: selection file, defaults to .cache/variants.json
+    :return: mapping of "<day><part>" to rows of size and variant
+    """
+    path = get_selection_path() if path is None else path
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def select(day: int, part: str, data: list[str], path: Optional[str] = None) -> str:
+    """
+    Choose the variant to solve an input with
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param data: the input
+    :param path: selection file, defaults to .cache/variants.json
+    :return: the variant which was fastest at the closest benchmarked input size, the default if none were benchmarked
+    """
+    import scaling
+
+    rows = load_selection(path).get(f"{day}{part}", [])
+    available = get_variants(day, part)
+    rows = [row for row in rows if row["variant"] in available]
+    if not rows:
+        return DEFAULT
+    size = math.log(max(scaling.input_size(data), 1))
+    return min(rows, key=lambda row: abs(math.log(row["size"]) - size))["variant"]
+
+
+def resolve(day: int, part: str, variant: Optional[str], data: Optional[list[str]] = None) -> SolverFunc:
+    """
+    Get the solver of a variant
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param variant: name of the variant, AUTO to select one for the input or None for the default
+    :param data: the input, needed to select a variant automatically
+    :return: solver function
+    """
+    available = get_variants(day, part)
+    if variant == AUTO:
+        variant = DEFAULT if data is None else select(day, part, data)
+        logging.info("Selected variant %s for day %s part %s", variant, day, part)
+    variant = DEFAULT if variant is None else variant
+    if variant not in available:
+        raise ValueError(f"Day {day} part {part} has no variant {variant}, choose from {sorted(available)}")
+    return available[variant]
+
+
+def _inputs(day: int, part: str, scales: Iterable[float], seed: int) -> list[tuple[str, list[str], bool]]:
+    import generators
+
+    inputs = [("sample", utilities.read_sample_data(f"{utilities.get_path_prefix()}data/day_{day}_{part}.txt"), True)]
+    if part in generators.GENERATED_PARTS.get(day, []):
+        inputs.extend((f"scale {scale}", generators.generate(day, scale, seed), False) for scale in scales)
+    return inputs
+
+
+def cross_check(day: int, part: str, scales: Iterable[float] = SCALES[:2], seed: int = 0) -> list[str]:
+    """
+    Solve the sample and generated inputs with every variant and compare the answers with the default variant
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param scales: scales of the generated inputs
+    :param seed: random seed for the generators
+    :return: description of each disagreement
+    """
+    available = get_variants(day, part)
+    mismatches = []
+    for label, data, example in _inputs(day, part, scales, seed):
+        expected = available[DEFAULT](data, example)
+        for name, func in available.items():
+            answer = func(data, example)
+            if answer != expected:
+                mismatches.append(f"day {day} part {part} {label}: {name} gave {answer}, {DEFAULT} gave {expected}")
+    return mismatches
+
+
+def benchmark_variants(
+    day: int, part: str, scales: Iterable[float] = SCALES, seed: int = 0, repeats: int = 3
+) -> list[dict[str, Any]]:
+    """
+    Time every variant on generated inputs of increasing size. Each solve starts with the solver's caches cleared.
+    :param day: day of the challenge
+    :param part: part of the challenge
+    :param scales: scales of the generated inputs
+    :param seed: random seed for the generators
+    :param repeats: number of runs per variant and scale, the fastest is kept
+    :return: one row per variant and scale with the input size and the solve time in seconds
+    """
+    import benchmark
+    import scaling
+
+    rows = []
+    for label, data, _ in _inputs(day, part, scales, seed)[1:]:
+        for name, func in get_variants(day, part).items():
+            samples = []
+            for _ in range(repeats):
+                benchmark.clear_caches(func)
+                samples.extend(utilities.run_and_measure(func, [data], 1))
+            time = min(samples) / benchmark.NS_PER_S
+            rows.append({"day": day, "part": part, "variant": name, "size": scaling.input_size(data), "time": time})
+            logging.info("Day %s part %s %s at %s took %.4f s", day, part, name, label, time)
+    return rows
+
+
+def fastest_by_size(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    sizes = sorted({row["size"] for row in rows})
+    return [
+        {"size": size, "variant": min((r for r in rows if r["size"] == size), key=lambda r: r["time"])["variant"]}
+        for size in sizes
+    ]
+
+
+def check(days: Optional[Iterable[int]] = None, parts: Iterable[str] = ("a", "b"), seed: int = 0) -> bool:
+    """
+    Cross-check the variants of every day which has any
+    :param days: days to check, defaults to every day with registered variants
+    :param parts: parts to check
+    :param seed: random seed for the generators
+    :return: True if every variant agrees with the default
+    """
+    days = _days_with_variants() if days is None else days
+    valid = True
+    for day in days:
+        for part in parts:
+            if len(get_variants(day, part)) < 2:
+                continue
+            for mismatch in cross_check(day, part, seed=seed):
+                logging.error(mismatch)
+                valid = False
+    return valid
+
+
+def bench(
+    days: Optional[Iterable[int]] = None,
+    parts: Iterable[str] = ("a", "b"),
+    scales: Iterable[float] = SCALES,
+    seed: int = 0,
+    repeats: int = 3,
+) -> None:
+    """
+    Benchmark the variants of every day which has any and record the fastest variant at each input size
+    :param days: days to benchmark, defaults to every day with registered variants
+    :param parts: parts to benchmark
+    :param scales: scales of the generated inputs
+    :param seed: random seed for the generators
+    :param repeats: number of runs per variant and scale, the fastest is kept
+    :return: void
+    """
+    days = _days_with_variants() if days is None else days
+    selection = load_selection()
+    for day in days:
+        for part in parts:
+            if len(get_variants(day, part)) < 2:
+                continue
+            rows = benchmark_variants(day, part, scales, seed, repeats)
+            if rows:
+                selection[f"{day}{part}"] = fastest_by_size(rows)
+                print(
+                    "\n".join(
+                        f"day {day:>2} {part}  {r['size']:>9} chars  {r['variant']}" for r in selection[f"{day}{part}"]
+                    )
+                )
+    path = get_selection_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(selection, file, indent=2, sort_keys=True)
+
+
+def _days_with_variants() -> list[int]:
+    # the day modules register their variants when imported
+    for day in range(1, 26):
+        importlib.import_module(f"day_{day}")
+    return sorted({day for day, _ in VARIANTS})
+
+
+if __name__ == "__main__":
+    import fire
+
+    # the day modules register their variants with the imported module rather than with __main__
+    import variants
+
+    fire.Fire({"check": variants.check, "bench": variants.bench})
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the solutions import each other as top level modules, as they do when a script is run from the solutions directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "solutions"))
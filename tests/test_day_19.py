@@ -0,0 +1,18 @@
+import day_19
+import executor
+import pytest
+
+# the same display with other towel patterns, so a cache keyed by the display alone would give the first count again
+INPUTS = [["a, b, ab", "", "abab", "ab"], ["a, b", "", "abab", "ab"]]
+
+
+@pytest.mark.parametrize("mode", [executor.SERIAL, executor.THREAD, executor.PROCESS])
+def test_inputs_with_other_patterns(mode):
+    # one worker, so the second input is counted by the process which counted the first
+    with executor.using(mode, workers=1):
+        assert [day_19.solve_b(data) for data in INPUTS] == [6, 2]
+
+
+def test_repeated_input_in_process_mode():
+    with executor.using(executor.PROCESS, workers=1):
+        assert [day_19.solve_b(INPUTS[0]) for _ in range(2)] == [6, 6]
@@ -0,0 +1,55 @@
+import input_store
+import prefetch
+import pytest
+
+YEAR = 2024
+FIXTURES = {(YEAR, 1): "3   4\n4   3", (YEAR, 2): "7 6 4 2 1\n1 2 7 8 9", (YEAR, 3): "mul(2,4)"}
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(input_store, "get_store_dir", lambda: str(tmp_path / "inputs"))
+    return tmp_path / "inputs"
+
+
+def test_prefetch_fills_store():
+    with prefetch.local_server(FIXTURES) as base_url:
+        stored = prefetch.prefetch(YEAR, [1, 2, 3], base_url=base_url, session="test", offline=False)
+
+    assert sorted(stored) == [1, 2, 3]
+    for (year, day), data in FIXTURES.items():
+        assert input_store.read_input(year, day) == data
+    assert input_store.verify()
+
+
+def test_prefetch_skips_stored_days():
+    input_store.put_input(YEAR, 1, "stored")
+    with prefetch.local_server(FIXTURES) as base_url:
+        stored = prefetch.prefetch(YEAR, [1, 2], base_url=base_url, session="test", offline=False)
+
+    assert stored == [2]
+    assert input_store.read_input(YEAR, 1) == "stored"
+
+
+def test_prefetch_stores_successes_before_raising():
+    with prefetch.local_server(FIXTURES) as base_url:
+        with pytest.raises(prefetch.FetchError) as error:
+            prefetch.prefetch(YEAR, [1, 4, 2, 5], base_url=base_url, session="test", offline=False)
+
+    assert error.value.days == [4, 5]
+    assert input_store.read_input(YEAR, 1) == FIXTURES[(YEAR, 1)]
+    assert input_store.read_input(YEAR, 2) == FIXTURES[(YEAR, 2)]
+    assert input_store.get_digest(YEAR, 4) is None
+
+
+def test_prefetch_offline_does_nothing(store_dir):
+    assert prefetch.prefetch(YEAR, [1], base_url="http://127.0.0.1:1", session="test", offline=True) == []
+    assert not store_dir.exists()
+
+
+def test_prefetch_reports_unreachable_server():
+    # nothing listens on port 1, so every request fails to connect
+    with pytest.raises(prefetch.FetchError) as error:
+        prefetch.prefetch(YEAR, [1, 2], base_url="http://127.0.0.1:1", session="test", offline=False)
+
+    assert error.value.days == [1, 2]